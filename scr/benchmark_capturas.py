@@ -0,0 +1,130 @@
+"""
+Benchmark do índice de capturas obrigatórias
+
+Gera partidas aleatórias (com a regra de captura obrigatória), guarda os
+lances e as reproduz duas vezes: mantendo o IndiceCapturas de forma
+incremental e reconstruindo-o com a varredura completa depois de cada
+lance. Compara o custo das duas estratégias e confere que o índice
+incremental coincide com a varredura em todas as posições.
+
+Uso:
+    python benchmark_capturas.py [partidas] [--semente N]
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from constantes import *
+from ia import gerar_lances
+from indice_capturas import IndiceCapturas
+from partida import Partida
+
+
+LIMITE_LANCES = 300  # Partidas aleatórias longas demais são interrompidas
+
+
+def casas_do_lance(origem, destino):
+    """Casas alteradas por um passo (a casa pulada, se for um salto)"""
+    casas = [origem, destino]
+    if abs(destino[0] - origem[0]) == 2:
+        casas.append(((origem[0] + destino[0]) // 2, (origem[1] + destino[1]) // 2))
+    return casas
+
+
+def gerar_partida(gerador):
+    """Joga uma partida aleatória e retorna seus passos (origem, destino)"""
+    partida = Partida()
+    indice = IndiceCapturas(partida.tabuleiro)
+    passos = []
+    
+    while not partida.terminada and len(passos) < LIMITE_LANCES:
+        lances = gerar_lances(partida.tabuleiro, partida.turno, partida.em_pulo)
+        if partida.em_pulo is None and indice.tem_capturas(partida.turno):
+            lances = [lance for lance in lances if lance[0] in indice.capturadoras[partida.turno]
+                      and abs(lance[1][0] - lance[0][0]) == 2]
+        
+        origem, destino = gerador.choice(lances)
+        partida.executar_lance(origem, destino)
+        indice.atualizar(casas_do_lance(origem, destino))
+        passos.append((origem, destino))
+    
+    return passos
+
+
+def reproduzir(passos, incremental):
+    """
+    Reproduz uma partida mantendo o índice
+    
+    Returns:
+        (segundos gastos no índice, casas examinadas, posições divergentes)
+    """
+    partida = Partida()
+    indice = IndiceCapturas(partida.tabuleiro)
+    indice.casas_examinadas = 0
+    duracao = 0.0
+    divergencias = 0
+    
+    for origem, destino in passos:
+        partida.executar_lance(origem, destino)
+        
+        inicio = time.perf_counter()
+        if incremental:
+            indice.atualizar(casas_do_lance(origem, destino))
+        else:
+            indice.reconstruir()
+        duracao += time.perf_counter() - inicio
+        
+        if incremental and indice.capturadoras != IndiceCapturas(partida.tabuleiro).capturadoras:
+            divergencias += 1
+    
+    return duracao, indice.casas_examinadas, divergencias
+
+
+def executar(quantidade, semente):
+    """Roda o benchmark e retorna True se o índice incremental conferiu sempre"""
+    gerador = random.Random(semente)
+    partidas = [gerar_partida(gerador) for _ in range(quantidade)]
+    total_passos = sum(len(passos) for passos in partidas)
+    print(f"\n📋 {quantidade} partidas aleatórias, {total_passos} passos (semente {semente})")
+    
+    resultados = {}
+    divergencias = 0
+    for nome, incremental in (('varredura', False), ('incremental', True)):
+        duracao = casas = 0
+        for passos in partidas:
+            tempo_partida, casas_partida, divergencias_partida = reproduzir(passos, incremental)
+            duracao += tempo_partida
+            casas += casas_partida
+            divergencias += divergencias_partida
+        
+        resultados[nome] = duracao
+        print(f"   {nome:12s} {duracao / total_passos * 1e6:8.2f} µs/passo  "
+              f"{casas / total_passos:6.1f} casas examinadas/passo")
+    
+    if resultados['incremental'] > 0:
+        print(f"   ganho do incremental: {resultados['varredura'] / resultados['incremental']:.1f}x")
+    
+    if divergencias:
+        print(f"   ❌ {divergencias} posições em que o índice incremental divergiu")
+    return divergencias == 0
+
+
+def main():
+    """Função principal do benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark do índice de capturas obrigatórias")
+    parser.add_argument('partidas', nargs='?', type=int, default=50,
+                        help="Quantidade de partidas reproduzidas (padrão: 50)")
+    parser.add_argument('--semente', type=int, default=1,
+                        help="Semente das partidas aleatórias (padrão: 1)")
+    argumentos = parser.parse_args()
+    
+    print("🧮 Índice de capturas - incremental x varredura completa")
+    tudo_certo = executar(argumentos.partidas, argumentos.semente)
+    print("\n✅ Índice incremental confere com a varredura" if tudo_certo else "\n❌ Índice incremental divergiu")
+    return 0 if tudo_certo else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
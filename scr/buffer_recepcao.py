@@ -0,0 +1,126 @@
+"""
+Buffer de recepção compartilhado por servidor e cliente
+
+Recebe com recv_into direto em um bytearray pré-alocado e entrega linhas
+JSON e quadros binários (codec_binario.py) como memoryviews do próprio
+buffer, sem decodificar fragmentos nem recopiar o restante a cada mensagem.
+Só a mensagem incompleta do fim é movida para o início quando falta
+espaço, então uma rajada com centenas de mensagens é processada em tempo
+linear, e caracteres UTF-8 divididos entre dois recv chegam inteiros.
+"""
+
+from typing import Iterator, Tuple
+
+from codec_binario import CABECALHO_QUADRO, MARCADOR_BINARIO, TAMANHO_MAXIMO_QUADRO, ErroCodec
+
+
+CAPACIDADE_INICIAL = 16 * 1024
+CAPACIDADE_MAXIMA = 2 * (TAMANHO_MAXIMO_QUADRO + CABECALHO_QUADRO.size)
+LEITURA_MINIMA = 4096  # Espaço livre mínimo antes de cada recv_into
+
+
+class BufferRecepcao:
+    """Acumula bytes recebidos e separa mensagens completas"""
+    
+    def __init__(self, capacidade: int = CAPACIDADE_INICIAL, capacidade_maxima: int = CAPACIDADE_MAXIMA):
+        """
+        Cria o buffer vazio
+        
+        Args:
+            capacidade: Tamanho inicial do bytearray
+            capacidade_maxima: Limite de crescimento (mensagens maiores são rejeitadas)
+        """
+        self.dados = bytearray(capacidade)
+        self.visao = memoryview(self.dados)
+        self.capacidade_maxima = capacidade_maxima
+        
+        self.inicio = 0   # Primeiro byte ainda não entregue
+        self.fim = 0      # Fim dos bytes recebidos
+        self.varrido = 0  # Até onde a linha incompleta já foi procurada por '\n'
+    
+    def __len__(self):
+        """Bytes recebidos ainda não entregues"""
+        return self.fim - self.inicio
+    
+    def receber(self, origem) -> int:
+        """
+        Lê do socket direto para o espaço livre do buffer
+        
+        Returns:
+            Bytes lidos (0 quando a conexão foi fechada)
+        """
+        if len(self.dados) - self.fim < LEITURA_MINIMA:
+            self._abrir_espaco()
+        
+        lidos = origem.recv_into(self.visao[self.fim:])
+        self.fim += lidos
+        return lidos
+    
+    def acrescentar(self, dados: bytes):
+        """Copia bytes já lidos para o buffer (fontes sem recv_into)"""
+        while len(self.dados) - self.fim < len(dados):
+            if not self._abrir_espaco():
+                raise ErroCodec("Mensagem muito longa")
+        self.dados[self.fim:self.fim + len(dados)] = dados
+        self.fim += len(dados)
+    
+    def mensagens(self) -> Iterator[Tuple[bool, memoryview]]:
+        """
+        Entrega (binario, conteudo) de cada mensagem completa já recebida
+        
+        O conteúdo é uma memoryview do buffer, válida apenas até a próxima
+        chamada de receber(); quem precisar guardá-la deve copiá-la.
+        """
+        while self.inicio < self.fim:
+            if self.dados[self.inicio] == MARCADOR_BINARIO:
+                if self.fim - self.inicio < CABECALHO_QUADRO.size:
+                    break
+                _, tamanho = CABECALHO_QUADRO.unpack_from(self.dados, self.inicio)
+                if tamanho > TAMANHO_MAXIMO_QUADRO:
+                    raise ErroCodec(f"Quadro de {tamanho} bytes excede o limite")
+                
+                fim_quadro = self.inicio + CABECALHO_QUADRO.size + tamanho
+                if fim_quadro > self.fim:
+                    break
+                conteudo = self.visao[self.inicio + CABECALHO_QUADRO.size:fim_quadro]
+                self.inicio = fim_quadro
+                yield True, conteudo
+            else:
+                # Continua a busca de onde a última parou (linhas longas não são revarridas)
+                quebra = self.dados.find(b'\n', max(self.inicio, self.varrido), self.fim)
+                if quebra < 0:
+                    self.varrido = self.fim
+                    break
+                conteudo = self.visao[self.inicio:quebra]
+                self.inicio = quebra + 1
+                yield False, conteudo
+        
+        if self.inicio == self.fim:
+            self.inicio = self.fim = self.varrido = 0
+    
+    def _abrir_espaco(self) -> bool:
+        """
+        Move a mensagem incompleta para o início ou, se ela ocupa quase todo
+        o buffer, dobra a capacidade
+        
+        Returns:
+            False se o buffer já está no tamanho máximo (ErroCodec se também estiver cheio)
+        """
+        pendente = self.fim - self.inicio
+        if self.inicio > 0:
+            self.dados[:pendente] = self.visao[self.inicio:self.fim].tobytes()
+            self.varrido = max(0, self.varrido - self.inicio)
+            self.inicio, self.fim = 0, pendente
+            if len(self.dados) - self.fim >= LEITURA_MINIMA:
+                return True
+        
+        if len(self.dados) >= self.capacidade_maxima:
+            if self.fim == len(self.dados):
+                raise ErroCodec("Mensagem muito longa")
+            return False
+        
+        novo = bytearray(min(2 * len(self.dados), self.capacidade_maxima))
+        novo[:pendente] = self.visao[:pendente]
+        self.dados = novo
+        self.visao = memoryview(novo)
+        return True
@@ -10,8 +10,12 @@ import sys
 import time
 from typing import Dict, List, Optional, Tuple
 
+import codec_binario
+from buffer_recepcao import BufferRecepcao
 from constantes import *
-from protocolo import TipoMensagem, ProtocoloDamas
+from protocolo import TipoMensagem, ProtocoloDamas, Capacidades, EstadoJogo
+from tabuleiro_bits import TabuleiroBits
+from zobrist import calcular_hash
 
 
 class ClienteDamasAvancado:
@@ -26,6 +30,7 @@ class ClienteDamasAvancado:
         # Estado de conexão
         self.conectado = False
         self.tentando_conectar = False
+        self.codec_binario = False  # Ativado ao receber o primeiro quadro binário do servidor
         
         # Informações do jogador
         self.jogador_id = None
@@ -38,6 +43,8 @@ class ClienteDamasAvancado:
         self.meu_turno = False
         self.estado_tabuleiro = None
         self.estatisticas_jogo = {}
+        self.versao_tabuleiro = None  # Versão do servidor refletida em estado_tabuleiro
+        self.estado_solicitado = False  # SOLICITAR_ESTADO enviado, aguardando ESTADO_JOGO
         
         # Interface gráfica
         self.tela = None
@@ -49,6 +56,8 @@ class ClienteDamasAvancado:
         # Controle de interface
         self.quadrado_selecionado = None
         self.movimentos_possiveis = []
+        self.sequencias_selecionadas = []  # Cadeias de captura possíveis para a peça selecionada
+        self.caminho_captura = []          # Saltos já escolhidos da cadeia em andamento
         self.ultimo_movimento = None
         self.animacao_movimento = None
         
@@ -92,6 +101,7 @@ class ClienteDamasAvancado:
             
             self.conectado = True
             self.tentando_conectar = False
+            self.codec_binario = False
             self.status_conexao = "Conectado"
             self.mensagem_status = "Conectado! Aguardando outro jogador..."
             
@@ -102,6 +112,12 @@ class ClienteDamasAvancado:
             self.thread_recepcao.daemon = True
             self.thread_recepcao.start()
             
+            # Anuncia os recursos opcionais do protocolo que este cliente entende
+            self.enviar_mensagem({
+                'tipo': TipoMensagem.CONEXAO_SOLICITADA.value,
+                'capacidades': sorted(Capacidades.SUPORTADAS)
+            })
+            
             return True
             
         except socket.timeout:
@@ -118,25 +134,29 @@ class ClienteDamasAvancado:
         return False
     
     def receber_mensagens(self):
-        """Thread para receber mensagens do servidor"""
-        buffer = ""
+        """Thread para receber mensagens do servidor (linhas JSON e quadros binários)"""
+        buffer = BufferRecepcao()
         
         while self.rodando and self.conectado:
             try:
-                dados = self.socket_cliente.recv(4096).decode('utf-8')
-                if not dados:
+                if not buffer.receber(self.socket_cliente):
                     break
                 
-                buffer += dados
-                
-                while '\n' in buffer:
-                    linha, buffer = buffer.split('\n', 1)
-                    if linha.strip():
-                        try:
-                            mensagem = json.loads(linha)
-                            self.processar_mensagem_servidor(mensagem)
-                        except json.JSONDecodeError:
-                            self.adicionar_mensagem_sistema("Erro: Mensagem malformada")
+                for binario, conteudo in buffer.mensagens():
+                    try:
+                        if binario:
+                            # O servidor aceitou o codec: as próximas mensagens também vão em binário
+                            mensagem = codec_binario.decodificar(conteudo)
+                            self.codec_binario = True
+                        else:
+                            texto = str(conteudo, 'utf-8')
+                            if not texto.strip():
+                                continue
+                            mensagem = json.loads(texto)
+                    except ValueError:
+                        self.adicionar_mensagem_sistema("Erro: Mensagem malformada")
+                        continue
+                    self.processar_mensagem_servidor(mensagem)
                 
             except socket.timeout:
                 continue
@@ -181,6 +201,7 @@ class ClienteDamasAvancado:
                 self.turno_atual = mensagem['turno']
             self.estado_tabuleiro = mensagem['tabuleiro']
             self.estatisticas_jogo = mensagem.get('estatisticas', {})
+            self.versao_tabuleiro = mensagem.get('versao')
             
             # Comparação adequada
             if isinstance(self.cor_jogador, (list, tuple)) and isinstance(self.turno_atual, (list, tuple)):
@@ -199,10 +220,13 @@ class ClienteDamasAvancado:
             
         elif tipo == TipoMensagem.MOVIMENTO_INVALIDO.value:
             self.mensagem_status = mensagem['mensagem']
-            self.quadrado_selecionado = None
-            self.movimentos_possiveis = []
+            self.limpar_selecao()
             self.adicionar_notificacao(mensagem['mensagem'], "error")
             
+        elif tipo == TipoMensagem.MOVIMENTO_OBRIGATORIO.value:
+            self.mensagem_status = mensagem['mensagem']
+            self.adicionar_notificacao("Captura obrigatória!", "warning")
+            
         elif tipo == TipoMensagem.JOGO_FINALIZADO.value:
             self.processar_fim_jogo(mensagem)
             
@@ -230,21 +254,35 @@ class ClienteDamasAvancado:
             self.turno_atual = tuple(mensagem['turno']) if isinstance(mensagem['turno'], (list, tuple)) else mensagem['turno']
             self.estado_tabuleiro = mensagem['tabuleiro']
             self.estatisticas_jogo = mensagem.get('estatisticas', {})
+            self.versao_tabuleiro = mensagem.get('versao')
+            self.estado_solicitado = False
             self.meu_turno = (self.turno_atual == self.cor_jogador)
+            
+            # Espectadores começam a acompanhar a partida pelo retrato
+            if mensagem.get('estado_jogo') == EstadoJogo.EM_ANDAMENTO.value:
+                self.jogo_iniciado = True
     
     def processar_movimento_executado(self, mensagem: Dict):
-        """Processa movimento executado"""
+        """Processa movimento executado (tabuleiro completo ou delta)"""
         movimento = mensagem['movimento']
-        self.estado_tabuleiro = mensagem['tabuleiro']
         self.turno_atual = tuple(mensagem['turno']) if isinstance(mensagem['turno'], (list, tuple)) else mensagem['turno']
-        self.estatisticas_jogo = mensagem.get('estatisticas', {})
+        
+        if 'tabuleiro' in mensagem:
+            self.estado_tabuleiro = mensagem['tabuleiro']
+            self.estatisticas_jogo = mensagem.get('estatisticas', {})
+            self.versao_tabuleiro = mensagem.get('versao')
+        elif not self.aplicar_movimento_delta(mensagem):
+            # Tabuleiro local divergiu: pede o estado completo uma única vez
+            if not self.estado_solicitado:
+                self.estado_solicitado = True
+                self.enviar_mensagem({'tipo': TipoMensagem.SOLICITAR_ESTADO.value})
         
         # Debug: imprimir informações do turno
         print(f"DEBUG: Turno atual recebido: {self.turno_atual} (tipo: {type(self.turno_atual)})")
         print(f"DEBUG: Cor do jogador: {self.cor_jogador} (tipo: {type(self.cor_jogador)})")
         
         # Comparação correta das cores
-        if isinstance(self.turno_atual, (list, tuple)):
+        if isinstance(self.turno_atual, (list, tuple)) and self.cor_jogador is not None:
             self.meu_turno = (tuple(self.turno_atual) == tuple(self.cor_jogador))
         else:
             self.meu_turno = (self.turno_atual == self.cor_jogador)
@@ -278,8 +316,61 @@ class ClienteDamasAvancado:
         self.adicionar_mensagem_sistema(mensagem['mensagem'])
         
         # Reset seleção
-        self.quadrado_selecionado = None
-        self.movimentos_possiveis = []
+        self.limpar_selecao()
+    
+    def aplicar_movimento_delta(self, mensagem: Dict) -> bool:
+        """
+        Aplica um lance recebido como delta ao tabuleiro local
+        
+        Returns:
+            False se a versão não é a seguinte à local ou se o hash da
+            posição resultante não confere com o do servidor
+        """
+        versao = mensagem.get('versao')
+        if (self.estado_tabuleiro is None or self.versao_tabuleiro is None or
+                versao != self.versao_tabuleiro + 1):
+            return False
+        
+        movimento = mensagem['movimento']
+        origem_x, origem_y = movimento['origem']
+        destino_x, destino_y = movimento['destino']
+        
+        peca = self.estado_tabuleiro[origem_x][origem_y]['peca']
+        if peca is None:
+            return False
+        
+        self.estado_tabuleiro[origem_x][origem_y]['peca'] = None
+        for captura_x, captura_y in movimento.get('pecas_capturadas') or []:
+            self.estado_tabuleiro[captura_x][captura_y]['peca'] = None
+        if movimento.get('promoveu_dama'):
+            peca = dict(peca, e_dama=True)
+        self.estado_tabuleiro[destino_x][destino_y]['peca'] = peca
+        
+        if self.recalcular_estado_local() != int(mensagem['hash'], 16):
+            return False
+        
+        self.versao_tabuleiro = versao
+        return True
+    
+    def recalcular_estado_local(self) -> int:
+        """Recalcula as estatísticas do tabuleiro local e retorna seu hash de Zobrist"""
+        pecas = []
+        contagem = {'pecas_verdes': 0, 'pecas_amarelas': 0, 'damas_verdes': 0, 'damas_amarelas': 0}
+        
+        for x, coluna in enumerate(self.estado_tabuleiro):
+            for y, quadrado in enumerate(coluna):
+                peca = quadrado['peca']
+                if peca is None:
+                    continue
+                
+                sufixo = 'verdes' if tuple(peca['cor']) == VERDE else 'amarelas'
+                contagem[f'pecas_{sufixo}'] += 1
+                if peca['e_dama']:
+                    contagem[f'damas_{sufixo}'] += 1
+                pecas.append(((x, y), peca['cor'], peca['e_dama']))
+        
+        self.estatisticas_jogo = contagem
+        return calcular_hash(pecas, self.turno_atual)
     
     def processar_fim_jogo(self, mensagem: Dict):
         """Processa fim do jogo"""
@@ -290,7 +381,9 @@ class ClienteDamasAvancado:
         self.meu_turno = False
         
         # Converte cores para comparação correta
-        if tuple(vencedor) == tuple(self.cor_jogador):
+        if self.cor_jogador is None:
+            self.mensagem_status = "Partida encerrada"
+        elif tuple(vencedor) == tuple(self.cor_jogador):
             self.mensagem_status = "🎉 Você venceu!"
             self.adicionar_notificacao("Vitória!", "success")
         else:
@@ -608,6 +701,7 @@ class ClienteDamasAvancado:
         controles = [
             "C - Conectar/Reconectar",
             "T - Chat",
+            "A - Assistir a uma partida",
             "H - Mostrar/Ocultar coordenadas",
             "ESC - Sair"
         ]
@@ -697,33 +791,86 @@ class ClienteDamasAvancado:
                 self.estado_tabuleiro[tab_x][tab_y]['peca'] and
                 tuple(self.estado_tabuleiro[tab_x][tab_y]['peca']['cor']) == tuple(self.cor_jogador)):
                 
-                self.quadrado_selecionado = coord
-                self.movimentos_possiveis = self.calcular_movimentos_possiveis(coord)
+                self.selecionar_peca(coord)
                 self.mensagem_status = "Peça selecionada. Clique no destino."
         else:
             if coord == self.quadrado_selecionado:
-                # Deseleciona
-                self.quadrado_selecionado = None
-                self.movimentos_possiveis = []
+                # Deseleciona (abandona também uma cadeia de capturas pela metade)
+                self.limpar_selecao()
                 self.mensagem_status = "Peça desselecionada."
             elif coord in self.movimentos_possiveis:
-                # Move peça
-                self.enviar_movimento(self.quadrado_selecionado, coord)
-                self.quadrado_selecionado = None
-                self.movimentos_possiveis = []
-                self.mensagem_status = "Movimento enviado..."
+                if self.sequencias_selecionadas:
+                    # Salto de uma cadeia: só é enviada quando não puder ser estendida
+                    self.avancar_captura(coord)
+                else:
+                    # Move peça
+                    self.enviar_movimento(self.quadrado_selecionado, coord)
+                    self.limpar_selecao()
+                    self.mensagem_status = "Movimento enviado..."
             else:
                 # Seleciona nova peça se for nossa
                 if (self.estado_tabuleiro and 
                     self.estado_tabuleiro[tab_x][tab_y]['peca'] and
                     tuple(self.estado_tabuleiro[tab_x][tab_y]['peca']['cor']) == tuple(self.cor_jogador)):
                     
-                    self.quadrado_selecionado = coord
-                    self.movimentos_possiveis = self.calcular_movimentos_possiveis(coord)
+                    self.selecionar_peca(coord)
                     self.mensagem_status = "Nova peça selecionada."
                 else:
                     self.mensagem_status = "Movimento inválido."
     
+    def limpar_selecao(self):
+        """Desfaz a seleção e qualquer cadeia de capturas em andamento"""
+        self.quadrado_selecionado = None
+        self.movimentos_possiveis = []
+        self.sequencias_selecionadas = []
+        self.caminho_captura = []
+    
+    def selecionar_peca(self, coord: Tuple[int, int]):
+        """
+        Seleciona a peça e calcula seus destinos
+        
+        Havendo captura para a cor do jogador, só valem os primeiros saltos
+        das cadeias de captura da peça (as mesmas regras do servidor).
+        """
+        capturas = list(self.motor_local().sequencias_captura(tuple(self.cor_jogador)))
+        self.quadrado_selecionado = coord
+        self.caminho_captura = []
+        
+        if capturas:
+            self.sequencias_selecionadas = [sequencia for sequencia in capturas if sequencia.origem == coord]
+            self.movimentos_possiveis = sorted({sequencia.destinos[0] for sequencia in self.sequencias_selecionadas})
+        else:
+            self.sequencias_selecionadas = []
+            self.movimentos_possiveis = self.calcular_movimentos_possiveis(coord)
+    
+    def avancar_captura(self, destino: Tuple[int, int]):
+        """Acrescenta um salto à cadeia; com a cadeia completa, envia o caminho inteiro"""
+        self.caminho_captura.append(destino)
+        saltos = len(self.caminho_captura)
+        self.sequencias_selecionadas = [
+            sequencia for sequencia in self.sequencias_selecionadas
+            if sequencia.destinos[:saltos] == tuple(self.caminho_captura)
+        ]
+        
+        # Mesmo caminho, mesma posição: ou todas as cadeias terminam aqui ou nenhuma
+        if all(len(sequencia.destinos) == saltos for sequencia in self.sequencias_selecionadas):
+            self.enviar_movimento(self.quadrado_selecionado, destino, self.caminho_captura)
+            self.limpar_selecao()
+            self.mensagem_status = "Movimento enviado..."
+        else:
+            self.movimentos_possiveis = sorted({sequencia.destinos[saltos] for sequencia in self.sequencias_selecionadas})
+            self.mensagem_status = "Continue capturando: clique no próximo destino."
+    
+    def motor_local(self) -> TabuleiroBits:
+        """Tabuleiro de bits com as peças do tabuleiro local (geração das cadeias de captura)"""
+        motor = TabuleiroBits(0, 0, 0, 0)
+        for x, coluna in enumerate(self.estado_tabuleiro):
+            for y, quadrado in enumerate(coluna):
+                peca = quadrado['peca']
+                if peca is not None:
+                    motor.colocar_peca((x, y), tuple(peca['cor']), peca['e_dama'])
+        return motor
+    
     def calcular_movimentos_possiveis(self, origem: Tuple[int, int]) -> List[Tuple[int, int]]:
         """Calcula movimentos possíveis para uma peça (simplificado)"""
         if not self.estado_tabuleiro:
@@ -764,14 +911,17 @@ class ClienteDamasAvancado:
         
         return movimentos
     
-    def enviar_movimento(self, origem: Tuple[int, int], destino: Tuple[int, int]):
-        """Envia movimento para o servidor"""
+    def enviar_movimento(self, origem: Tuple[int, int], destino: Tuple[int, int],
+                         caminho: Optional[List[Tuple[int, int]]] = None):
+        """Envia movimento para o servidor (capturas levam a cadeia completa em caminho)"""
         if self.conectado:
             mensagem = {
                 'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
                 'origem': origem,
                 'destino': destino
             }
+            if caminho:
+                mensagem['caminho'] = list(caminho)
             self.enviar_mensagem(mensagem)
     
     def enviar_mensagem(self, mensagem: Dict):
@@ -780,8 +930,11 @@ class ClienteDamasAvancado:
             return False
         
         try:
-            dados = json.dumps(mensagem, ensure_ascii=False) + '\n'
-            self.socket_cliente.send(dados.encode('utf-8'))
+            if self.codec_binario:
+                dados = codec_binario.codificar(mensagem)
+            else:
+                dados = (json.dumps(mensagem, ensure_ascii=False) + '\n').encode('utf-8')
+            self.socket_cliente.send(dados)
             return True
         except Exception as e:
             self.adicionar_mensagem_sistema(f"Erro ao enviar: {e}")
@@ -855,6 +1008,10 @@ class ClienteDamasAvancado:
                     elif evento.key == pygame.K_t and not self.modo_chat and self.conectado:
                         self.modo_chat = True
                     
+                    elif evento.key == pygame.K_a and not self.modo_chat and self.conectado:
+                        if not self.jogo_iniciado:
+                            self.enviar_mensagem(ProtocoloDamas.criar_mensagem_assistir_partida())
+                    
                     elif evento.key == pygame.K_h and not self.modo_chat:
                         self.mostrar_coordenadas = not self.mostrar_coordenadas
                     
@@ -0,0 +1,377 @@
+"""
+Codec binário opcional do protocolo de damas
+
+Negociado com Capacidades.BINARIO em CONEXAO_SOLICITADA; JSON por linha
+continua sendo o formato padrão. Cada quadro binário começa com o byte
+0x00 (que nunca inicia uma linha JSON), seguido do tamanho em 4 bytes e do
+conteúdo, de modo que os dois formatos podem se alternar na mesma conexão
+(a separação das mensagens recebidas fica em buffer_recepcao.py).
+
+O conteúdo começa com um byte de tipo (posição em TipoMensagem). As
+mensagens mais frequentes têm layout próprio com casas compactadas em um
+byte (y * 8 + x); as demais levam o tabuleiro em 64 bytes (um por casa) e
+os outros campos em JSON compacto. A decodificação produz exatamente o
+mesmo dicionário que json.loads produziria para a mensagem original.
+"""
+
+import json
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from constantes import *
+from protocolo import TipoMensagem, formatar_hash
+
+
+MARCADOR_BINARIO = 0x00
+CABECALHO_QUADRO = struct.Struct('>BI')  # Marcador + tamanho do conteúdo
+TAMANHO_MAXIMO_QUADRO = 64 * 1024
+
+# Código de cada tipo no quadro; novos tipos devem ser acrescentados ao fim do Enum
+CODIGO_POR_TIPO = {tipo.value: codigo for codigo, tipo in enumerate(TipoMensagem, 1)}
+TIPO_POR_CODIGO = {codigo: tipo for tipo, codigo in CODIGO_POR_TIPO.items()}
+CODIGO_GENERICO = 0  # Tipo fora da tabela: o campo 'tipo' segue no JSON
+MARCADOR_GENERICO = 0xFF  # Primeiro byte do corpo no formato genérico
+
+CORES = (VERDE, AMARELO)
+CAMPOS_TABULEIRO = (None, 'tabuleiro', 'tabuleiro_final')
+CAMPOS_ESTATISTICAS = ('pecas_verdes', 'pecas_amarelas', 'damas_verdes', 'damas_amarelas')
+
+# Byte de cada casa do tabuleiro
+CASA_PRETA = 0x10
+PECA_VERDE = 0x01
+PECA_AMARELA = 0x02
+PECA_DAMA = 0x04
+
+# Bits de MOVIMENTO_EXECUTADO
+FLAG_CAPTURA = 0x01
+FLAG_PROMOCAO = 0x02
+FLAG_CAMINHO = 0x04
+FLAG_VERSAO = 0x08
+FLAG_TABULEIRO = 0x10
+
+# flags, origem, destino, jogador_id, cor_jogador, turno, timestamp, sala_id
+MOVIMENTO_EXECUTADO = struct.Struct('>BBBIBBdI')
+VERSAO_HASH = struct.Struct('>IQ')
+ESTATISTICAS = struct.Struct('>4B')
+
+SEM_CORPO = frozenset({
+    TipoMensagem.PING.value, TipoMensagem.PONG.value, TipoMensagem.SOLICITAR_ESTADO.value
+})
+
+
+class ErroCodec(ValueError):
+    """Quadro binário malformado ou grande demais"""
+
+
+class _SemLayoutProprio(Exception):
+    """A mensagem não cabe no layout especializado; usa o formato genérico"""
+
+
+# === QUADROS ===
+
+def codificar(mensagem: Dict) -> bytes:
+    """Codifica a mensagem em um quadro binário completo (cabeçalho incluído)"""
+    conteudo = codificar_conteudo(mensagem)
+    return CABECALHO_QUADRO.pack(MARCADOR_BINARIO, len(conteudo)) + conteudo
+
+
+# === CONTEÚDO ===
+
+def codificar_conteudo(mensagem: Dict) -> bytes:
+    """Codifica a mensagem sem o cabeçalho do quadro"""
+    tipo = mensagem.get('tipo')
+    codigo = CODIGO_POR_TIPO.get(tipo, CODIGO_GENERICO)
+    
+    try:
+        if tipo in SEM_CORPO and len(mensagem) == 1:
+            return bytes((codigo,))
+        if tipo == TipoMensagem.MOVIMENTO_SOLICITADO.value:
+            return bytes((codigo,)) + _codificar_movimento_solicitado(mensagem)
+        if tipo == TipoMensagem.MOVIMENTO_EXECUTADO.value:
+            return bytes((codigo,)) + _codificar_movimento_executado(mensagem)
+    except _SemLayoutProprio:
+        pass
+    
+    return bytes((codigo,)) + _codificar_generico(mensagem, manter_tipo=codigo == CODIGO_GENERICO)
+
+
+def decodificar(conteudo: bytes) -> Dict:
+    """Decodifica o conteúdo de um quadro; ErroCodec se estiver malformado"""
+    try:
+        codigo = conteudo[0]
+        corpo = memoryview(conteudo)[1:]
+        tipo = None if codigo == CODIGO_GENERICO else TIPO_POR_CODIGO[codigo]
+        
+        if corpo and corpo[0] == MARCADOR_GENERICO:
+            return _decodificar_generico(corpo, tipo)
+        if tipo in SEM_CORPO and not corpo:
+            return {'tipo': tipo}
+        if tipo == TipoMensagem.MOVIMENTO_SOLICITADO.value:
+            return _decodificar_movimento_solicitado(corpo)
+        if tipo == TipoMensagem.MOVIMENTO_EXECUTADO.value:
+            return _decodificar_movimento_executado(corpo)
+        raise ErroCodec(f"Layout desconhecido para o tipo {tipo}")
+    except ErroCodec:
+        raise
+    except (IndexError, KeyError, TypeError, ValueError, struct.error) as e:
+        raise ErroCodec(f"Quadro binário inválido: {e}") from e
+
+
+# === CASAS, CORES E TABULEIRO ===
+
+def _casa(coordenadas) -> int:
+    """Índice de uma casa (y * 8 + x)"""
+    if (not isinstance(coordenadas, (list, tuple)) or len(coordenadas) != 2 or
+            not all(type(c) is int and 0 <= c < TAMANHO_TABULEIRO for c in coordenadas)):
+        raise _SemLayoutProprio
+    x, y = coordenadas
+    return y * TAMANHO_TABULEIRO + x
+
+
+def _coordenadas(indice: int) -> List[int]:
+    """Coordenadas [x, y] de um índice, como o JSON as entregaria"""
+    if indice >= TAMANHO_TABULEIRO * TAMANHO_TABULEIRO:
+        raise ErroCodec(f"Casa inexistente: {indice}")
+    return [indice % TAMANHO_TABULEIRO, indice // TAMANHO_TABULEIRO]
+
+
+def _casas(lista) -> bytes:
+    """Quantidade seguida dos índices das casas"""
+    if not isinstance(lista, list) or len(lista) > 255:
+        raise _SemLayoutProprio
+    return bytes([len(lista)] + [_casa(c) for c in lista])
+
+
+def _ler_casas(corpo, posicao: int) -> Tuple[List[List[int]], int]:
+    """Lê uma lista gravada por _casas; retorna (coordenadas, próxima posição)"""
+    quantidade = corpo[posicao]
+    fim = posicao + 1 + quantidade
+    if fim > len(corpo):
+        raise ErroCodec("Lista de casas truncada")
+    return [_coordenadas(i) for i in corpo[posicao + 1:fim]], fim
+
+
+def _cor(cor) -> int:
+    """Índice da cor de jogador"""
+    if isinstance(cor, (list, tuple)):
+        cor = tuple(cor)
+    if cor not in CORES:
+        raise _SemLayoutProprio
+    return CORES.index(cor)
+
+
+def _codificar_tabuleiro(matriz) -> bytes:
+    """Matriz [x][y] de casas em 64 bytes, na ordem de _casa"""
+    if (not isinstance(matriz, list) or len(matriz) != TAMANHO_TABULEIRO or
+            any(len(coluna) != TAMANHO_TABULEIRO for coluna in matriz)):
+        raise _SemLayoutProprio
+    
+    dados = bytearray(TAMANHO_TABULEIRO * TAMANHO_TABULEIRO)
+    for x, coluna in enumerate(matriz):
+        for y, quadrado in enumerate(coluna):
+            cor_quadrado = tuple(quadrado['cor_quadrado'])
+            if cor_quadrado not in (PRETO, BRANCO):
+                raise _SemLayoutProprio
+            
+            valor = CASA_PRETA if cor_quadrado == PRETO else 0
+            peca = quadrado['peca']
+            if peca is not None:
+                valor |= PECA_VERDE if _cor(peca['cor']) == 0 else PECA_AMARELA
+                if peca['e_dama']:
+                    valor |= PECA_DAMA
+            dados[y * TAMANHO_TABULEIRO + x] = valor
+    return bytes(dados)
+
+
+def _decodificar_tabuleiro(dados) -> List[List[Dict]]:
+    """Inverso de _codificar_tabuleiro"""
+    if len(dados) != TAMANHO_TABULEIRO * TAMANHO_TABULEIRO:
+        raise ErroCodec("Tabuleiro truncado")
+    
+    matriz = []
+    for x in range(TAMANHO_TABULEIRO):
+        coluna = []
+        for y in range(TAMANHO_TABULEIRO):
+            valor = dados[y * TAMANHO_TABULEIRO + x]
+            peca = None
+            if valor & (PECA_VERDE | PECA_AMARELA):
+                peca = {
+                    'cor': list(VERDE if valor & PECA_VERDE else AMARELO),
+                    'e_dama': bool(valor & PECA_DAMA)
+                }
+            coluna.append({
+                'cor_quadrado': list(PRETO if valor & CASA_PRETA else BRANCO),
+                'peca': peca
+            })
+        matriz.append(coluna)
+    return matriz
+
+
+# === LAYOUTS ESPECIALIZADOS ===
+
+def _codificar_movimento_solicitado(mensagem: Dict) -> bytes:
+    """origem, destino e caminho opcional de capturas"""
+    if not set(mensagem) <= {'tipo', 'origem', 'destino', 'caminho'}:
+        raise _SemLayoutProprio
+    
+    dados = bytes((_casa(mensagem['origem']), _casa(mensagem['destino'])))
+    if 'caminho' in mensagem:
+        dados += _casas(mensagem['caminho'])
+    return dados
+
+
+def _decodificar_movimento_solicitado(corpo) -> Dict:
+    """Inverso de _codificar_movimento_solicitado"""
+    mensagem = {
+        'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
+        'origem': _coordenadas(corpo[0]),
+        'destino': _coordenadas(corpo[1])
+    }
+    if len(corpo) > 2:
+        mensagem['caminho'], _ = _ler_casas(corpo, 2)
+    return mensagem
+
+
+def _codificar_movimento_executado(mensagem: Dict) -> bytes:
+    """Lance, turno, versão/hash e, se presente, o tabuleiro completo"""
+    movimento = mensagem['movimento']
+    tem_tabuleiro = 'tabuleiro' in mensagem
+    tem_versao = 'versao' in mensagem
+    
+    esperados = {'tipo', 'movimento', 'turno', 'mensagem', 'sala_id'}
+    if tem_tabuleiro:
+        esperados |= {'tabuleiro', 'estatisticas'}
+    if tem_versao:
+        esperados |= {'versao', 'hash'}
+    if set(mensagem) != esperados:
+        raise _SemLayoutProprio
+    
+    flags = 0
+    campos_movimento = {'origem', 'destino', 'jogador_id', 'cor_jogador', 'timestamp'}
+    if movimento.get('e_captura'):
+        flags |= FLAG_CAPTURA
+        campos_movimento |= {'e_captura', 'pecas_capturadas'}
+        if 'caminho' in movimento:
+            flags |= FLAG_CAMINHO
+            campos_movimento.add('caminho')
+    if movimento.get('promoveu_dama'):
+        flags |= FLAG_PROMOCAO
+        campos_movimento.add('promoveu_dama')
+    if tem_versao:
+        flags |= FLAG_VERSAO
+    if tem_tabuleiro:
+        flags |= FLAG_TABULEIRO
+    if set(movimento) != campos_movimento:
+        raise _SemLayoutProprio
+    
+    try:
+        partes = [MOVIMENTO_EXECUTADO.pack(
+            flags, _casa(movimento['origem']), _casa(movimento['destino']),
+            movimento['jogador_id'], _cor(movimento['cor_jogador']), _cor(mensagem['turno']),
+            movimento['timestamp'], mensagem['sala_id']
+        )]
+        if tem_versao:
+            partes.append(VERSAO_HASH.pack(mensagem['versao'], int(mensagem['hash'], 16)))
+        if flags & FLAG_CAPTURA:
+            partes.append(_casas(movimento['pecas_capturadas']))
+        if flags & FLAG_CAMINHO:
+            partes.append(_casas(movimento['caminho']))
+        if tem_tabuleiro:
+            partes.append(_codificar_tabuleiro(mensagem['tabuleiro']))
+            partes.append(ESTATISTICAS.pack(*(mensagem['estatisticas'][c] for c in CAMPOS_ESTATISTICAS)))
+    except (struct.error, TypeError, ValueError):
+        raise _SemLayoutProprio
+    
+    # O texto exibido ao jogador ocupa o restante do quadro
+    partes.append(mensagem['mensagem'].encode('utf-8'))
+    return b''.join(partes)
+
+
+def _decodificar_movimento_executado(corpo) -> Dict:
+    """Inverso de _codificar_movimento_executado"""
+    (flags, origem, destino, jogador_id, cor_jogador, turno,
+     timestamp, sala_id) = MOVIMENTO_EXECUTADO.unpack_from(corpo, 0)
+    posicao = MOVIMENTO_EXECUTADO.size
+    
+    movimento = {
+        'origem': _coordenadas(origem),
+        'destino': _coordenadas(destino),
+        'jogador_id': jogador_id,
+        'cor_jogador': list(CORES[cor_jogador]),
+        'timestamp': timestamp
+    }
+    mensagem = {
+        'tipo': TipoMensagem.MOVIMENTO_EXECUTADO.value,
+        'movimento': movimento,
+        'turno': list(CORES[turno]),
+        'sala_id': sala_id
+    }
+    
+    if flags & FLAG_VERSAO:
+        versao, hash_tabuleiro = VERSAO_HASH.unpack_from(corpo, posicao)
+        posicao += VERSAO_HASH.size
+        mensagem['versao'] = versao
+        mensagem['hash'] = formatar_hash(hash_tabuleiro)
+    if flags & FLAG_CAPTURA:
+        movimento['e_captura'] = True
+        movimento['pecas_capturadas'], posicao = _ler_casas(corpo, posicao)
+    if flags & FLAG_CAMINHO:
+        movimento['caminho'], posicao = _ler_casas(corpo, posicao)
+    if flags & FLAG_PROMOCAO:
+        movimento['promoveu_dama'] = True
+    if flags & FLAG_TABULEIRO:
+        tamanho = TAMANHO_TABULEIRO * TAMANHO_TABULEIRO
+        mensagem['tabuleiro'] = _decodificar_tabuleiro(corpo[posicao:posicao + tamanho])
+        posicao += tamanho
+        mensagem['estatisticas'] = dict(zip(CAMPOS_ESTATISTICAS, ESTATISTICAS.unpack_from(corpo, posicao)))
+        posicao += ESTATISTICAS.size
+    
+    mensagem['mensagem'] = bytes(corpo[posicao:]).decode('utf-8')
+    return mensagem
+
+
+# === FORMATO GENÉRICO ===
+
+def _codificar_generico(mensagem: Dict, manter_tipo: bool) -> bytes:
+    """
+    Marcador genérico, campo do tabuleiro (0 se ausente), 64 bytes do tabuleiro
+    e os demais campos em JSON compacto
+    """
+    campos = dict(mensagem)
+    if not manter_tipo:
+        del campos['tipo']
+    
+    campo_tabuleiro = 0
+    tabuleiro = b''
+    for indice, nome in enumerate(CAMPOS_TABULEIRO[1:], 1):
+        if nome in campos:
+            try:
+                tabuleiro = _codificar_tabuleiro(campos[nome])
+            except (_SemLayoutProprio, KeyError, TypeError):
+                break
+            del campos[nome]
+            campo_tabuleiro = indice
+            break
+    
+    restante = json.dumps(campos, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return bytes((MARCADOR_GENERICO, campo_tabuleiro)) + tabuleiro + restante
+
+
+def _decodificar_generico(corpo, tipo: Optional[str]) -> Dict:
+    """Inverso de _codificar_generico"""
+    campo_tabuleiro = CAMPOS_TABULEIRO[corpo[1]]
+    posicao = 2
+    tabuleiro = None
+    if campo_tabuleiro is not None:
+        tamanho = TAMANHO_TABULEIRO * TAMANHO_TABULEIRO
+        tabuleiro = _decodificar_tabuleiro(corpo[posicao:posicao + tamanho])
+        posicao += tamanho
+    
+    mensagem = json.loads(bytes(corpo[posicao:]).decode('utf-8'))
+    if not isinstance(mensagem, dict):
+        raise ErroCodec("Corpo genérico deve ser um objeto")
+    if tipo is not None:
+        mensagem = {'tipo': tipo, **mensagem}
+    if tabuleiro is not None:
+        mensagem[campo_tabuleiro] = tabuleiro
+    return mensagem
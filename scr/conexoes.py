@@ -0,0 +1,224 @@
+"""
+Conexões do servidor com fila de saída própria
+
+Cada conexão tem uma FilaSaida limitada em bytes, esvaziada por um
+escritor dedicado (uma thread no modo threads, uma corrotina no modo
+asyncio). Quem envia só enfileira bytes já codificados e nunca bloqueia,
+então um cliente lento não atrasa a jogada dos demais nem o lock da sala.
+
+Política quando a fila de um cliente enche: mensagens descartáveis (chat,
+notificações, pong) são descartadas, primeiro as novas e depois as que
+ainda estavam na fila; se nem assim couber uma mensagem de jogo, a
+conexão é derrubada (FilaSaidaCheia) e o cliente é desconectado.
+"""
+
+import asyncio
+import socket
+import threading
+from collections import deque
+from typing import Callable, Deque, List, Optional, Tuple
+
+
+LIMITE_BYTES_SAIDA = 256 * 1024  # Bytes pendentes por conexão antes de aplicar a política
+
+
+class FilaSaidaCheia(ConnectionError):
+    """O cliente não está consumindo as mensagens; a conexão foi derrubada"""
+
+
+class FilaSaida:
+    """Fila limitada de envios de uma conexão"""
+    
+    def __init__(self, limite_bytes: int = LIMITE_BYTES_SAIDA):
+        """
+        Cria a fila vazia
+        
+        Args:
+            limite_bytes: Total de bytes pendentes permitido
+        """
+        self.itens: Deque[Tuple[bytes, bool]] = deque()  # (dados, descartavel)
+        self.bytes_pendentes = 0
+        self.limite_bytes = limite_bytes
+        self.fechada = False
+        self.descartadas = 0
+        
+        self.condicao = threading.Condition()
+        self.ao_colocar: Optional[Callable[[], None]] = None  # Acorda o escritor assíncrono
+    
+    def colocar(self, dados: bytes, descartavel: bool = False) -> bool:
+        """
+        Enfileira bytes já codificados
+        
+        Returns:
+            True se enfileirou ou descartou pela política; False se a fila está
+            fechada ou cheia de mensagens de jogo (a conexão deve ser derrubada)
+        """
+        with self.condicao:
+            if self.fechada:
+                return False
+            
+            if self.bytes_pendentes + len(dados) > self.limite_bytes:
+                if descartavel:
+                    self.descartadas += 1
+                    return True
+                self._descartar_pendentes()
+                if self.bytes_pendentes + len(dados) > self.limite_bytes:
+                    return False
+            
+            self.itens.append((dados, descartavel))
+            self.bytes_pendentes += len(dados)
+            self.condicao.notify()
+        
+        if self.ao_colocar is not None:
+            self.ao_colocar()
+        return True
+    
+    def _descartar_pendentes(self):
+        """Remove da fila as mensagens descartáveis ainda não enviadas"""
+        mantidos = deque()
+        for dados, descartavel in self.itens:
+            if descartavel:
+                self.descartadas += 1
+                self.bytes_pendentes -= len(dados)
+            else:
+                mantidos.append((dados, descartavel))
+        self.itens = mantidos
+    
+    def retirar(self, esperar: bool = True) -> List[bytes]:
+        """
+        Retira tudo o que está pendente
+        
+        Args:
+            esperar: Bloqueia até haver dados ou a fila ser fechada
+        
+        Returns:
+            Lista de envios; vazia se a fila foi fechada e esvaziada (ou se não
+            havia nada e esperar=False)
+        """
+        with self.condicao:
+            while esperar and not self.itens and not self.fechada:
+                self.condicao.wait()
+            
+            lote = [dados for dados, _ in self.itens]
+            self.itens.clear()
+            self.bytes_pendentes = 0
+            return lote
+    
+    def fechar(self, descartar: bool = False):
+        """Impede novos envios; com descartar=True também abandona os pendentes"""
+        with self.condicao:
+            self.fechada = True
+            if descartar:
+                self.itens.clear()
+                self.bytes_pendentes = 0
+            self.condicao.notify()
+        
+        if self.ao_colocar is not None:
+            self.ao_colocar()
+
+
+class ConexaoThread:
+    """Socket de um cliente no modo threads, com thread escritora própria"""
+    
+    __slots__ = ('socket', 'endereco', 'fila', 'thread_escrita')
+    
+    def __init__(self, cliente_socket: socket.socket, endereco):
+        """Envolve o socket aceito e inicia a thread escritora"""
+        self.socket = cliente_socket
+        self.endereco = endereco
+        self.fila = FilaSaida()
+        
+        self.thread_escrita = threading.Thread(target=self._escrever, daemon=True)
+        self.thread_escrita.start()
+    
+    def enfileirar(self, dados: bytes, descartavel: bool = False):
+        """Enfileira o envio; derruba a conexão se a fila estiver cheia"""
+        if self.fila.fechada:
+            raise ConnectionError("Conexão encerrada")
+        if not self.fila.colocar(dados, descartavel):
+            self.shutdown()
+            raise FilaSaidaCheia("Fila de saída cheia")
+    
+    def _escrever(self):
+        """Envia os lotes enfileirados com sendall até a fila ser fechada"""
+        try:
+            while True:
+                lote = self.fila.retirar()
+                if not lote:
+                    break
+                self.socket.sendall(b''.join(lote))
+        except OSError:
+            self.fila.fechar(descartar=True)
+        finally:
+            try:
+                self.socket.close()
+            except OSError:
+                pass
+    
+    def recv_into(self, buffer, tamanho: int = 0) -> int:
+        """Leitura direta do socket (usada por BufferRecepcao)"""
+        return self.socket.recv_into(buffer, tamanho)
+    
+    def close(self):
+        """Fecha após enviar o que já está na fila"""
+        self.fila.fechar()
+    
+    def shutdown(self, como=socket.SHUT_RDWR):
+        """Derruba a conexão imediatamente; a leitura recebe fim de arquivo"""
+        self.fila.fechar(descartar=True)
+        try:
+            self.socket.shutdown(como)
+        except OSError:
+            pass
+
+
+class ConexaoAsync:
+    """StreamWriter de um cliente no modo asyncio, com corrotina escritora própria"""
+    
+    __slots__ = ('writer', 'endereco', 'fila', 'evento', 'tarefa_escrita')
+    
+    def __init__(self, writer: asyncio.StreamWriter):
+        """Guarda o writer e inicia a corrotina escritora (no laço de eventos atual)"""
+        self.writer = writer
+        self.endereco = writer.get_extra_info('peername')
+        self.fila = FilaSaida()
+        
+        # Todos os envios partem do laço de eventos, então o evento pode ser setado direto
+        self.evento = asyncio.Event()
+        self.fila.ao_colocar = self.evento.set
+        self.tarefa_escrita = asyncio.get_running_loop().create_task(self._escrever())
+    
+    def enfileirar(self, dados: bytes, descartavel: bool = False):
+        """Enfileira o envio; derruba a conexão se a fila estiver cheia"""
+        if self.fila.fechada or self.writer.is_closing():
+            raise ConnectionError("Conexão encerrada")
+        if not self.fila.colocar(dados, descartavel):
+            self.shutdown()
+            raise FilaSaidaCheia("Fila de saída cheia")
+    
+    async def _escrever(self):
+        """Repassa os lotes ao transporte com writelines e respeita drain()"""
+        try:
+            while True:
+                self.evento.clear()
+                lote = self.fila.retirar(esperar=False)
+                if lote:
+                    self.writer.writelines(lote)
+                    await self.writer.drain()
+                elif self.fila.fechada:
+                    break
+                else:
+                    await self.evento.wait()
+        except ConnectionError:
+            self.fila.fechar(descartar=True)
+        finally:
+            self.writer.close()
+    
+    def close(self):
+        """Fecha após enviar o que já está na fila"""
+        self.fila.fechar()
+    
+    def shutdown(self, como=None):
+        """Derruba a conexão imediatamente; a corrotina de leitura recebe fim de arquivo"""
+        self.fila.fechar(descartar=True)
+        self.writer.transport.abort()
@@ -0,0 +1,276 @@
+"""
+Espectadores - acompanhamento somente leitura das partidas
+
+Um espectador entra em qualquer sala em andamento, recebe um retrato do
+estado atual (ESTADO_JOGO com versão e hash) e depois os eventos da
+partida. Os eventos são publicados com o lock da sala em mãos, mas apenas
+entram em uma fila ordenada: o DistribuidorEspectadores os repassa fora
+do lock (em thread própria no modo threads, no laço de eventos no modo
+asyncio), serializa cada variante uma vez e junta tudo o que acumulou em
+um único envio por espectador. Assim uma sala com milhares de espectadores
+não atrasa as jogadas.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from fila_pareamento import calcular_percentis
+from protocolo import Capacidades, EstadoJogador, Jogador
+
+
+AMOSTRAS_LATENCIA = 1000  # Latências de distribuição recentes usadas nos percentis
+
+# Ações da fila de distribuição
+PUBLICAR = "publicar"
+ENTRAR = "entrar"
+ENCERRAR = "encerrar"
+
+
+class DistribuidorEspectadores:
+    """Fila ordenada de eventos das salas e envio em lote aos espectadores"""
+    
+    def __init__(self, codificar: Callable[[Dict, bool], bytes],
+                 enviar: Callable[[Any, bytes, bool], None], amostras: int = AMOSTRAS_LATENCIA,
+                 ao_liberar: Optional[Callable[[Any, Jogador], None]] = None):
+        """
+        Cria o distribuidor sem espectadores
+        
+        Args:
+            codificar: (mensagem, binario) -> bytes, o mesmo usado para os jogadores
+            enviar: (conexao, dados, descartavel); exceções removem o espectador
+            amostras: Quantidade de latências recentes guardadas para percentis
+            ao_liberar: (conexao, jogador) chamado para cada espectador de uma sala
+                encerrada, depois dos últimos eventos dela (o servidor o devolve à fila)
+        """
+        self.codificar = codificar
+        self.enviar = enviar
+        self.ao_liberar = ao_liberar
+        
+        # Índices atualizados na hora (com o lock da sala em mãos)
+        self.sala_do_espectador: Dict[Any, Tuple[int, Jogador, bool]] = {}  # conexao -> (sala_id, jogador, sem delta)
+        self.contagem: Dict[int, int] = {}    # sala_id -> espectadores, inclusive os que aguardam o retrato
+        self.sem_delta: Dict[int, int] = {}   # sala_id -> espectadores sem Capacidades.DELTA
+        
+        # Quem já recebeu o retrato; só muda na ordem da fila (exceto saídas)
+        self.destinatarios: Dict[int, Dict[Any, Jogador]] = {}
+        
+        self.pendentes: Deque[Tuple] = deque()
+        self.latencias: Deque[float] = deque(maxlen=amostras)
+        self.mensagens_distribuidas = 0
+        self.envios = 0
+        
+        self.lock = threading.Lock()
+        self.condicao = threading.Condition(self.lock)
+        self.laco = None  # Laço de eventos no modo asyncio
+        self.agendado = False
+        self.thread = None
+        self.rodando = True
+    
+    def usar_laco(self, laco):
+        """Distribui no laço de eventos (as conexões asyncio só aceitam envios dele)"""
+        self.laco = laco
+    
+    # === CHAMADOS COM O LOCK DA SALA ===
+    
+    def tem_espectadores(self, sala_id: int) -> bool:
+        """Se a sala tem espectadores (publicar é dispensável quando não tem)"""
+        return self.contagem.get(sala_id, 0) > 0
+    
+    def precisa_completo(self, sala_id: int) -> bool:
+        """Se algum espectador da sala precisa do tabuleiro completo em MOVIMENTO_EXECUTADO"""
+        return self.sem_delta.get(sala_id, 0) > 0
+    
+    def entrar(self, sala_id: int, conexao, jogador: Jogador, retrato: bytes):
+        """
+        Inscreve o espectador na sala; ele recebe o retrato e, depois dele, os eventos
+        
+        O retrato chega já serializado no codec do espectador (o servidor o
+        guarda por versão da sala). Chamar de novo (mesmo na mesma sala)
+        reenvia o retrato, o que também serve de ressincronização. Define
+        jogador.estado e jogador.sala_id.
+        """
+        with self.lock:
+            self._remover(conexao)
+            jogador.estado = EstadoJogador.ESPECTADOR
+            jogador.sala_id = sala_id
+            jogador.cor = None
+            sem_delta = Capacidades.DELTA not in jogador.capacidades
+            self.sala_do_espectador[conexao] = (sala_id, jogador, sem_delta)
+            self.contagem[sala_id] = self.contagem.get(sala_id, 0) + 1
+            if sem_delta:
+                self.sem_delta[sala_id] = self.sem_delta.get(sala_id, 0) + 1
+            
+            self.pendentes.append((ENTRAR, sala_id, conexao, jogador, retrato))
+            self._agendar()
+    
+    def publicar(self, sala_id: int, mensagem: Dict, mensagem_delta: Optional[Dict] = None,
+                 serializadas: Optional[Dict[Tuple[bool, bool], bytes]] = None, descartavel: bool = False):
+        """
+        Enfileira um evento da sala para os espectadores
+        
+        Args:
+            mensagem: Mensagem completa (não deve ser alterada depois)
+            mensagem_delta: Variante para quem tem Capacidades.DELTA, se houver
+            serializadas: Bytes já codificados no broadcast, por (usa_delta, binario)
+            descartavel: Se pode ser descartada quando a fila do espectador enche
+        """
+        if not self.tem_espectadores(sala_id):
+            return
+        
+        with self.lock:
+            self.pendentes.append((PUBLICAR, sala_id, mensagem, mensagem_delta, dict(serializadas or {}),
+                                   descartavel, time.perf_counter()))
+            self._agendar()
+    
+    def encerrar_sala(self, sala_id: int):
+        """Libera os espectadores da sala depois dos eventos já publicados"""
+        if not self.tem_espectadores(sala_id):
+            return
+        
+        with self.lock:
+            self.pendentes.append((ENCERRAR, sala_id))
+            self._agendar()
+    
+    # === CHAMADOS DE QUALQUER THREAD ===
+    
+    def sair(self, conexao) -> bool:
+        """Remove o espectador (desconexão); retorna se ele estava inscrito"""
+        with self.lock:
+            return self._remover(conexao)
+    
+    def _remover(self, conexao) -> bool:
+        """Remove o espectador de todos os índices (chamador segura o lock)"""
+        inscricao = self.sala_do_espectador.pop(conexao, None)
+        if inscricao is None:
+            return False
+        
+        sala_id, _, sem_delta = inscricao
+        self.destinatarios.get(sala_id, {}).pop(conexao, None)
+        self.contagem[sala_id] -= 1
+        if not self.contagem[sala_id]:
+            del self.contagem[sala_id]
+        if sem_delta:
+            self.sem_delta[sala_id] -= 1
+            if not self.sem_delta[sala_id]:
+                del self.sem_delta[sala_id]
+        return True
+    
+    def _agendar(self):
+        """Acorda quem distribui (chamador segura o lock)"""
+        if self.laco is not None:
+            if not self.agendado:
+                self.agendado = True
+                self.laco.call_soon_threadsafe(self.distribuir)
+            return
+        
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._executar, name="espectadores", daemon=True)
+            self.thread.start()
+        self.condicao.notify()
+    
+    def _executar(self):
+        """Thread distribuidora do modo threads"""
+        while True:
+            with self.condicao:
+                while not self.pendentes and self.rodando:
+                    self.condicao.wait()
+                if not self.pendentes:
+                    return
+            self.distribuir()
+    
+    def distribuir(self):
+        """Repassa tudo o que está pendente, com um envio por espectador"""
+        with self.lock:
+            itens = list(self.pendentes)
+            self.pendentes.clear()
+            self.agendado = False
+        
+        lotes: Dict[Any, List[bytes]] = {}
+        descartaveis: Dict[Any, bool] = {}
+        publicados: List[float] = []
+        liberados: List[Tuple[Any, Jogador]] = []
+        mensagens = 0
+        
+        for item in itens:
+            if item[0] == PUBLICAR:
+                _, sala_id, mensagem, mensagem_delta, serializadas, descartavel, publicado_em = item
+                with self.lock:
+                    destinatarios = list(self.destinatarios.get(sala_id, {}).items())
+                
+                for conexao, jogador in destinatarios:
+                    usa_delta = mensagem_delta is not None and Capacidades.DELTA in jogador.capacidades
+                    binario = Capacidades.BINARIO in jogador.capacidades
+                    dados = serializadas.get((usa_delta, binario))
+                    if dados is None:
+                        dados = self.codificar(mensagem_delta if usa_delta else mensagem, binario)
+                        serializadas[(usa_delta, binario)] = dados
+                    
+                    lotes.setdefault(conexao, []).append(dados)
+                    descartaveis[conexao] = descartaveis.get(conexao, True) and descartavel
+                
+                if destinatarios:
+                    publicados.append(publicado_em)
+                    mensagens += len(destinatarios)
+            
+            elif item[0] == ENTRAR:
+                _, sala_id, conexao, jogador, retrato = item
+                with self.lock:
+                    # Saiu ou trocou de sala antes da vez dele na fila
+                    if self.sala_do_espectador.get(conexao, (None,))[0] != sala_id:
+                        continue
+                    self.destinatarios.setdefault(sala_id, {})[conexao] = jogador
+                
+                # Eventos anteriores ainda no lote são substituídos pelo retrato
+                lotes[conexao] = [retrato]
+                descartaveis[conexao] = False
+            
+            else:
+                _, sala_id = item
+                with self.lock:
+                    for conexao, (sala_inscrita, jogador, _) in list(self.sala_do_espectador.items()):
+                        if sala_inscrita == sala_id:
+                            self._remover(conexao)
+                            jogador.estado = EstadoJogador.CONECTADO
+                            jogador.sala_id = None
+                            liberados.append((conexao, jogador))
+                    self.destinatarios.pop(sala_id, None)
+        
+        for conexao, lote in lotes.items():
+            try:
+                self.enviar(conexao, lote[0] if len(lote) == 1 else b''.join(lote), descartaveis[conexao])
+            except Exception:
+                # A conexão já foi derrubada (ou estava fechada); a leitura faz a desconexão
+                self.sair(conexao)
+        
+        concluido_em = time.perf_counter()
+        with self.lock:
+            self.latencias.extend(concluido_em - publicado_em for publicado_em in publicados)
+            self.mensagens_distribuidas += mensagens
+            self.envios += len(lotes)
+        
+        # Só depois de enviado o fim da partida, fora do lock (o servidor pode formar pares)
+        if self.ao_liberar is not None:
+            for conexao, jogador in liberados:
+                self.ao_liberar(conexao, jogador)
+    
+    def parar(self):
+        """Encerra a thread distribuidora depois dos envios pendentes"""
+        with self.condicao:
+            self.rodando = False
+            self.condicao.notify()
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        """Espectadores, salas assistidas, volume distribuído e latência de distribuição"""
+        with self.lock:
+            dados = {
+                'conectados': len(self.sala_do_espectador),
+                'salas_assistidas': len(self.contagem),
+                'maior_audiencia': max(self.contagem.values(), default=0),
+                'mensagens_distribuidas': self.mensagens_distribuidas,
+                'envios': self.envios,
+            }
+            latencias = list(self.latencias)
+        dados['latencia'] = calcular_percentis(latencias)
+        return dados
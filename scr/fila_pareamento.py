@@ -0,0 +1,242 @@
+"""
+Fila de pareamento - junta automaticamente jogadores à espera de partida
+
+Jogadores entram em filas FIFO separadas por faixa de rating; quem chega é
+pareado com o mais antigo da sua faixa em O(1). Saídas da fila apenas
+marcam a entrada, que é descartada quando chega à frente (remoção
+preguiçosa), também em O(1).
+
+Quem espera demais aceita faixas vizinhas: a cada ESPERA_AMPLIAR_FAIXA
+segundos de espera a tolerância cresce uma faixa, tanto para quem chega
+quanto na varredura periódica (parear_esperas) feita pelo servidor.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from protocolo import Jogador
+
+
+LARGURA_FAIXA_RATING = 200   # Jogadores são pareados preferencialmente dentro da mesma faixa
+ESPERA_AMPLIAR_FAIXA = 10.0  # Segundos de espera para aceitar cada faixa vizinha a mais
+AMOSTRAS_ESPERA = 1000       # Tempos de espera recentes usados nos percentis
+
+
+def calcular_percentis(amostras, percentis=(50, 90, 99)) -> Dict[str, float]:
+    """Percentis pelo método do posto mais próximo ({'p50': ...}; 0.0 sem amostras)"""
+    amostras = sorted(amostras)
+    resultado = {}
+    for percentil in percentis:
+        if amostras:
+            posicao = max(0, -(-percentil * len(amostras) // 100) - 1)
+            resultado[f'p{percentil}'] = amostras[posicao]
+        else:
+            resultado[f'p{percentil}'] = 0.0
+    return resultado
+
+
+@dataclass
+class EntradaFila:
+    """Posição de um jogador na fila de pareamento"""
+    cliente: Any
+    jogador: Jogador
+    faixa: int
+    entrou_em: float
+    ativa: bool = True
+
+
+class FilaPareamento:
+    """Filas FIFO por faixa de rating com estatísticas de espera"""
+    
+    def __init__(self, largura_faixa: int = LARGURA_FAIXA_RATING, amostras: int = AMOSTRAS_ESPERA,
+                 espera_ampliar: float = ESPERA_AMPLIAR_FAIXA):
+        """
+        Cria a fila vazia
+        
+        Args:
+            largura_faixa: Pontos de rating por faixa (jogadores sem rating ficam na faixa 0)
+            amostras: Quantidade de tempos de espera recentes guardados para percentis
+            espera_ampliar: Segundos de espera para aceitar cada faixa vizinha a mais
+        """
+        self.largura_faixa = largura_faixa
+        self.espera_ampliar = espera_ampliar
+        self.filas: Dict[int, Deque[EntradaFila]] = {}
+        self.aguardando: Dict[Any, EntradaFila] = {}  # cliente -> entrada ativa
+        
+        self.esperas: Deque[float] = deque(maxlen=amostras)
+        self.pares_formados = 0
+        self.pares_ampliados = 0  # Pares formados entre faixas diferentes
+        
+        self.lock = threading.Lock()
+    
+    @property
+    def profundidade(self) -> int:
+        """Número de jogadores aguardando adversário"""
+        return len(self.aguardando)
+    
+    def faixa(self, rating: Optional[int]) -> int:
+        """Faixa de rating usada para separar as filas"""
+        return 0 if rating is None else rating // self.largura_faixa
+    
+    def entrar(self, cliente_socket, jogador: Jogador) -> Optional[Tuple[EntradaFila, EntradaFila]]:
+        """
+        Coloca o jogador na fila da sua faixa ou o pareia com quem espera há mais tempo
+        
+        Sem ninguém na própria faixa, pode ser pareado com quem, em faixa
+        vizinha, já espera o bastante para aceitá-lo. Um cliente que já
+        estava na fila perde a posição anterior.
+        
+        Returns:
+            (entrada mais antiga, entrada do recém-chegado) se formou par, senão None
+        """
+        agora = time.time()
+        faixa = self.faixa(jogador.rating)
+        
+        with self.lock:
+            self._remover(cliente_socket)
+            nova = EntradaFila(cliente_socket, jogador, faixa, agora)
+            
+            oponente = self._frente(faixa)
+            if oponente is None:
+                oponente = self._vizinho_compativel(faixa, 0, agora)
+            if oponente is not None:
+                self._retirar(oponente, agora)
+                self.esperas.append(0.0)
+                self._contar_par(oponente, nova)
+                return oponente, nova
+            
+            self.filas.setdefault(faixa, deque()).append(nova)
+            self.aguardando[cliente_socket] = nova
+            return None
+    
+    def parear_esperas(self) -> List[Tuple[EntradaFila, EntradaFila]]:
+        """
+        Pareia entre faixas vizinhas quem já espera o bastante para ampliar a faixa
+        
+        Chamado periodicamente: sem novas chegadas, jogadores isolados em
+        faixas diferentes nunca seriam pareados por entrar().
+        
+        Returns:
+            Pares (entrada mais antiga, adversário) formados nesta varredura
+        """
+        agora = time.time()
+        pares = []
+        
+        with self.lock:
+            # aguardando preserva a ordem de chegada: da espera mais longa para a mais curta
+            for entrada in list(self.aguardando.values()):
+                if self.aguardando.get(entrada.cliente) is not entrada:
+                    continue  # Já pareada nesta varredura
+                
+                tolerancia = self._tolerancia(entrada, agora)
+                if tolerancia == 0:
+                    break  # Os seguintes esperam ainda menos
+                
+                oponente = self._vizinho_compativel(entrada.faixa, tolerancia, agora)
+                if oponente is None:
+                    continue
+                
+                self._retirar(entrada, agora)
+                self._retirar(oponente, agora)
+                self._contar_par(entrada, oponente)
+                pares.append((entrada, oponente))
+        
+        return pares
+    
+    def sair(self, cliente_socket) -> bool:
+        """Retira o cliente da fila; retorna True se ele estava aguardando"""
+        with self.lock:
+            return self._remover(cliente_socket)
+    
+    def _tolerancia(self, entrada: EntradaFila, agora: float) -> int:
+        """Quantas faixas de distância a entrada já aceita pelo tempo de espera"""
+        return int((agora - entrada.entrou_em) // self.espera_ampliar)
+    
+    def _frente(self, faixa: int) -> Optional[EntradaFila]:
+        """
+        Entrada ativa à espera na faixa, descartando as de quem saiu (chamador segura o lock)
+        
+        Cada faixa tem no máximo uma entrada ativa: quem chega a uma faixa
+        ocupada é pareado na hora.
+        """
+        fila = self.filas.get(faixa)
+        if fila is None:
+            return None
+        while fila and not fila[0].ativa:
+            fila.popleft()
+        if not fila:
+            del self.filas[faixa]
+            return None
+        return fila[0]
+    
+    def _vizinho_compativel(self, faixa: int, tolerancia: int, agora: float) -> Optional[EntradaFila]:
+        """
+        Entrada de outra faixa mais próxima aceita por um dos dois lados (chamador segura o lock)
+        
+        Consulta só as faixas faixa ± d, com d até a maior tolerância possível
+        agora (a de quem espera há mais tempo): sem esperas longas, nenhuma
+        faixa vizinha é olhada. Em empate de distância vence quem espera há
+        mais tempo.
+        """
+        if not self.aguardando:
+            return None
+        
+        mais_antiga = next(iter(self.aguardando.values()))  # Ordem de chegada
+        alcance = max(tolerancia, self._tolerancia(mais_antiga, agora))
+        
+        for distancia in range(1, alcance + 1):
+            candidatas = [
+                entrada for entrada in (self._frente(faixa - distancia), self._frente(faixa + distancia))
+                if entrada is not None and distancia <= max(tolerancia, self._tolerancia(entrada, agora))
+            ]
+            if candidatas:
+                return min(candidatas, key=lambda entrada: entrada.entrou_em)
+        return None
+    
+    def _retirar(self, entrada: EntradaFila, agora: float):
+        """Tira da fila uma entrada pareada, que está à frente da sua faixa (chamador segura o lock)"""
+        fila = self.filas[entrada.faixa]
+        fila.popleft()
+        if not fila:
+            del self.filas[entrada.faixa]
+        del self.aguardando[entrada.cliente]
+        self.esperas.append(agora - entrada.entrou_em)
+    
+    def _contar_par(self, primeira: EntradaFila, segunda: EntradaFila):
+        """Atualiza os contadores de pares (chamador segura o lock)"""
+        self.pares_formados += 1
+        if primeira.faixa != segunda.faixa:
+            self.pares_ampliados += 1
+    
+    def _remover(self, cliente_socket) -> bool:
+        """Marca a entrada do cliente como inativa (chamador segura o lock)"""
+        entrada = self.aguardando.pop(cliente_socket, None)
+        if entrada is None:
+            return False
+        entrada.ativa = False
+        return True
+    
+    def percentis_espera(self, percentis=(50, 90, 99)) -> Dict[str, float]:
+        """Percentis (em segundos) dos tempos de espera dos últimos pareamentos"""
+        with self.lock:
+            amostras = list(self.esperas)
+        return calcular_percentis(amostras, percentis)
+    
+    def estatisticas(self) -> Dict[str, Any]:
+        """Profundidade, pares formados, espera mais longa atual e percentis de espera"""
+        agora = time.time()
+        with self.lock:
+            entrada_mais_antiga = min((entrada.entrou_em for entrada in self.aguardando.values()),
+                                      default=agora)
+            dados = {
+                'profundidade': len(self.aguardando),
+                'faixas_com_espera': sum(1 for fila in self.filas.values() if fila),
+                'pares_formados': self.pares_formados,
+                'pares_ampliados': self.pares_ampliados,
+                'espera_atual_maxima': agora - entrada_mais_antiga,
+            }
+        dados['espera'] = self.percentis_espera()
+        return dados
@@ -0,0 +1,346 @@
+"""
+Motor de busca para jogadores controlados pelo computador
+
+Busca alfa-beta (negamax) com aprofundamento iterativo sobre as regras de
+tabuleiro.py. Usa fazer_movimento/desfazer_movimento para explorar lances
+sem copiar o tabuleiro e o hash de Zobrist como chave da tabela de
+transposição. Capturas múltiplas são tratadas como passos do mesmo lado:
+enquanto a peça puder continuar pulando, a vez não muda. A captura é
+obrigatória, como em Partida e no servidor.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from constantes import *
+from tabelas_movimento import CASAS_JOGAVEIS
+
+
+# === PARÂMETROS DE AVALIAÇÃO ===
+VALOR_PECA = 100
+VALOR_DAMA = 160
+BONUS_AVANCO = 3        # Por linha avançada de uma peça comum
+VITORIA = 100000        # Pontuação de posição ganha (ajustada pela distância)
+LIMIAR_VITORIA = VITORIA - 10000  # Acima disto (em módulo) a pontuação é vitória/derrota forçada
+
+# === TIPOS DE ENTRADA DA TABELA DE TRANSPOSIÇÃO ===
+EXATO = 0
+LIMITE_INFERIOR = 1
+LIMITE_SUPERIOR = 2
+
+INTERVALO_VERIFICACAO_TEMPO = 256  # Nós entre consultas ao relógio
+
+Lance = Tuple[Tuple[int, int], Tuple[int, int]]
+
+
+@dataclass
+class ResultadoBusca:
+    """Resultado de uma busca do computador"""
+    movimento: Optional[Lance]
+    pontuacao: int
+    profundidade: int
+    nos: int
+    tempo_ms: float
+    # (pontuação, lance) ao fim de cada iteração completa, da profundidade 1 em diante
+    iteracoes: List[Tuple[int, Lance]] = field(default_factory=list)
+    
+    @property
+    def nos_por_segundo(self) -> float:
+        """Velocidade da busca em nós por segundo"""
+        if self.tempo_ms <= 0:
+            return 0.0
+        return self.nos / (self.tempo_ms / 1000.0)
+
+
+class _TempoEsgotado(Exception):
+    """Interrompe a busca quando o orçamento de tempo acaba"""
+
+
+def pontuacao_decisiva(valor, profundidade_maxima):
+    """Verifica se a pontuação é de vitória ou derrota forçada (aprofundar não a altera)"""
+    return abs(valor) >= VITORIA - profundidade_maxima * 4
+
+
+def valor_para_tabela(valor, ply):
+    """Vitória/derrota guardada com a distância contada a partir do próprio nó, não da raiz"""
+    if valor >= LIMIAR_VITORIA:
+        return valor + ply
+    if valor <= -LIMIAR_VITORIA:
+        return valor - ply
+    return valor
+
+
+def valor_da_tabela(valor, ply):
+    """Inverso de valor_para_tabela: distância volta a ser contada a partir da raiz atual"""
+    if valor >= LIMIAR_VITORIA:
+        return valor - ply
+    if valor <= -LIMIAR_VITORIA:
+        return valor + ply
+    return valor
+
+
+def outra_cor(cor):
+    """Retorna a cor adversária"""
+    return AMARELO if cor == VERDE else VERDE
+
+
+def e_captura(lance):
+    """Verifica se o lance é um pulo de duas casas"""
+    (x_origem, _), (x_destino, _) = lance
+    return abs(x_destino - x_origem) == 2
+
+
+def gerar_lances(tabuleiro, cor, em_pulo=None) -> List[Lance]:
+    """
+    Lista os lances (origem, destino) disponíveis para uma cor
+    
+    Havendo algum pulo, só os pulos são lances (captura obrigatória).
+    
+    Args:
+        tabuleiro: Tabuleiro de objetos
+        cor: Cor que vai jogar
+        em_pulo: Coordenada da peça no meio de uma captura múltipla (ou None)
+    """
+    if em_pulo is not None:
+        return [(em_pulo, destino) for destino in tabuleiro.movimentos_legais(em_pulo, apenas_pulos=True)]
+    
+    pulos = []
+    simples = []
+    for coordenadas in CASAS_JOGAVEIS:
+        peca = tabuleiro.localizacao(coordenadas).ocupante
+        if peca is not None and peca.cor == cor:
+            for destino in tabuleiro.movimentos_legais(coordenadas):
+                lance = (coordenadas, destino)
+                (pulos if e_captura(lance) else simples).append(lance)
+    return pulos or simples
+
+
+def avaliar(tabuleiro, cor):
+    """Avaliação estática da posição do ponto de vista de cor"""
+    pontuacao = 0
+    for coordenadas in CASAS_JOGAVEIS:
+        peca = tabuleiro.localizacao(coordenadas).ocupante
+        if peca is None:
+            continue
+        
+        if peca.rei:
+            valor = VALOR_DAMA
+        elif peca.cor == VERDE:
+            valor = VALOR_PECA + BONUS_AVANCO * (TAMANHO_TABULEIRO - 1 - coordenadas[1])
+        else:
+            valor = VALOR_PECA + BONUS_AVANCO * coordenadas[1]
+        
+        pontuacao += valor if peca.cor == cor else -valor
+    return pontuacao
+
+
+class MotorBusca:
+    """Busca alfa-beta com aprofundamento iterativo e tabela de transposição"""
+    
+    def __init__(self, tempo_limite_ms=500, profundidade_maxima=32, tamanho_tabela=200000):
+        """
+        Configura o motor de busca
+        
+        Args:
+            tempo_limite_ms: Orçamento de tempo por lance em milissegundos
+            profundidade_maxima: Limite de profundidade do aprofundamento iterativo
+            tamanho_tabela: Número máximo de entradas da tabela de transposição
+        """
+        self.tempo_limite_ms = tempo_limite_ms
+        self.profundidade_maxima = profundidade_maxima
+        self.tamanho_tabela = tamanho_tabela
+        
+        # Tabela de transposição: (hash, em_pulo) -> (profundidade, valor, tipo, lance);
+        # vitórias/derrotas guardadas com a distância a partir do nó (valor_para_tabela)
+        self.tabela = {}
+        # Heurísticas de ordenação de lances silenciosos
+        self.killers = {}    # ply -> [lance, lance]
+        self.historico = {}  # lance -> pontuação acumulada
+        
+        self.nos = 0
+        self._prazo = 0.0
+        self._lances_raiz = None
+        self._raiz_restrita = False
+        self._melhor_lance_raiz = None
+    
+    # === INTERFACE PÚBLICA ===
+    
+    def escolher_movimento(self, tabuleiro, cor, em_pulo=None, lances_raiz=None) -> ResultadoBusca:
+        """
+        Escolhe o melhor lance dentro do orçamento de tempo
+        
+        Args:
+            tabuleiro: Tabuleiro de objetos (restaurado ao final da busca)
+            cor: Cor que vai jogar
+            em_pulo: Peça obrigada a continuar uma captura múltipla (ou None)
+            lances_raiz: Restringe a busca a estes lances da raiz (divisão entre processos)
+        """
+        inicio = time.perf_counter()
+        self._prazo = inicio + self.tempo_limite_ms / 1000.0
+        self.nos = 0
+        self.killers = {}
+        
+        lances = gerar_lances(tabuleiro, cor, em_pulo)
+        if lances_raiz is not None:
+            lances = [lance for lance in lances if lance in lances_raiz]
+        if not lances:
+            return ResultadoBusca(None, -VITORIA, 0, 0, 0.0)
+        
+        melhor = ResultadoBusca(lances[0], 0, 0, 0, 0.0)
+        if len(lances) == 1 and lances_raiz is None:
+            melhor.tempo_ms = (time.perf_counter() - inicio) * 1000
+            return melhor
+        
+        self._lances_raiz = lances
+        self._raiz_restrita = lances_raiz is not None
+        self._melhor_lance_raiz = None
+        for profundidade in range(1, self.profundidade_maxima + 1):
+            try:
+                valor, lance = self._buscar_raiz(tabuleiro, cor, em_pulo, profundidade)
+            except _TempoEsgotado:
+                break
+            
+            melhor.movimento = lance
+            melhor.pontuacao = valor
+            melhor.profundidade = profundidade
+            melhor.iteracoes.append((valor, lance))
+            
+            # Vitória ou derrota forçada encontrada: aprofundar não muda o lance
+            if pontuacao_decisiva(valor, self.profundidade_maxima):
+                break
+        
+        melhor.nos = self.nos
+        melhor.tempo_ms = (time.perf_counter() - inicio) * 1000
+        return melhor
+    
+    def limpar(self):
+        """Descarta tabela de transposição e heurísticas (nova partida)"""
+        self.tabela.clear()
+        self.killers.clear()
+        self.historico.clear()
+    
+    # === BUSCA ===
+    
+    def _buscar_raiz(self, tabuleiro, cor, em_pulo, profundidade):
+        """Executa uma iteração completa na raiz e retorna (valor, lance)"""
+        valor = self._negamax(tabuleiro, cor, em_pulo, profundidade, -VITORIA - 1, VITORIA + 1, 0)
+        return valor, self._melhor_lance_raiz
+    
+    def _negamax(self, tabuleiro, cor, em_pulo, profundidade, alfa, beta, ply):
+        """Negamax com poda alfa-beta; valores do ponto de vista de cor"""
+        self.nos += 1
+        if self.nos % INTERVALO_VERIFICACAO_TEMPO == 0 and time.perf_counter() > self._prazo:
+            raise _TempoEsgotado()
+        
+        chave = (tabuleiro.hash_posicao, em_pulo)
+        alfa_original = alfa
+        lance_tabela = None
+        
+        entrada = self.tabela.get(chave)
+        if entrada is not None:
+            prof_entrada, valor_entrada, tipo_entrada, lance_tabela = entrada
+            valor_entrada = valor_da_tabela(valor_entrada, ply)
+            if prof_entrada >= profundidade and ply > 0:
+                if tipo_entrada == EXATO:
+                    return valor_entrada
+                if tipo_entrada == LIMITE_INFERIOR:
+                    alfa = max(alfa, valor_entrada)
+                else:
+                    beta = min(beta, valor_entrada)
+                if alfa >= beta:
+                    return valor_entrada
+        
+        if ply == 0:
+            lances = self._lances_raiz
+            # Melhor lance da iteração anterior é explorado primeiro
+            lance_tabela = self._melhor_lance_raiz or lance_tabela
+        else:
+            lances = gerar_lances(tabuleiro, cor, em_pulo)
+        if not lances:
+            # Sem lances = derrota; preferir derrotas mais distantes
+            return -VITORIA + ply
+        
+        # Capturas múltiplas em andamento continuam mesmo no horizonte
+        if profundidade <= 0 and em_pulo is None:
+            return avaliar(tabuleiro, cor)
+        
+        melhor_valor = -VITORIA - 1
+        melhor_lance = None
+        adversario = outra_cor(cor)
+        
+        for lance in self._ordenar(lances, lance_tabela, ply):
+            origem, destino = lance
+            tabuleiro.fazer_movimento(origem, destino)
+            try:
+                if e_captura(lance) and tabuleiro.pode_capturar_novamente(destino):
+                    # Mesma cor continua pulando: não consome profundidade nem inverte sinal
+                    valor = self._negamax(tabuleiro, cor, destino, profundidade, alfa, beta, ply + 1)
+                else:
+                    tabuleiro.trocar_vez()
+                    try:
+                        valor = -self._negamax(tabuleiro, adversario, None, profundidade - 1,
+                                               -beta, -alfa, ply + 1)
+                    finally:
+                        tabuleiro.trocar_vez()
+            finally:
+                tabuleiro.desfazer_movimento()
+            
+            if valor > melhor_valor:
+                melhor_valor = valor
+                melhor_lance = lance
+            if valor > alfa:
+                alfa = valor
+            if alfa >= beta:
+                if not e_captura(lance):
+                    self._registrar_corte(lance, profundidade, ply)
+                break
+        
+        if ply == 0:
+            self._melhor_lance_raiz = melhor_lance
+            # Raiz com lances restritos não representa o valor real da posição
+            if self._raiz_restrita:
+                return melhor_valor
+        
+        if melhor_valor <= alfa_original:
+            tipo = LIMITE_SUPERIOR
+        elif melhor_valor >= beta:
+            tipo = LIMITE_INFERIOR
+        else:
+            tipo = EXATO
+        self._guardar(chave, (profundidade, valor_para_tabela(melhor_valor, ply), tipo, melhor_lance))
+        
+        return melhor_valor
+    
+    # === ORDENAÇÃO E TABELA ===
+    
+    def _ordenar(self, lances, lance_tabela, ply):
+        """Ordena: lance da tabela, capturas, killers e então histórico"""
+        killers = self.killers.get(ply, ())
+        historico = self.historico
+        
+        def prioridade(lance):
+            if lance == lance_tabela:
+                return 3000000
+            if e_captura(lance):
+                return 2000000
+            if lance in killers:
+                return 1000000
+            return historico.get(lance, 0)
+        
+        return sorted(lances, key=prioridade, reverse=True)
+    
+    def _registrar_corte(self, lance, profundidade, ply):
+        """Atualiza killers e histórico após um corte beta por lance silencioso"""
+        killers = self.killers.setdefault(ply, [])
+        if lance not in killers:
+            killers.insert(0, lance)
+            del killers[2:]
+        self.historico[lance] = self.historico.get(lance, 0) + profundidade * profundidade
+    
+    def _guardar(self, chave, entrada):
+        """Insere na tabela de transposição descartando a entrada mais antiga se cheia"""
+        tabela = self.tabela
+        if chave not in tabela and len(tabela) >= self.tamanho_tabela:
+            del tabela[next(iter(tabela))]
+        tabela[chave] = entrada
@@ -0,0 +1,210 @@
+"""
+Jogador do computador com busca paralela dividida na raiz
+
+Os lances da raiz são repartidos entre processos de um ProcessPoolExecutor.
+Cada processo é independente (nada compartilhado): recebe a posição em um
+código compacto de cinco inteiros, reconstrói o próprio tabuleiro, busca
+apenas o seu subconjunto de lances e devolve o melhor encontrado.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from constantes import *
+from ia import MotorBusca, ResultadoBusca, VITORIA, gerar_lances, e_captura, pontuacao_decisiva
+from tabuleiro_bits import TabuleiroBits
+
+
+# Fração do orçamento reservada para comunicação entre processos
+MARGEM_COMUNICACAO = 0.15
+
+
+def codificar_posicao(tabuleiro):
+    """Codifica tabuleiro e vez como tupla (homens/reis verdes, homens/reis amarelos, vez)"""
+    return TabuleiroBits.de_tabuleiro(tabuleiro).codificar() + (int(tabuleiro.vez == AMARELO),)
+
+
+def decodificar_posicao(codigo):
+    """Reconstrói um Tabuleiro de objetos a partir de codificar_posicao"""
+    *mascaras, vez_amarela = codigo
+    tabuleiro = TabuleiroBits(*mascaras).para_tabuleiro()
+    if vez_amarela:
+        tabuleiro.trocar_vez()
+    return tabuleiro
+
+
+# === LADO DO PROCESSO TRABALHADOR ===
+
+_motor_trabalhador = None
+
+
+def _inicializar_trabalhador(profundidade_maxima, tamanho_tabela):
+    """Cria o motor de busca do processo (tabela de transposição persiste entre lances)"""
+    global _motor_trabalhador
+    _motor_trabalhador = MotorBusca(profundidade_maxima=profundidade_maxima,
+                                    tamanho_tabela=tamanho_tabela)
+
+
+def _buscar_subconjunto(codigo, cor, em_pulo, lances, tempo_limite_ms):
+    """Busca apenas os lances da raiz recebidos e devolve o ResultadoBusca"""
+    tabuleiro = decodificar_posicao(codigo)
+    _motor_trabalhador.tempo_limite_ms = tempo_limite_ms
+    return _motor_trabalhador.escolher_movimento(tabuleiro, cor, em_pulo, lances_raiz=lances)
+
+
+# === LADO DO PROCESSO PRINCIPAL ===
+
+class JogadorComputadorParalelo:
+    """Jogador do computador que divide os lances da raiz entre processos"""
+    
+    def __init__(self, trabalhadores=None, tempo_limite_ms=500, profundidade_maxima=32,
+                 tamanho_tabela=200000):
+        """
+        Configura o pool de processos
+        
+        Args:
+            trabalhadores: Número de processos (padrão: número de núcleos)
+            tempo_limite_ms: Orçamento de tempo por lance em milissegundos
+            profundidade_maxima: Limite do aprofundamento iterativo em cada processo
+            tamanho_tabela: Entradas da tabela de transposição de cada processo
+        """
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.tempo_limite_ms = tempo_limite_ms
+        self.profundidade_maxima = profundidade_maxima
+        self.executor = ProcessPoolExecutor(
+            max_workers=self.trabalhadores,
+            initializer=_inicializar_trabalhador,
+            initargs=(profundidade_maxima, tamanho_tabela)
+        )
+    
+    def escolher_movimento(self, tabuleiro, cor, em_pulo=None) -> ResultadoBusca:
+        """Escolhe o melhor lance combinando os resultados de todos os processos"""
+        inicio = time.perf_counter()
+        
+        lances = gerar_lances(tabuleiro, cor, em_pulo)
+        if not lances:
+            return ResultadoBusca(None, -VITORIA, 0, 0, 0.0)
+        if len(lances) == 1:
+            return ResultadoBusca(lances[0], 0, 0, 0, (time.perf_counter() - inicio) * 1000)
+        
+        # Capturas primeiro e distribuição alternada equilibram o custo entre processos
+        lances.sort(key=e_captura, reverse=True)
+        partes = min(self.trabalhadores, len(lances))
+        grupos = [lances[i::partes] for i in range(partes)]
+        
+        codigo = codificar_posicao(tabuleiro)
+        orcamento_ms = self.tempo_limite_ms * (1 - MARGEM_COMUNICACAO)
+        futuros = [
+            self.executor.submit(_buscar_subconjunto, codigo, cor, em_pulo, grupo, orcamento_ms)
+            for grupo in grupos
+        ]
+        resultados = [futuro.result() for futuro in futuros]
+        nos = sum(resultado.nos for resultado in resultados)
+        
+        # Processo sem nenhuma iteração completa devolve um lance não avaliado: fica de fora
+        completos = [resultado for resultado in resultados if resultado.profundidade > 0]
+        if not completos:
+            return ResultadoBusca(lances[0], 0, 0, nos, (time.perf_counter() - inicio) * 1000)
+        
+        # Pontuações só são comparáveis na mesma profundidade: a mais funda que todos
+        # completaram (resultado decisivo parou cedo, mas vale em qualquer profundidade)
+        profundidades_abertas = [
+            resultado.profundidade for resultado in completos
+            if not pontuacao_decisiva(resultado.pontuacao, self.profundidade_maxima)
+        ]
+        if profundidades_abertas:
+            profundidade = min(profundidades_abertas)
+        else:
+            profundidade = max(resultado.profundidade for resultado in completos)
+        
+        def iteracao_comum(resultado):
+            return resultado.iteracoes[min(profundidade, resultado.profundidade) - 1]
+        
+        melhor = max(completos, key=lambda resultado: iteracao_comum(resultado)[0])
+        pontuacao, movimento = iteracao_comum(melhor)
+        return ResultadoBusca(
+            movimento=movimento,
+            pontuacao=pontuacao,
+            profundidade=profundidade,
+            nos=nos,
+            tempo_ms=(time.perf_counter() - inicio) * 1000
+        )
+    
+    def encerrar(self):
+        """Finaliza os processos trabalhadores"""
+        self.executor.shutdown(wait=True)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.encerrar()
+
+
+# === BENCHMARK ===
+
+def _posicoes_benchmark(quantidade=4, lances_aleatorios=10, semente=7):
+    """Gera posições reprodutíveis a partir de partidas com lances aleatórios"""
+    import random
+    from tabuleiro import Tabuleiro
+    
+    gerador = random.Random(semente)
+    posicoes = []
+    for _ in range(quantidade):
+        tabuleiro = Tabuleiro()
+        cor = VERDE
+        for _ in range(lances_aleatorios):
+            lances = gerar_lances(tabuleiro, cor)
+            if not lances:
+                break
+            
+            # Captura múltipla vai até o fim antes de passar a vez (posições sempre legais)
+            while lances:
+                origem, destino = gerador.choice(lances)
+                tabuleiro.mover_peca(origem, destino)
+                lances = []
+                if e_captura((origem, destino)) and tabuleiro.pode_capturar_novamente(destino):
+                    lances = gerar_lances(tabuleiro, cor, destino)
+            
+            cor = AMARELO if cor == VERDE else VERDE
+            tabuleiro.trocar_vez()
+        posicoes.append((codificar_posicao(tabuleiro), cor))
+    return posicoes
+
+
+def benchmark(lista_trabalhadores=None, profundidade=6):
+    """
+    Mede o tempo de busca em profundidade fixa para cada número de processos
+    e imprime o ganho em relação ao baseline de um único processo
+    """
+    maximo = os.cpu_count() or 1
+    if lista_trabalhadores is None:
+        lista_trabalhadores = sorted({1, 2, 4, maximo} & set(range(1, maximo + 1)))
+    
+    posicoes = _posicoes_benchmark()
+    print(f"🧪 Benchmark de busca paralela - profundidade {profundidade}, {len(posicoes)} posições")
+    
+    tempo_base = None
+    for trabalhadores in lista_trabalhadores:
+        # Orçamento muito grande: a profundidade fixa define o trabalho
+        with JogadorComputadorParalelo(trabalhadores, tempo_limite_ms=10 ** 9,
+                                       profundidade_maxima=profundidade) as jogador:
+            # Aquece o pool para não medir a criação dos processos
+            list(jogador.executor.map(abs, range(trabalhadores)))
+            
+            nos = 0
+            inicio = time.perf_counter()
+            for codigo, cor in posicoes:
+                resultado = jogador.escolher_movimento(decodificar_posicao(codigo), cor)
+                nos += resultado.nos
+            duracao = time.perf_counter() - inicio
+        
+        if tempo_base is None:
+            tempo_base = duracao
+        print(f"   {trabalhadores:2d} processo(s): {duracao:7.2f}s  "
+              f"{nos / duracao:10.0f} nós/s  ganho {tempo_base / duracao:5.2f}x")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,76 @@
+"""
+Índice incremental das capturas obrigatórias
+
+Mantém, para cada cor, o conjunto de casas cujas peças têm ao menos um
+salto disponível. Um salto depende apenas da casa da peça, da casa pulada
+e do destino, então depois de um lance basta reexaminar as casas a até
+duas diagonais das casas alteradas (RAIO_CAPTURA) em vez de varrer o
+tabuleiro inteiro.
+"""
+
+from typing import Dict, Iterable, List, Set, Tuple
+
+from constantes import *
+from tabelas_movimento import CASAS_JOGAVEIS, RAIO_CAPTURA
+
+
+class IndiceCapturas:
+    """Peças com captura disponível, por cor, sobre um Tabuleiro de objetos"""
+    
+    def __init__(self, tabuleiro, posicao_inicial: bool = False):
+        """
+        Cria o índice varrendo o tabuleiro uma vez
+        
+        Args:
+            tabuleiro: Tabuleiro cujas alterações serão informadas em atualizar()
+            posicao_inicial: O tabuleiro acabou de ser criado; como na posição
+                inicial ninguém captura, a varredura é dispensada
+        """
+        self.tabuleiro = tabuleiro
+        self.capturadoras: Dict[tuple, Set[Tuple[int, int]]] = {VERDE: set(), AMARELO: set()}
+        self.casas_examinadas = 0  # Total de casas reexaminadas (medição do custo)
+        if not posicao_inicial:
+            self.reconstruir()
+    
+    def reconstruir(self):
+        """Recalcula o índice varrendo todas as casas jogáveis"""
+        for casas in self.capturadoras.values():
+            casas.clear()
+        for casa in CASAS_JOGAVEIS:
+            self._examinar(casa)
+    
+    def atualizar(self, casas_alteradas: Iterable[Tuple[int, int]]):
+        """
+        Reexamina as casas que podem ter ganho ou perdido capturas
+        
+        Args:
+            casas_alteradas: Casas cujo conteúdo mudou (origem, pousos, peças
+                capturadas e casas de coroação)
+        """
+        afetadas = set()
+        for casa in casas_alteradas:
+            afetadas.update(RAIO_CAPTURA[casa])
+        for casa in afetadas:
+            self._examinar(casa)
+    
+    def _examinar(self, casa: Tuple[int, int]):
+        """Atualiza a presença da casa no índice conforme a peça que a ocupa"""
+        self.casas_examinadas += 1
+        peca = self.tabuleiro.localizacao(casa).ocupante
+        for cor, casas in self.capturadoras.items():
+            if peca is not None and peca.cor == cor and self.tabuleiro.movimentos_legais(casa, apenas_pulos=True):
+                casas.add(casa)
+            else:
+                casas.discard(casa)
+    
+    def tem_capturas(self, cor) -> bool:
+        """Se a cor é obrigada a capturar"""
+        return bool(self.capturadoras[cor])
+    
+    def capturas(self, cor) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Primeiros saltos (origem, destino) disponíveis para a cor, em ordem de leitura"""
+        return [
+            (origem, destino)
+            for origem in sorted(self.capturadoras[cor], key=lambda casa: (casa[1], casa[0]))
+            for destino in self.tabuleiro.movimentos_legais(origem, apenas_pulos=True)
+        ]
@@ -8,26 +8,39 @@ from pygame.locals import *
 
 from constantes import *
 from graficos import Graficos
-from tabuleiro import Tabuleiro
+from partida import Partida
 
 
 class Jogo:
-    """Classe principal que controla o fluxo do jogo de damas"""
+    """Interface local (pygame) sobre as regras de Partida"""
     
     def __init__(self):
         """Inicializa componentes e estado inicial do jogo"""
         self.graficos = Graficos()
-        self.tabuleiro = Tabuleiro()
+        self.partida = Partida()
         
-        # Controle de turnos e seleção
-        self.turno = VERDE  # Verde sempre inicia a partida
+        # Controle de seleção
         self.peca_selecionada = None
-        self.em_pulo = False  # Flag para capturas contínuas obrigatórias
         self.movimentos_legais_selecionados = []
         
         # Estado de execução do loop principal
         self.jogo_ativo = True
     
+    @property
+    def tabuleiro(self):
+        """Tabuleiro da partida em andamento"""
+        return self.partida.tabuleiro
+    
+    @property
+    def turno(self):
+        """Cor do jogador da vez"""
+        return self.partida.turno
+    
+    @property
+    def em_pulo(self):
+        """Flag para capturas contínuas obrigatórias"""
+        return self.partida.em_pulo is not None
+    
     def configurar(self):
         """Configura o jogo para iniciar"""
         self.graficos.configurar_janela()
@@ -42,8 +55,8 @@ class Jogo:
             self._atualizar_tela()
         
         # Retorna o resultado da partida
-        if hasattr(self, '_vencedor'):
-            return self._vencedor  # Jogo terminou com vitória
+        if self.partida.terminada:
+            return "VERDE" if self.partida.vencedor == VERDE else "AMARELO"
         else:
             return None  # Jogo foi fechado antes de terminar
     
@@ -51,8 +64,8 @@ class Jogo:
         """Processa entrada do usuário e eventos de sistema"""
         # Calcular movimentos válidos para a peça atualmente selecionada
         if self.peca_selecionada is not None:
-            self.movimentos_legais_selecionados = self.tabuleiro.movimentos_legais(
-                self.peca_selecionada, self.em_pulo
+            self.movimentos_legais_selecionados = self.partida.movimentos_legais(
+                self.peca_selecionada
             )
         
         # Processar fila de eventos do pygame
@@ -84,76 +97,31 @@ class Jogo:
         
         # Execução de movimento: clique em destino válido
         if (self.peca_selecionada is not None and 
-            pos_mouse in self.tabuleiro.movimentos_legais(self.peca_selecionada)):
+            pos_mouse in self.partida.movimentos_legais(self.peca_selecionada)):
             self._executar_movimento(pos_mouse)
     
     def _processar_pulo_continuo(self, pos_mouse):
         """Lida com capturas múltiplas obrigatórias"""
         if (self.peca_selecionada is not None and 
-            pos_mouse in self.tabuleiro.movimentos_legais(self.peca_selecionada, apenas_pulos=True)):
-            
-            # Executar captura atual
-            self._executar_pulo(pos_mouse)
-            
-            # Verificar se existem capturas adicionais obrigatórias
-            if not self.tabuleiro.movimentos_legais(pos_mouse, apenas_pulos=True):
-                self._finalizar_turno()  # Não há mais capturas - finalizar turno
-            else:
-                self.peca_selecionada = pos_mouse  # Continuar com a mesma peça
+            pos_mouse in self.partida.movimentos_legais(self.peca_selecionada)):
+            self._executar_movimento(pos_mouse)
     
     def _executar_movimento(self, destino):
-        """Determina tipo de movimento e executa ação apropriada"""
-        origem = self.peca_selecionada
+        """Executa o passo na partida e atualiza a seleção"""
+        continua_pulando = self.partida.executar_lance(self.peca_selecionada, destino)
         
-        # Distinguir entre captura (pulo) e movimento simples
-        if destino not in self.tabuleiro.adjacentes(origem):
-            # É uma captura - executar pulo
-            self._executar_pulo(destino)
-            
-            # Verificar capturas adicionais obrigatórias
-            if self.tabuleiro.pode_capturar_novamente(destino):
-                self.em_pulo = True  # Ativar modo de captura contínua
-                self.peca_selecionada = destino
-            else:
-                self._finalizar_turno()
+        if continua_pulando:
+            self.peca_selecionada = destino  # Continuar com a mesma peça
         else:
-            # Movimento simples adjacente
-            self.tabuleiro.mover_peca(origem, destino)
             self._finalizar_turno()
     
-    def _executar_pulo(self, destino):
-        """Executa captura removendo peça adversária do tabuleiro"""
-        origem = self.peca_selecionada
-        
-        # Mover peça atacante para posição final
-        self.tabuleiro.mover_peca(origem, destino)
-        
-        # Calcular posição da peça capturada (ponto médio do pulo)
-        pos_capturada = (
-            (origem[0] + destino[0]) // 2,
-            (origem[1] + destino[1]) // 2
-        )
-        self.tabuleiro.remover_peca(pos_capturada)
-    
     def _finalizar_turno(self):
-        """Limpa estado atual e transfere controle para próximo jogador"""
-        # Alternar entre jogadores
-        self.turno = AMARELO if self.turno == VERDE else VERDE
-        
-        # Limpar estado da jogada anterior
+        """Limpa a seleção após a partida transferir a vez"""
         self.peca_selecionada = None
         self.movimentos_legais_selecionados = []
-        self.em_pulo = False  # Sair do modo de captura contínua
         
-        # Verificar condições de término da partida
-        self._verificar_fim_jogo()
-    
-    def _verificar_fim_jogo(self):
-        """Detecta condições de vitória e encerra partida se necessário"""
-        if not self.tabuleiro.tem_movimentos_legais(self.turno):
-            # Jogador atual sem movimentos válidos = derrota
-            vencedor = "AMARELO" if self.turno == VERDE else "VERDE"
-            self._vencedor = vencedor
+        # Partida detectou condição de término
+        if self.partida.terminada:
             self.jogo_ativo = False
     
     def _atualizar_tela(self):
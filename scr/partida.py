@@ -0,0 +1,77 @@
+"""
+Classe Partida - Estado das regras de uma partida de damas, sem interface gráfica
+
+Guarda tabuleiro, turno, captura contínua em andamento e vencedor. Não
+importa pygame: é usada diretamente pelo servidor e envolvida por Jogo
+na versão local com janela.
+"""
+
+from constantes import *
+from tabuleiro import Tabuleiro
+
+
+class Partida:
+    """Controla turnos, capturas múltiplas e fim de jogo de uma partida"""
+    
+    def __init__(self):
+        """Cria uma partida na posição inicial com as verdes para jogar"""
+        self.tabuleiro = Tabuleiro()
+        self.turno = VERDE  # Verde sempre inicia a partida
+        self.em_pulo = None  # Peça obrigada a continuar uma captura múltipla
+        self.vencedor = None
+        self.motivo = None
+    
+    @property
+    def terminada(self):
+        """Indica se a partida já tem vencedor"""
+        return self.vencedor is not None
+    
+    def movimentos_legais(self, coordenadas):
+        """Destinos válidos para a peça, respeitando captura contínua e captura obrigatória"""
+        if self.em_pulo is not None:
+            if coordenadas != self.em_pulo:
+                return []
+            return self.tabuleiro.movimentos_legais(coordenadas, apenas_pulos=True)
+        
+        # Havendo captura para a cor da vez, movimentos simples não valem
+        if self.tabuleiro.tem_capturas(self.turno):
+            return self.tabuleiro.movimentos_legais(coordenadas, apenas_pulos=True)
+        return self.tabuleiro.movimentos_legais(coordenadas)
+    
+    def executar_lance(self, origem, destino):
+        """
+        Executa um passo (movimento simples ou um salto de captura)
+        
+        Returns:
+            True se a mesma peça deve continuar capturando, False se o turno passou
+        """
+        captura = destino not in self.tabuleiro.adjacentes(origem)
+        self.tabuleiro.mover_peca(origem, destino)
+        
+        if captura and self.tabuleiro.pode_capturar_novamente(destino):
+            self.em_pulo = destino  # Captura contínua obrigatória
+            return True
+        
+        self.finalizar_turno()
+        return False
+    
+    def finalizar_turno(self):
+        """Transfere a vez ao adversário e verifica o fim da partida"""
+        self.turno = AMARELO if self.turno == VERDE else VERDE
+        self.tabuleiro.trocar_vez()
+        self.em_pulo = None
+        self.verificar_fim_jogo()
+    
+    def verificar_fim_jogo(self):
+        """Jogador da vez sem movimentos válidos perde; retorna o vencedor ou None"""
+        if self.vencedor is not None:
+            return self.vencedor
+        
+        # Contagem mantida pelo tabuleiro: eliminação não precisa gerar lances
+        if not self.tabuleiro.contar_pecas(self.turno):
+            self.vencedor = AMARELO if self.turno == VERDE else VERDE
+            self.motivo = "Vitória por eliminação"
+        elif not self.tabuleiro.tem_movimentos_legais(self.turno):
+            self.vencedor = AMARELO if self.turno == VERDE else VERDE
+            self.motivo = "Vitória por bloqueio"
+        return self.vencedor
@@ -5,6 +5,9 @@ Classe Peca - Representa uma peça do jogo de damas
 class Peca:
     """Representa uma peça no jogo de damas"""
     
+    # Sem __dict__ por instância: cada tabuleiro aloca 24 peças
+    __slots__ = ('cor', 'rei')
+    
     def __init__(self, cor, rei=False):
         """
         Cria uma nova peça de damas
@@ -15,13 +18,20 @@ class Peca:
         """
         self.cor = cor
         self.rei = rei  # Determina capacidades de movimento
-        self.e_dama = rei  # Alias para compatibilidade com código do servidor
+    
+    @property
+    def e_dama(self):
+        """Alias de rei para compatibilidade com código do servidor"""
+        return self.rei
     
     def tornar_rei(self):
         """Promove peça comum para dama (rei)"""
         self.rei = True
-        self.e_dama = True
     
     def promover_dama(self):
         """Alias para tornar_rei() - usado pelo servidor"""
         self.tornar_rei()
+    
+    def rebaixar(self):
+        """Desfaz a promoção (usado ao desfazer movimentos)"""
+        self.rei = False
@@ -0,0 +1,175 @@
+"""
+Perft - contagem de posições da árvore de jogo para validar o gerador de lances
+
+Percorre todos os lances completos (uma captura múltipla inteira conta como
+um único lance) até a profundidade pedida, compara as contagens com valores
+de referência e mede a velocidade em nós por segundo. Serve tanto de teste
+de regressão das regras quanto de benchmark dos motores.
+
+Uso:
+    python perft.py [profundidade] [--motor objetos|bits|ambos] [--posicao nome]
+"""
+
+import argparse
+import sys
+import time
+
+from constantes import *
+from ia import e_captura, gerar_lances, outra_cor
+from tabuleiro_bits import TabuleiroBits, indice_para_coordenadas
+
+
+# Posições de teste: 32 casas jogáveis, linha a linha de cima para baixo
+# v = peça verde, V = dama verde, a = peça amarela, A = dama amarela, . = vazia
+POSICOES = {
+    'inicial': (
+        "aaaa" "aaaa" "aaaa" "...." "...." "vvvv" "vvvv" "vvvv",
+        VERDE,
+    ),
+    'meio_jogo': (
+        "aaa." "a.aa" ".a.a" "..a." "v.v." "v.vv" "..vv" "vvvv",
+        AMARELO,
+    ),
+    'damas': (
+        "...." "..a." ".V.." "a.a." "...." ".A.v" "...." "...V",
+        VERDE,
+    ),
+    'captura_com_coroacao': (
+        "...." "a.a." "...." "a.a." "...." "..a." "...v" "v...",
+        VERDE,
+    ),
+}
+
+# Contagens de referência por posição e profundidade (com captura obrigatória;
+# as da posição inicial coincidem com as publicadas para damas inglesas)
+ESPERADOS = {
+    'inicial': [1, 7, 49, 302, 1469, 7361, 36768, 179740],
+    'meio_jogo': [1, 1, 1, 8, 69, 462, 3154, 19034],
+    'damas': [1, 1, 8, 29, 147, 681, 3532, 15817],
+    'captura_com_coroacao': [1, 1, 4, 16, 48, 195, 543, 2158],
+}
+
+
+def tabuleiro_bits_de_texto(texto):
+    """Cria um TabuleiroBits a partir da notação de 32 caracteres"""
+    tabuleiro = TabuleiroBits(0, 0, 0, 0)
+    for indice, simbolo in enumerate(texto):
+        if simbolo == '.':
+            continue
+        cor = VERDE if simbolo in 'vV' else AMARELO
+        tabuleiro.colocar_peca(indice_para_coordenadas(indice), cor, simbolo.isupper())
+    return tabuleiro
+
+
+# === PERFT SOBRE O TABULEIRO DE OBJETOS ===
+
+def perft_objetos(tabuleiro, cor, profundidade):
+    """Conta folhas usando Tabuleiro com fazer_movimento/desfazer_movimento"""
+    if profundidade == 0:
+        return 1
+    
+    total = 0
+    for origem, destino in gerar_lances(tabuleiro, cor):
+        total += _perft_lance_objetos(tabuleiro, cor, origem, destino, profundidade)
+    return total
+
+
+def _perft_lance_objetos(tabuleiro, cor, origem, destino, profundidade):
+    """Executa um passo; capturas que continuam são expandidas antes de trocar a vez"""
+    tabuleiro.fazer_movimento(origem, destino)
+    try:
+        if e_captura((origem, destino)) and tabuleiro.pode_capturar_novamente(destino):
+            return sum(
+                _perft_lance_objetos(tabuleiro, cor, destino, proximo, profundidade)
+                for proximo in tabuleiro.movimentos_legais(destino, apenas_pulos=True)
+            )
+        return perft_objetos(tabuleiro, outra_cor(cor), profundidade - 1)
+    finally:
+        tabuleiro.desfazer_movimento()
+
+
+# === PERFT SOBRE O TABULEIRO DE BITS ===
+
+def perft_bits(tabuleiro, cor, profundidade):
+    """Conta folhas usando TabuleiroBits (sequências de captura completas ou, sem elas, passos)"""
+    if profundidade == 0:
+        return 1
+    
+    total = 0
+    adversario = outra_cor(cor)
+    
+    sequencias = list(tabuleiro.sequencias_captura(cor))
+    for sequencia in sequencias:
+        filho = tabuleiro.copiar()
+        filho.aplicar_sequencia(sequencia)
+        total += perft_bits(filho, adversario, profundidade - 1)
+    
+    if sequencias:
+        return total  # Captura obrigatória
+    
+    for filho in tabuleiro.filhos_simples(cor):
+        total += perft_bits(filho, adversario, profundidade - 1)
+    
+    return total
+
+
+MOTORES = {
+    'objetos': (lambda bits: bits.para_tabuleiro(), perft_objetos),
+    'bits': (lambda bits: bits.copiar(), perft_bits),
+}
+
+
+def executar(profundidade_maxima, motores, posicoes):
+    """Roda o perft e retorna True se todas as contagens conferem"""
+    tudo_certo = True
+    
+    for nome in posicoes:
+        texto, cor = POSICOES[nome]
+        esperados = ESPERADOS.get(nome, [])
+        print(f"\n📋 Posição '{nome}' ({'verde' if cor == VERDE else 'amarelo'} joga)")
+        
+        for motor in motores:
+            preparar, contar = MOTORES[motor]
+            for profundidade in range(1, profundidade_maxima + 1):
+                tabuleiro = preparar(tabuleiro_bits_de_texto(texto))
+                
+                inicio = time.perf_counter()
+                nos = contar(tabuleiro, cor, profundidade)
+                duracao = time.perf_counter() - inicio
+                velocidade = nos / duracao if duracao > 0 else 0.0
+                
+                if profundidade < len(esperados):
+                    confere = nos == esperados[profundidade]
+                    status = "✅" if confere else f"❌ esperado {esperados[profundidade]}"
+                    tudo_certo = tudo_certo and confere
+                else:
+                    status = "(sem referência)"
+                
+                print(f"   {motor:8s} perft({profundidade}) = {nos:10d}  "
+                      f"{duracao:8.3f}s  {velocidade:10.0f} nós/s  {status}")
+    
+    return tudo_certo
+
+
+def main():
+    """Função principal do perft"""
+    parser = argparse.ArgumentParser(description="Perft do jogo de damas")
+    parser.add_argument('profundidade', nargs='?', type=int, default=5,
+                        help="Profundidade máxima (padrão: 5)")
+    parser.add_argument('--motor', choices=['objetos', 'bits', 'ambos'], default='ambos',
+                        help="Motor de regras a medir")
+    parser.add_argument('--posicao', choices=sorted(POSICOES), action='append',
+                        help="Posição de teste (pode repetir; padrão: todas)")
+    argumentos = parser.parse_args()
+    
+    motores = ['objetos', 'bits'] if argumentos.motor == 'ambos' else [argumentos.motor]
+    posicoes = argumentos.posicao or list(POSICOES)
+    
+    print("🧮 Perft - Damas")
+    tudo_certo = executar(argumentos.profundidade, motores, posicoes)
+    print("\n✅ Todas as contagens conferem" if tudo_certo else "\n❌ Há contagens divergentes")
+    return 0 if tudo_certo else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ Especificação detalhada das mensagens e estados
 """
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, FrozenSet, List, Optional, Tuple, Any
 from enum import Enum
 
 
@@ -43,6 +43,9 @@ class TipoMensagem(Enum):
     # Desconexão
     JOGADOR_DESCONECTADO = "jogador_desconectado"
     SERVIDOR_ENCERRANDO = "servidor_encerrando"
+    
+    # Espectadores (acompanham uma sala sem jogar)
+    ASSISTIR_PARTIDA = "assistir_partida"
 
 
 class EstadoJogo(Enum):
@@ -60,6 +63,8 @@ class EstadoJogador(Enum):
     CONECTADO = "conectado"
     JOGANDO = "jogando"
     AGUARDANDO_TURNO = "aguardando_turno"
+    AGUARDANDO_ADVERSARIO = "aguardando_adversario"
+    ESPECTADOR = "espectador"
     DESCONECTADO = "desconectado"
 
 
@@ -73,6 +78,9 @@ class Jogador:
     endereco: Tuple[str, int]
     estado: EstadoJogador
     conectado_em: float
+    sala_id: Optional[int] = None
+    rating: Optional[int] = None
+    capacidades: FrozenSet[str] = frozenset()  # Negociadas em CONEXAO_SOLICITADA
 
 
 @dataclass
@@ -86,6 +94,7 @@ class Movimento:
     pecas_capturadas: List[Tuple[int, int]] = None
     promoveu_dama: bool = False
     timestamp: float = 0.0
+    caminho: List[Tuple[int, int]] = None  # Casas de pouso em capturas múltiplas
 
 
 @dataclass
@@ -117,8 +126,9 @@ class ProtocoloDamas:
             'jogador_id': jogador.id,
             'cor': jogador.cor,
             'nome': jogador.nome,
+            'sala_id': jogador.sala_id,
             'timestamp': jogador.conectado_em,
-            'mensagem': f'Bem-vindo, {jogador.nome}! Você joga com as peças {jogador.cor}.'
+            'mensagem': f'Bem-vindo, {jogador.nome}! Você joga com as peças {jogador.cor} na sala {jogador.sala_id}.'
         }
     
     @staticmethod
@@ -147,9 +157,16 @@ class ProtocoloDamas:
         }
     
     @staticmethod
-    def criar_mensagem_movimento_executado(movimento: Movimento, estado_tabuleiro: EstadoTabuleiro, 
-                                         proximo_turno: str) -> Dict:
-        """Cria mensagem de movimento executado"""
+    def criar_mensagem_movimento_executado(movimento: Movimento, estado_tabuleiro: Optional[EstadoTabuleiro], 
+                                         proximo_turno: str, versao: Optional[int] = None,
+                                         hash_tabuleiro: Optional[int] = None) -> Dict:
+        """
+        Cria mensagem de movimento executado
+        
+        Sem estado_tabuleiro a mensagem é um delta (Capacidades.DELTA): o
+        cliente aplica origem, destino, capturas e promoção ao próprio
+        tabuleiro e confere versão e hash de Zobrist da posição resultante.
+        """
         mensagem_base = {
             'tipo': TipoMensagem.MOVIMENTO_EXECUTADO.value,
             'movimento': {
@@ -159,21 +176,29 @@ class ProtocoloDamas:
                 'cor_jogador': movimento.cor_jogador,
                 'timestamp': movimento.timestamp
             },
-            'turno': proximo_turno,
-            'tabuleiro': estado_tabuleiro.matriz,
-            'estatisticas': {
+            'turno': proximo_turno
+        }
+        
+        if estado_tabuleiro is not None:
+            mensagem_base['tabuleiro'] = estado_tabuleiro.matriz
+            mensagem_base['estatisticas'] = {
                 'pecas_verdes': estado_tabuleiro.pecas_verdes,
                 'pecas_amarelas': estado_tabuleiro.pecas_amarelas,
                 'damas_verdes': estado_tabuleiro.damas_verdes,
                 'damas_amarelas': estado_tabuleiro.damas_amarelas
             }
-        }
+        
+        if versao is not None:
+            mensagem_base['versao'] = versao
+            mensagem_base['hash'] = formatar_hash(hash_tabuleiro)
         
         # Adiciona informações específicas se houve captura
         if movimento.e_captura:
             mensagem_base['movimento']['e_captura'] = True
             mensagem_base['movimento']['pecas_capturadas'] = movimento.pecas_capturadas
             mensagem_base['mensagem'] = f'{movimento.cor_jogador} capturou {len(movimento.pecas_capturadas)} peça(s)!'
+            if movimento.caminho:
+                mensagem_base['movimento']['caminho'] = movimento.caminho
         else:
             mensagem_base['mensagem'] = f'{movimento.cor_jogador} moveu de {movimento.origem} para {movimento.destino}'
         
@@ -244,6 +269,14 @@ class ProtocoloDamas:
             ]
         }
     
+    @staticmethod
+    def criar_mensagem_assistir_partida(sala_id: Optional[int] = None) -> Dict:
+        """Cria pedido para acompanhar uma sala como espectador (None = qualquer partida)"""
+        mensagem = {'tipo': TipoMensagem.ASSISTIR_PARTIDA.value}
+        if sala_id is not None:
+            mensagem['sala_id'] = sala_id
+        return mensagem
+    
     @staticmethod
     def criar_mensagem_chat(remetente: Jogador, texto: str) -> Dict:
         """Cria mensagem de chat"""
@@ -301,8 +334,47 @@ class ProtocoloDamas:
                 not isinstance(destino, (list, tuple)) or len(destino) != 2):
                 return False, "Coordenadas devem ser tuplas/listas de 2 elementos"
             
-            if not all(isinstance(coord, int) for coord in origem + destino):
+            if not all(isinstance(coord, int) for coord in list(origem) + list(destino)):
                 return False, "Coordenadas devem ser números inteiros"
+            
+            # Captura múltipla opcional: lista de casas de pouso, terminando no destino
+            if 'caminho' in mensagem:
+                caminho = mensagem['caminho']
+                if not isinstance(caminho, list) or not caminho:
+                    return False, "Caminho deve ser uma lista não vazia de coordenadas"
+                
+                for casa in caminho:
+                    if (not isinstance(casa, (list, tuple)) or len(casa) != 2 or
+                        not all(isinstance(coord, int) for coord in casa)):
+                        return False, "Casas do caminho devem ser pares de inteiros"
+                
+                if list(caminho[-1]) != list(destino):
+                    return False, "Última casa do caminho deve ser o destino"
+        
+        elif tipo == TipoMensagem.CONEXAO_SOLICITADA.value:
+            # Preferências opcionais usadas pela fila de pareamento
+            if 'nome' in mensagem:
+                if not isinstance(mensagem['nome'], str) or not mensagem['nome'].strip():
+                    return False, "Nome deve ser texto não vazio"
+                if len(mensagem['nome']) > 30:
+                    return False, "Nome muito longo (máximo 30 caracteres)"
+            
+            if 'rating' in mensagem:
+                rating = mensagem['rating']
+                if not isinstance(rating, int) or isinstance(rating, bool) or rating < 0:
+                    return False, "Rating deve ser inteiro não negativo"
+            
+            if 'capacidades' in mensagem:
+                capacidades = mensagem['capacidades']
+                if not isinstance(capacidades, list) or not all(isinstance(c, str) for c in capacidades):
+                    return False, "Capacidades devem ser uma lista de textos"
+        
+        elif tipo == TipoMensagem.ASSISTIR_PARTIDA.value:
+            # Sem sala_id o servidor escolhe uma partida em andamento
+            if 'sala_id' in mensagem:
+                sala_id = mensagem['sala_id']
+                if not isinstance(sala_id, int) or isinstance(sala_id, bool):
+                    return False, "sala_id deve ser inteiro"
         
         elif tipo == TipoMensagem.CHAT.value:
             if 'texto' not in mensagem:
@@ -317,6 +389,23 @@ class ProtocoloDamas:
         return True, "Mensagem válida"
 
 
+def formatar_hash(hash_tabuleiro: int) -> str:
+    """Hash de Zobrist em hexadecimal (inteiros de 64 bits não cabem em todo parser JSON)"""
+    return format(hash_tabuleiro, '016x')
+
+
+class Capacidades:
+    """Recursos opcionais que o cliente anuncia em CONEXAO_SOLICITADA"""
+    
+    # MOVIMENTO_EXECUTADO sem o tabuleiro completo, com versão e hash
+    DELTA = "delta"
+    
+    # Quadros binários de codec_binario.py no lugar de JSON por linha
+    BINARIO = "binario"
+    
+    SUPORTADAS = frozenset({DELTA, BINARIO})
+
+
 # Códigos de erro padronizados
 class CodigosErro:
     """Códigos de erro padronizados do protocolo"""
@@ -333,6 +422,8 @@ class CodigosErro:
     PECA_INEXISTENTE = "E104"
     PECA_ADVERSARIA = "E105"
     MOVIMENTO_OBRIGATORIO_IGNORADO = "E106"
+    SOMENTE_LEITURA = "E107"
+    SALA_INEXISTENTE = "E108"
     
     # Erros de protocolo
     MENSAGEM_MALFORMADA = "E201"
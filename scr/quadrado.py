@@ -5,6 +5,9 @@ Classe Quadrado - Representa um quadrado do tabuleiro
 class Quadrado:
     """Representa um quadrado do tabuleiro de damas"""
     
+    # Sem __dict__ por instância: cada tabuleiro aloca 64 quadrados
+    __slots__ = ('cor', 'ocupante')
+    
     def __init__(self, cor, ocupante=None):
         """
         Cria um quadrado do tabuleiro
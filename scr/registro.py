@@ -0,0 +1,111 @@
+"""
+Registro (logging) assíncrono do servidor
+
+As threads do servidor apenas enfileiram os registros (QueueHandler); a
+formatação e a escrita no arquivo e no console acontecem em uma thread
+própria (QueueListener). Assim nenhuma escrita em disco ou no terminal é
+feita com o lock de uma sala ou do servidor em mãos.
+
+Cada subsistema tem um logger filho de 'damas' com nível ajustável
+separadamente (por exemplo --log partidas=DEBUG para ver cada lance).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+from typing import Dict, Iterable, Optional
+
+
+ARQUIVO_LOG = 'servidor_damas.log'
+FORMATO_LOG = '%(asctime)s - %(levelname)s - %(message)s'
+LOGGER_BASE = 'damas'
+
+# Subsistemas com logger próprio (damas.<nome>)
+SUBSISTEMAS = ('servidor', 'partidas', 'broadcast', 'espectadores', 'supervisor')
+
+_ouvinte: Optional[logging.handlers.QueueListener] = None
+_manipulador: Optional[logging.Handler] = None
+_pid_configurado: Optional[int] = None
+
+
+class ManipuladorFila(logging.handlers.QueueHandler):
+    """QueueHandler que adia também a formatação da mensagem para a thread de escrita"""
+    
+    def prepare(self, record):
+        # A fila não sai do processo: o registro segue com msg e args intactos
+        return record
+
+
+def obter_logger(subsistema: str) -> logging.Logger:
+    """Logger de um subsistema (damas.<subsistema>)"""
+    return logging.getLogger(f"{LOGGER_BASE}.{subsistema}")
+
+
+def configurar_logging(niveis: Optional[Dict[str, str]] = None):
+    """
+    Configura o logging do processo (arquivo + console, escritos em thread própria)
+    
+    Sem efeito se já configurado neste processo; um processo filho criado
+    por fork herda a fila mas não a thread de escrita, então reconfigura.
+    
+    Args:
+        niveis: Nível por subsistema, como {'partidas': 'DEBUG'}
+    """
+    global _ouvinte, _manipulador, _pid_configurado
+    
+    if _pid_configurado != os.getpid():
+        raiz = logging.getLogger()
+        if _manipulador is not None:
+            raiz.removeHandler(_manipulador)
+        
+        formatador = logging.Formatter(FORMATO_LOG)
+        destinos = [logging.FileHandler(ARQUIVO_LOG, encoding='utf-8'), logging.StreamHandler()]
+        for destino in destinos:
+            destino.setFormatter(formatador)
+        
+        fila = queue.SimpleQueue()
+        _manipulador = ManipuladorFila(fila)
+        raiz.addHandler(_manipulador)
+        raiz.setLevel(logging.INFO)
+        
+        _ouvinte = logging.handlers.QueueListener(fila, *destinos, respect_handler_level=True)
+        _ouvinte.start()
+        _pid_configurado = os.getpid()
+    
+    for subsistema, nivel in (niveis or {}).items():
+        obter_logger(subsistema).setLevel(nivel.upper())
+
+
+def encerrar_logging():
+    """Grava os registros pendentes e para a thread de escrita (fim do processo)"""
+    global _ouvinte, _manipulador, _pid_configurado
+    
+    if _ouvinte is not None and _pid_configurado == os.getpid():
+        logging.getLogger().removeHandler(_manipulador)
+        _ouvinte.stop()
+        for destino in _ouvinte.handlers:
+            destino.close()
+        _ouvinte = _manipulador = _pid_configurado = None
+
+
+def interpretar_niveis(especificacoes: Iterable[str]) -> Dict[str, str]:
+    """
+    Converte argumentos 'subsistema=NIVEL' em dicionário
+    
+    Raises:
+        ValueError: Subsistema ou nível desconhecido
+    """
+    niveis = {}
+    for especificacao in especificacoes:
+        subsistema, _, nivel = especificacao.partition('=')
+        if subsistema not in SUBSISTEMAS:
+            raise ValueError(f"Subsistema desconhecido: {subsistema} (use {', '.join(SUBSISTEMAS)})")
+        if not isinstance(logging.getLevelName(nivel.upper()), int):
+            raise ValueError(f"Nível de log desconhecido: {nivel}")
+        niveis[subsistema] = nivel.upper()
+    return niveis
+
+
+atexit.register(encerrar_logging)
@@ -0,0 +1,146 @@
+"""
+Salas de jogo - várias partidas simultâneas no mesmo servidor
+
+Cada sala isola uma partida: jogadores, tabuleiro, turno e lock próprios.
+O GerenciadorSalas cria uma sala nova para cada par formado pela fila de
+pareamento e a descarta quando a partida acaba ou é interrompida.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from constantes import *
+from protocolo import EstadoJogo, Jogador
+
+
+JOGADORES_POR_SALA = 2
+
+
+class Sala:
+    """Uma partida isolada entre dois jogadores"""
+    
+    def __init__(self, sala_id: int):
+        """
+        Cria uma sala vazia aguardando jogadores
+        
+        Args:
+            sala_id: Identificador da sala, enviado aos clientes nas mensagens
+        """
+        self.id = sala_id
+        self.jogadores: Dict[Any, Jogador] = {}  # socket -> Jogador
+        
+        # Estado da partida da sala
+        self.estado_jogo = EstadoJogo.AGUARDANDO_JOGADORES
+        self.partida = None
+        self.indice_capturas = None  # IndiceCapturas do tabuleiro da partida
+        self.turno_atual = VERDE
+        self.movimentos_obrigatorios = []
+        self.versao = 0  # Lances aplicados; clientes com deltas conferem a sequência
+        
+        # Retratos da versão atual, montados uma vez e reaproveitados até o estado mudar
+        self.versao_retratos = None
+        self.estado_tabuleiro = None          # EstadoTabuleiro da versão dos retratos
+        self.retratos: Dict[bool, bytes] = {}  # binario -> ESTADO_JOGO serializado
+        
+        # Protege o estado da sala; jogadas em salas diferentes não competem
+        self.lock = threading.RLock()
+        self.criada_em = time.time()
+    
+    def reiniciar_versao(self):
+        """Nova partida: versão zerada e retratos da partida anterior descartados"""
+        self.versao = 0
+        self.versao_retratos = 0
+        self.estado_tabuleiro = None
+        self.retratos = {}
+    
+    def conferir_versao_retratos(self):
+        """Descarta os retratos montados em versões anteriores (chamador segura o lock)"""
+        if self.versao_retratos != self.versao:
+            self.versao_retratos = self.versao
+            self.estado_tabuleiro = None
+            self.retratos = {}
+    
+    def invalidar_retratos(self):
+        """Descarta os ESTADO_JOGO serializados quando muda algo além do tabuleiro (estado da partida)"""
+        self.retratos = {}
+
+
+class GerenciadorSalas:
+    """Cria e descarta salas e mantém o índice cliente -> sala"""
+    
+    def __init__(self):
+        """Cria o gerenciador sem salas"""
+        self.salas: Dict[int, Sala] = {}
+        self.sala_do_cliente: Dict[Any, Sala] = {}
+        self.proximo_id = 1
+        
+        # Protege apenas os índices; o estado de cada partida usa o lock da sala
+        self.lock = threading.Lock()
+    
+    def __len__(self):
+        """Número de salas ativas"""
+        return len(self.salas)
+    
+    def criar(self, participantes: List[Tuple[Any, Jogador]]) -> Sala:
+        """
+        Cria uma sala para um par de jogadores
+        
+        O primeiro participante joga com as verdes. Define jogador.cor e
+        jogador.sala_id de cada participante.
+        """
+        with self.lock:
+            sala = Sala(self.proximo_id)
+            self.proximo_id += 1
+            
+            for (cliente_socket, jogador), cor in zip(participantes, (VERDE, AMARELO)):
+                jogador.cor = cor
+                jogador.sala_id = sala.id
+                sala.jogadores[cliente_socket] = jogador
+                self.sala_do_cliente[cliente_socket] = sala
+            
+            self.salas[sala.id] = sala
+            return sala
+    
+    def encerrar(self, sala: Sala) -> List[Tuple[Any, Jogador]]:
+        """
+        Descarta a sala e desvincula seus jogadores (chamador segura o lock da sala)
+        
+        Returns:
+            Participantes da sala, ou lista vazia se ela já havia sido encerrada
+        """
+        with self.lock:
+            if self.salas.pop(sala.id, None) is None:
+                return []
+            
+            participantes = list(sala.jogadores.items())
+            for cliente_socket, jogador in participantes:
+                self.sala_do_cliente.pop(cliente_socket, None)
+                jogador.sala_id = None
+            return participantes
+    
+    def obter(self, sala_id: Optional[int]) -> Optional[Sala]:
+        """Retorna a sala pelo identificador"""
+        return self.salas.get(sala_id)
+    
+    def qualquer_em_andamento(self) -> Optional[Sala]:
+        """Sala mais antiga com partida em andamento (espectador que não escolheu sala)"""
+        with self.lock:
+            for sala in self.salas.values():
+                if sala.estado_jogo == EstadoJogo.EM_ANDAMENTO:
+                    return sala
+        return None
+    
+    def sala_de(self, cliente_socket) -> Optional[Sala]:
+        """Retorna a sala em que o cliente está"""
+        return self.sala_do_cliente.get(cliente_socket)
+    
+    def resumo(self) -> Dict[str, int]:
+        """Contagens de salas para estatísticas do servidor"""
+        with self.lock:
+            em_andamento = sum(1 for sala in self.salas.values()
+                               if sala.estado_jogo == EstadoJogo.EM_ANDAMENTO)
+            return {
+                'salas_ativas': len(self.salas),
+                'partidas_em_andamento': em_andamento,
+            }
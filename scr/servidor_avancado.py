@@ -1,67 +1,130 @@
 """
 Servidor melhorado do jogo de damas com integração completa
+
+Dois modos de execução com a mesma lógica de mensagens: uma thread por
+cliente (padrão) ou asyncio, em que cada conexão é uma corrotina e o
+servidor aguenta muitos jogadores ociosos sem uma thread por socket.
+Jogadores entram na fila de pareamento (fila_pareamento.py) depois de se
+apresentar (CONEXAO_SOLICITADA com nome e rating) ou de um prazo curto,
+e cada par formado joga em uma sala própria (salas.py). Com --processos N,
+o supervisor (supervisor.py) roda N servidores na mesma porta.
 """
 
+import argparse
+import asyncio
 import socket
 import threading
 import json
 import time
-import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
-from jogo import Jogo
+import codec_binario
+from buffer_recepcao import BufferRecepcao
+from conexoes import ConexaoAsync, ConexaoThread, FilaSaidaCheia
+from espectadores import DistribuidorEspectadores
+from partida import Partida
+from fila_pareamento import EntradaFila, FilaPareamento
+from indice_capturas import IndiceCapturas
+from salas import JOGADORES_POR_SALA, GerenciadorSalas, Sala
 from constantes import *
+from tabuleiro_bits import TabuleiroBits, SequenciaCaptura
 from protocolo import (
     ProtocoloDamas, TipoMensagem, EstadoJogo, EstadoJogador, 
-    Jogador, Movimento, EstadoTabuleiro, CodigosErro
+    Jogador, Movimento, EstadoTabuleiro, Capacidades, CodigosErro, formatar_hash
 )
+from registro import SUBSISTEMAS, configurar_logging, interpretar_niveis, obter_logger
+
+
+TAMANHO_LEITURA_ASYNC = 16 * 1024  # Bytes pedidos ao StreamReader por leitura
+PRAZO_APRESENTACAO = 2.0           # Segundos para o cliente enviar nome/rating antes de entrar na fila sem rating
+INTERVALO_MANUTENCAO_FILA = 1.0    # Segundos entre varreduras da fila (prazos de apresentação e faixas ampliadas)
+
+# Mensagens que a política da fila de saída pode descartar quando o cliente não acompanha
+TIPOS_DESCARTAVEIS = frozenset({
+    TipoMensagem.CHAT.value, TipoMensagem.NOTIFICACAO.value, TipoMensagem.PONG.value
+})
+
+# Eventos da sala repassados também aos espectadores
+TIPOS_ESPECTADOR = frozenset({
+    TipoMensagem.JOGO_INICIADO.value, TipoMensagem.MOVIMENTO_EXECUTADO.value,
+    TipoMensagem.CHAT.value, TipoMensagem.JOGO_FINALIZADO.value, TipoMensagem.JOGO_INTERROMPIDO.value
+})
+
+# Fim do JOGO_INICIADO serializado (sala_id é o último campo): JSON por linha e JSON compacto do quadro binário
+SUFIXO_SALA_JSON = b', "sala_id": %d}\n'
+SUFIXO_SALA_BINARIO = b',"sala_id":%d}'
 
 
 class ServidorDamasAvancado:
     """Servidor avançado para jogo de damas online"""
     
-    def __init__(self, host='0.0.0.0', porta=12345):
+    def __init__(self, host='0.0.0.0', porta=12345, max_salas=1000, reutilizar_porta=False):
         """Inicializa o servidor"""
         self.host = host
         self.porta = porta
+        self.reutilizar_porta = reutilizar_porta  # SO_REUSEPORT: vários processos na mesma porta
         self.socket_servidor = None
         
         # Configuração de logging
         self.configurar_logging()
         
-        # Controle de jogadores
+        # Controle de jogadores (todos os conectados, na fila ou em salas)
         self.jogadores: Dict[socket.socket, Jogador] = {}
-        self.max_jogadores = 2
+        self.max_salas = max_salas
+        self.max_jogadores = max_salas * JOGADORES_POR_SALA
         self.proximo_id = 1
+        # Conectados que ainda não se apresentaram (entram na fila ao se apresentar ou no fim do prazo)
+        self.apresentacoes_pendentes: Dict[socket.socket, Jogador] = {}
         
-        # Estado do jogo
-        self.estado_jogo = EstadoJogo.AGUARDANDO_JOGADORES
-        self.jogo = None
-        self.turno_atual = VERDE
-        self.movimentos_obrigatorios = []
+        # Pareamento automático e partidas simultâneas (cada sala com estado e lock próprios)
+        self.fila = FilaPareamento()
+        self.salas = GerenciadorSalas()
         
-        # Thread safety
+        # Espectadores recebem os eventos das salas fora do lock da sala
+        self.espectadores = DistribuidorEspectadores(self.codificar, self.enviar_dados,
+                                                     ao_liberar=self.liberar_espectador)
+        
+        # Thread safety do índice de jogadores e das estatísticas (não das partidas)
         self.lock = threading.Lock()
         
         # Controle do servidor
         self.rodando = True
+        self.servidor_async = None
+        self.tarefa_manutencao = None  # Manutenção da fila no modo asyncio
+        
+        # Posição inicial compartilhada por todas as salas: matriz montada e JOGO_INICIADO
+        # serializado (por codec, sem o sala_id) uma única vez por processo
+        self.estado_inicial: Optional[EstadoTabuleiro] = None
+        self.prefixos_jogo_iniciado: Dict[bool, bytes] = {}
+        
+        # Destinos extras dos broadcasts (registro, gravação de partidas): recebem o JSON já serializado
+        self.sinks_broadcast: List[Callable[[int, bytes], None]] = []
         self.estatisticas = {
             'jogos_concluidos': 0,
             'conexoes_totais': 0,
+            'desconexoes_fila_cheia': 0,
+            'broadcast_codificacoes': 0,        # Mensagens serializadas em broadcasts
+            'broadcast_reaproveitadas': 0,      # Envios que reutilizaram bytes já serializados
+            'broadcast_bytes_reaproveitados': 0,
+            'broadcast_tempo_economizado': 0.0,  # Segundos de serialização evitados
+            'retratos_montados': 0,             # ESTADO_JOGO serializados (um por versão e codec)
+            'retratos_reaproveitados': 0,       # Pedidos de estado atendidos pelo cache da sala
             'tempo_inicio': time.time()
         }
     
     def configurar_logging(self):
-        """Configura sistema de logging"""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('servidor_damas.log', encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        """
+        Configura sistema de logging (registro.py: escrita em thread própria)
+        
+        Detalhes por lance e por destinatário saem em DEBUG nos loggers de
+        partidas e broadcast; com o nível padrão (INFO) custam só a checagem
+        de nível, mesmo com o lock da sala em mãos.
+        """
+        configurar_logging()
+        self.logger = obter_logger('servidor')
+        self.log_partidas = obter_logger('partidas')
+        self.log_broadcast = obter_logger('broadcast')
+        self.log_espectadores = obter_logger('espectadores')
     
     def obter_ip_local(self):
         """Obtém o IP local da máquina"""
@@ -96,31 +159,19 @@ class ServidorDamasAvancado:
         try:
             self.socket_servidor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket_servidor.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reutilizar_porta:
+                self.socket_servidor.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
             self.socket_servidor.bind((self.host, self.porta))
             self.socket_servidor.listen(5)
             
-            self.logger.info(f"🎮 Servidor Damas Online iniciado em {self.host}:{self.porta}")
-            
-            # Mostra informações de rede completas
-            if self.host == '0.0.0.0':
-                ips_disponiveis = self.obter_todos_ips()
-                self.logger.info(f"📍 IPs disponíveis para conexão:")
-                for i, ip in enumerate(ips_disponiveis, 1):
-                    self.logger.info(f"   {i}. {ip}:{self.porta}")
-                
-                if ips_disponiveis:
-                    ip_recomendado = ips_disponiveis[0]
-                    self.logger.info(f"✅ IP recomendado: {ip_recomendado}:{self.porta}")
-                
-                self.logger.info(f"💡 Configure firewall para permitir porta {self.porta}")
-                self.logger.info(f"🔧 Use config_rede.py para diagnósticos de rede")
-            
-            self.logger.info("⏳ Aguardando conexões...")
+            self.logger.info("🎮 Servidor Damas Online iniciado em %s:%s", self.host, self.porta)
+            self.mostrar_informacoes_rede()
+            threading.Thread(target=self.loop_manutencao_fila, daemon=True).start()
             
             while self.rodando:
                 try:
                     cliente_socket, endereco = self.socket_servidor.accept()
-                    self.logger.info(f"🔗 Nova conexão de {endereco}")
+                    self.logger.info("🔗 Nova conexão de %s", endereco)
                     
                     # Inicia thread para cliente
                     thread_cliente = threading.Thread(
@@ -132,33 +183,48 @@ class ServidorDamasAvancado:
                     
                 except socket.error as e:
                     if self.rodando:
-                        self.logger.error(f"Erro ao aceitar conexão: {e}")
+                        self.logger.error("Erro ao aceitar conexão: %s", e)
                         
         except Exception as e:
-            self.logger.error(f"Erro fatal do servidor: {e}")
+            self.logger.error("Erro fatal do servidor: %s", e)
         finally:
             self.parar_servidor()
     
-    def gerenciar_cliente(self, cliente_socket: socket.socket, endereco: Tuple[str, int]):
-        """Gerencia comunicação com cliente"""
-        jogador = None
+    def mostrar_informacoes_rede(self):
+        """Registra os endereços em que o servidor pode ser alcançado"""
+        if self.host == '0.0.0.0':
+            ips_disponiveis = self.obter_todos_ips()
+            self.logger.info("📍 IPs disponíveis para conexão:")
+            for i, ip in enumerate(ips_disponiveis, 1):
+                self.logger.info("   %d. %s:%s", i, ip, self.porta)
+            
+            if ips_disponiveis:
+                ip_recomendado = ips_disponiveis[0]
+                self.logger.info("✅ IP recomendado: %s:%s", ip_recomendado, self.porta)
+            
+            self.logger.info("💡 Configure firewall para permitir porta %s", self.porta)
+            self.logger.info("🔧 Use config_rede.py para diagnósticos de rede")
         
-        try:
-            with self.lock:
-                # Verifica se servidor está lotado
-                if len(self.jogadores) >= self.max_jogadores:
-                    mensagem = ProtocoloDamas.criar_mensagem_conexao_rejeitada(
-                        "Servidor lotado. Máximo 2 jogadores."
-                    )
-                    self.enviar_mensagem(cliente_socket, mensagem)
-                    cliente_socket.close()
-                    return
-                
-                # Cria novo jogador
+        self.logger.info("⏳ Aguardando conexões...")
+    
+    def admitir_jogador(self, cliente_socket, endereco: Tuple[str, int]) -> Optional[Jogador]:
+        """
+        Registra um novo cliente (comum aos modos thread e asyncio)
+        
+        O jogador só entra na fila de pareamento ao se apresentar, para ser
+        pareado já com o seu rating, ou quando PRAZO_APRESENTACAO expirar.
+        
+        Returns:
+            Jogador criado ou None se o servidor estiver lotado (conexão já fechada)
+        """
+        with self.lock:
+            lotado = len(self.jogadores) >= self.max_jogadores
+            if not lotado:
+                # Cria novo jogador; cor e sala são definidas quando o par for formado
                 jogador = Jogador(
                     id=self.proximo_id,
                     nome=f"Jogador {self.proximo_id}",
-                    cor=VERDE if self.proximo_id == 1 else AMARELO,
+                    cor=None,
                     socket=cliente_socket,
                     endereco=endereco,
                     estado=EstadoJogador.CONECTADO,
@@ -166,61 +232,324 @@ class ServidorDamasAvancado:
                 )
                 
                 self.jogadores[cliente_socket] = jogador
+                self.apresentacoes_pendentes[cliente_socket] = jogador
                 self.proximo_id += 1
                 self.estatisticas['conexoes_totais'] += 1
-                
-                self.logger.info(f"👤 {jogador.nome} ({jogador.cor}) conectado")
-                
-                # Envia confirmação de conexão
-                mensagem_aceita = ProtocoloDamas.criar_mensagem_conexao_aceita(jogador)
-                self.enviar_mensagem(cliente_socket, mensagem_aceita)
-                
-                # Verifica se pode iniciar jogo
-                if len(self.jogadores) == 2:
-                    self.iniciar_novo_jogo()
+        
+        # Verifica se servidor está lotado
+        if lotado:
+            mensagem = ProtocoloDamas.criar_mensagem_conexao_rejeitada(
+                f"Servidor lotado. Máximo de {self.max_salas} partidas."
+            )
+            self.enviar_mensagem(cliente_socket, mensagem)
+            cliente_socket.close()
+            return None
+        
+        self.logger.info("👤 %s conectado", jogador.nome)
+        return jogador
+    
+    # === PAREAMENTO ===
+    
+    def colocar_na_fila(self, cliente_socket, jogador: Jogador):
+        """Coloca o jogador na fila; se formar par, cria a sala e inicia a partida"""
+        jogador.estado = EstadoJogador.AGUARDANDO_ADVERSARIO
+        jogador.cor = None
+        
+        par = self.fila.entrar(cliente_socket, jogador)
+        if par is None:
+            mensagem = ProtocoloDamas.criar_mensagem_notificacao(
+                f"Procurando adversário... ({self.fila.profundidade} na fila)"
+            )
+            try:
+                self.enviar_mensagem(cliente_socket, mensagem)
+            except Exception:
+                self.encerrar_conexao(cliente_socket)
+            return
+        
+        self.iniciar_sala_pareada(par)
+    
+    def iniciar_sala_pareada(self, par: Tuple[EntradaFila, EntradaFila]):
+        """Cria a sala de um par formado pela fila e inicia a partida"""
+        sala = self.salas.criar([(entrada.cliente, entrada.jogador) for entrada in par])
+        espera = time.time() - par[0].entrou_em
+        self.log_partidas.info("🤝 Par formado na sala %d: %s x %s (espera %.1fs)",
+                               sala.id, par[0].jogador.nome, par[1].jogador.nome, espera)
+        
+        with sala.lock:
+            for cliente_sala, jogador_sala in sala.jogadores.items():
+                # Envia confirmação com cor e sala
+                mensagem_aceita = ProtocoloDamas.criar_mensagem_conexao_aceita(jogador_sala)
+                try:
+                    self.enviar_mensagem(cliente_sala, mensagem_aceita)
+                except Exception:
+                    self.encerrar_conexao(cliente_sala)
+            
+            self.iniciar_novo_jogo(sala)
+        
+        # Adversário que desconectou durante o pareamento interrompe a sala recém-criada
+        for cliente_sala, jogador_sala in list(sala.jogadores.items()):
+            if cliente_sala not in self.jogadores:
+                self.interromper_sala(sala, cliente_sala, jogador_sala)
+                break
+    
+    def interromper_sala(self, sala: Sala, cliente_socket, jogador: Jogador):
+        """Encerra a sala de quem saiu e devolve os demais jogadores à fila"""
+        with sala.lock:
+            participantes = self.salas.encerrar(sala)
+            if not participantes:
+                return  # Sala já encerrada
+            
+            # Notifica outros jogadores da sala
+            mensagem_notif = ProtocoloDamas.criar_mensagem_notificacao(
+                f"{jogador.nome} desconectou", "warning"
+            )
+            self.broadcast_mensagem(sala, mensagem_notif, excluir_socket=cliente_socket)
+            
+            # Interrompe jogo se estava ativo
+            if sala.estado_jogo == EstadoJogo.EM_ANDAMENTO:
+                mensagem_interrupcao = {
+                    'tipo': TipoMensagem.JOGO_INTERROMPIDO.value,
+                    'motivo': 'Jogador desconectou',
+                    'mensagem': 'Jogo interrompido - jogador desconectou'
+                }
+                self.broadcast_mensagem(sala, mensagem_interrupcao, excluir_socket=cliente_socket)
+                sala.estado_jogo = EstadoJogo.INTERROMPIDO
+                sala.partida = None
+                sala.invalidar_retratos()
+            
+            self.espectadores.encerrar_sala(sala.id)
+        
+        # Quem ficou volta para a fila
+        for cliente_restante, jogador_restante in participantes:
+            if cliente_restante != cliente_socket and cliente_restante in self.jogadores:
+                self.colocar_na_fila(cliente_restante, jogador_restante)
+    
+    def processar_solicitacao_conexao(self, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
+        """Aplica nome, rating e capacidades do cliente; coloca na fila ou reposiciona se estiver aguardando"""
+        if 'nome' in mensagem:
+            jogador.nome = mensagem['nome'].strip()
+        if 'rating' in mensagem:
+            jogador.rating = mensagem['rating']
+        if 'capacidades' in mensagem:
+            # Recursos desconhecidos são ignorados; o cliente recebe o formato padrão
+            jogador.capacidades = Capacidades.SUPORTADAS.intersection(mensagem['capacidades'])
+        
+        self.concluir_apresentacao(cliente_socket)
+        if self.reivindicar_fila(cliente_socket, jogador) or self.fila.sair(cliente_socket):
+            self.colocar_na_fila(cliente_socket, jogador)
+    
+    def concluir_apresentacao(self, cliente_socket) -> bool:
+        """Tira o cliente das apresentações pendentes; True só para quem a concluiu agora"""
+        with self.lock:
+            return self.apresentacoes_pendentes.pop(cliente_socket, None) is not None
+    
+    def reivindicar_fila(self, cliente_socket, jogador: Jogador) -> bool:
+        """
+        Marca como aguardando quem está conectado fora de sala e de fila
+        
+        Apresentação, prazo de apresentação e fim da partida assistida podem
+        competir pelo mesmo cliente: só quem recebe True o coloca na fila.
+        """
+        with self.lock:
+            if (cliente_socket not in self.jogadores or jogador.estado != EstadoJogador.CONECTADO or
+                    self.salas.sala_de(cliente_socket) is not None):
+                return False
+            jogador.estado = EstadoJogador.AGUARDANDO_ADVERSARIO
+            return True
+    
+    def liberar_espectador(self, cliente_socket, jogador: Jogador):
+        """Espectador de uma partida encerrada volta à fila de pareamento"""
+        try:
+            if self.reivindicar_fila(cliente_socket, jogador):
+                self.colocar_na_fila(cliente_socket, jogador)
+        except Exception as e:
+            self.log_espectadores.error("Erro ao devolver %s à fila: %s", jogador.nome, e)
+    
+    def manter_fila(self):
+        """Enfileira quem não se apresentou no prazo e pareia esperas longas entre faixas vizinhas"""
+        limite = time.time() - PRAZO_APRESENTACAO
+        with self.lock:
+            atrasados = [
+                (cliente, jogador) for cliente, jogador in self.apresentacoes_pendentes.items()
+                if jogador.conectado_em <= limite
+            ]
+            for cliente, _ in atrasados:
+                del self.apresentacoes_pendentes[cliente]
+        
+        for cliente, jogador in atrasados:
+            if self.reivindicar_fila(cliente, jogador):
+                self.colocar_na_fila(cliente, jogador)
+        
+        for par in self.fila.parear_esperas():
+            self.log_partidas.debug("↔️ Faixas ampliadas: %s (faixa %d) x %s (faixa %d)",
+                                    par[0].jogador.nome, par[0].faixa, par[1].jogador.nome, par[1].faixa)
+            self.iniciar_sala_pareada(par)
+    
+    def loop_manutencao_fila(self):
+        """Thread de manutenção da fila (modo threads)"""
+        while self.rodando:
+            time.sleep(INTERVALO_MANUTENCAO_FILA)
+            try:
+                self.manter_fila()
+            except Exception as e:
+                self.logger.error("Erro na manutenção da fila: %s", e)
+    
+    async def manutencao_fila_async(self):
+        """Corrotina de manutenção da fila (modo asyncio: envios partem do laço de eventos)"""
+        while self.rodando:
+            await asyncio.sleep(INTERVALO_MANUTENCAO_FILA)
+            try:
+                self.manter_fila()
+            except Exception as e:
+                self.logger.error("Erro na manutenção da fila: %s", e)
+    
+    def obter_estatisticas(self) -> Dict:
+        """Estatísticas do servidor, das salas e da fila de pareamento"""
+        with self.lock:
+            estatisticas = dict(self.estatisticas)
+            estatisticas['jogadores_conectados'] = len(self.jogadores)
+        estatisticas.update(self.salas.resumo())
+        estatisticas['fila'] = self.fila.estatisticas()
+        estatisticas['espectadores'] = self.espectadores.estatisticas()
+        estatisticas['espectadores_conectados'] = estatisticas['espectadores']['conectados']
+        return estatisticas
+    
+    def gerenciar_cliente(self, cliente_socket: socket.socket, endereco: Tuple[str, int]):
+        """Gerencia comunicação com cliente"""
+        conexao = ConexaoThread(cliente_socket, endereco)
+        jogador = None
+        
+        try:
+            jogador = self.admitir_jogador(conexao, endereco)
+            if jogador is None:
+                return
             
             # Loop de comunicação
-            self.loop_comunicacao_cliente(cliente_socket, jogador)
+            self.loop_comunicacao_cliente(conexao, jogador)
             
         except Exception as e:
-            self.logger.error(f"Erro ao gerenciar cliente {endereco}: {e}")
+            self.logger.error("Erro ao gerenciar cliente %s: %s", endereco, e)
         finally:
             if jogador:
-                self.desconectar_jogador(cliente_socket, jogador)
+                self.desconectar_jogador(conexao, jogador)
     
     def loop_comunicacao_cliente(self, cliente_socket: socket.socket, jogador: Jogador):
-        """Loop principal de comunicação com cliente"""
-        buffer = ""
+        """Loop principal de comunicação com cliente (linhas JSON e quadros binários)"""
+        buffer = BufferRecepcao()
         
         while self.rodando and cliente_socket in self.jogadores:
             try:
-                dados = cliente_socket.recv(4096).decode('utf-8')
-                if not dados:
+                if not buffer.receber(cliente_socket):
                     break
                 
-                buffer += dados
-                
                 # Processa mensagens completas
-                while '\n' in buffer:
-                    linha, buffer = buffer.split('\n', 1)
-                    if linha.strip():
-                        try:
-                            mensagem = json.loads(linha)
-                            self.processar_mensagem(cliente_socket, jogador, mensagem)
-                        except json.JSONDecodeError:
-                            self.logger.warning(f"Mensagem JSON inválida de {jogador.nome}")
-                            self.enviar_erro(cliente_socket, 
-                                           CodigosErro.MENSAGEM_MALFORMADA,
-                                           "Formato de mensagem inválido")
+                self.processar_recebidas(cliente_socket, jogador, buffer)
                 
+            except codec_binario.ErroCodec as e:
+                self.enviar_erro(cliente_socket, CodigosErro.MENSAGEM_MALFORMADA, str(e))
+                break
             except socket.timeout:
                 continue
             except socket.error:
                 break
             except Exception as e:
-                self.logger.error(f"Erro na comunicação com {jogador.nome}: {e}")
+                self.logger.error("Erro na comunicação com %s: %s", jogador.nome, e)
                 break
     
+    # === MODO ASYNCIO ===
+    
+    async def iniciar_servidor_async(self):
+        """Inicia o servidor no laço de eventos: uma corrotina por conexão"""
+        try:
+            self.servidor_async = await asyncio.start_server(
+                self.gerenciar_cliente_async, self.host, self.porta,
+                reuse_address=True, reuse_port=self.reutilizar_porta, backlog=1024
+            )
+            self.espectadores.usar_laco(asyncio.get_running_loop())
+            self.tarefa_manutencao = asyncio.get_running_loop().create_task(self.manutencao_fila_async())
+            
+            self.logger.info("🎮 Servidor Damas Online (asyncio) iniciado em %s:%s", self.host, self.porta)
+            self.mostrar_informacoes_rede()
+            
+            async with self.servidor_async:
+                await self.servidor_async.serve_forever()
+        
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error("Erro fatal do servidor: %s", e)
+        finally:
+            self.parar_servidor()
+    
+    async def gerenciar_cliente_async(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Gerencia uma conexão; os envios saem pela corrotina escritora da ConexaoAsync"""
+        conexao = ConexaoAsync(writer)
+        jogador = None
+        self.logger.info("🔗 Nova conexão de %s", conexao.endereco)
+        
+        try:
+            jogador = self.admitir_jogador(conexao, conexao.endereco)
+            if jogador is None:
+                return
+            
+            buffer = BufferRecepcao()
+            while self.rodando and conexao in self.jogadores:
+                dados = await reader.read(TAMANHO_LEITURA_ASYNC)
+                if not dados:
+                    break
+                
+                try:
+                    buffer.acrescentar(dados)
+                    self.processar_recebidas(conexao, jogador, buffer)
+                except codec_binario.ErroCodec as e:
+                    self.enviar_erro(conexao, CodigosErro.MENSAGEM_MALFORMADA, str(e))
+                    break
+        
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            self.logger.error("Erro ao gerenciar cliente %s: %s", conexao.endereco, e)
+        finally:
+            if jogador:
+                self.desconectar_jogador(conexao, jogador)
+    
+    # === PROCESSAMENTO DE MENSAGENS ===
+    
+    def processar_recebidas(self, cliente_socket: socket.socket, jogador: Jogador, buffer: BufferRecepcao):
+        """Processa as mensagens completas do buffer (linhas JSON e quadros binários)"""
+        for binario, conteudo in buffer.mensagens():
+            if binario:
+                self.processar_quadro(cliente_socket, jogador, conteudo)
+            else:
+                self.processar_linha(cliente_socket, jogador, str(conteudo, 'utf-8', 'replace'))
+    
+    def processar_linha(self, cliente_socket: socket.socket, jogador: Jogador, linha: str):
+        """Decodifica uma linha JSON recebida e a processa"""
+        if not linha.strip():
+            return
+        
+        try:
+            mensagem = json.loads(linha)
+        except json.JSONDecodeError:
+            self.logger.warning("Mensagem JSON inválida de %s", jogador.nome)
+            self.enviar_erro(cliente_socket, 
+                           CodigosErro.MENSAGEM_MALFORMADA,
+                           "Formato de mensagem inválido")
+            return
+        
+        self.processar_mensagem(cliente_socket, jogador, mensagem)
+    
+    def processar_quadro(self, cliente_socket: socket.socket, jogador: Jogador, conteudo: bytes):
+        """Decodifica um quadro binário recebido e o processa"""
+        try:
+            mensagem = codec_binario.decodificar(conteudo)
+        except codec_binario.ErroCodec as e:
+            self.logger.warning("Quadro binário inválido de %s: %s", jogador.nome, e)
+            self.enviar_erro(cliente_socket, CodigosErro.MENSAGEM_MALFORMADA, str(e))
+            return
+        
+        self.processar_mensagem(cliente_socket, jogador, mensagem)
+    
     def processar_mensagem(self, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
         """Processa mensagem recebida do cliente"""
         # Valida mensagem
@@ -230,39 +559,62 @@ class ServidorDamasAvancado:
             return
         
         tipo = mensagem.get('tipo')
+        sala = self.salas.obter(jogador.sala_id)
         
-        if tipo == TipoMensagem.MOVIMENTO_SOLICITADO.value:
-            self.processar_movimento(cliente_socket, jogador, mensagem)
+        if tipo == TipoMensagem.PING.value:
+            self.enviar_mensagem(cliente_socket, {'tipo': TipoMensagem.PONG.value})
+        elif tipo == TipoMensagem.CONEXAO_SOLICITADA.value:
+            self.processar_solicitacao_conexao(cliente_socket, jogador, mensagem)
+        elif tipo == TipoMensagem.ASSISTIR_PARTIDA.value:
+            self.processar_assistir_partida(cliente_socket, jogador, mensagem.get('sala_id'))
+        elif jogador.estado == EstadoJogador.ESPECTADOR:
+            if tipo == TipoMensagem.SOLICITAR_ESTADO.value and sala is not None:
+                # Ressincronização: novo retrato, seguido dos próximos eventos
+                self.adicionar_espectador(sala, cliente_socket, jogador)
+            else:
+                self.enviar_erro(cliente_socket, CodigosErro.SOMENTE_LEITURA,
+                               "Espectadores não podem jogar nem usar o chat")
+        elif sala is None:
+            self.enviar_erro(cliente_socket, CodigosErro.JOGO_NAO_INICIADO,
+                           "Aguardando adversário na fila de pareamento")
+        elif tipo == TipoMensagem.MOVIMENTO_SOLICITADO.value:
+            self.processar_movimento(sala, cliente_socket, jogador, mensagem)
         elif tipo == TipoMensagem.SOLICITAR_ESTADO.value:
-            self.enviar_estado_completo(cliente_socket)
+            self.enviar_estado_completo(sala, cliente_socket)
         elif tipo == TipoMensagem.CHAT.value:
-            self.processar_chat(cliente_socket, jogador, mensagem)
-        elif tipo == TipoMensagem.PING.value:
-            self.enviar_mensagem(cliente_socket, {'tipo': TipoMensagem.PONG.value})
+            self.processar_chat(sala, cliente_socket, jogador, mensagem)
         else:
             self.enviar_erro(cliente_socket, CodigosErro.TIPO_DESCONHECIDO, 
                            f"Tipo de mensagem desconhecido: {tipo}")
     
-    def processar_movimento(self, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
+    def processar_movimento(self, sala: Sala, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
         """Processa movimento de peça"""
-        with self.lock:
+        with sala.lock:
             # Verifica se jogo está ativo
-            if self.estado_jogo != EstadoJogo.EM_ANDAMENTO:
+            if sala.estado_jogo != EstadoJogo.EM_ANDAMENTO:
                 self.enviar_erro(cliente_socket, CodigosErro.JOGO_NAO_INICIADO,
                                "Jogo não está em andamento")
                 return
             
             # Verifica se é o turno do jogador
-            if jogador.cor != self.turno_atual:
+            if jogador.cor != sala.turno_atual:
                 self.enviar_erro(cliente_socket, CodigosErro.NAO_SEU_TURNO,
                                "Não é seu turno")
                 return
             
             origem = tuple(mensagem['origem'])
             destino = tuple(mensagem['destino'])
+            caminho = [tuple(casa) for casa in mensagem.get('caminho', [])]
+            if not caminho and abs(destino[0] - origem[0]) == 2 and abs(destino[1] - origem[1]) == 2:
+                # Salto avulso é uma cadeia de um salto só: recusado se a peça ainda puder capturar
+                caminho = [destino]
             
             # Valida movimento usando lógica do jogo existente
-            resultado_validacao = self.validar_movimento_completo(origem, destino, jogador.cor)
+            if caminho:
+                # Cadeia de capturas enviada de uma vez: validada e aplicada atomicamente
+                resultado_validacao = self.validar_sequencia_captura(sala, origem, caminho, jogador.cor)
+            else:
+                resultado_validacao = self.validar_movimento_completo(sala, origem, destino, jogador.cor)
             
             if not resultado_validacao['valido']:
                 mensagem_erro = ProtocoloDamas.criar_mensagem_movimento_invalido(
@@ -272,30 +624,37 @@ class ServidorDamasAvancado:
                 return
             
             # Executa movimento (sem enviar mensagem automaticamente)
-            resultado_movimento = self.executar_movimento_completo(origem, destino, jogador, alternar_turno=False)
+            if caminho:
+                resultado_movimento = self.executar_sequencia_captura(
+                    sala, resultado_validacao['sequencia'], jogador
+                )
+            else:
+                resultado_movimento = self.executar_movimento_completo(sala, origem, destino, jogador, alternar_turno=False)
             
             if resultado_movimento['sucesso']:
-                # Verifica condições de vitória
-                vencedor = self.verificar_condicoes_vitoria()
+                sala.indice_capturas.atualizar(self.casas_alteradas(resultado_movimento['movimento']))
+                
+                # Alterna turno (a partida detecta o fim de jogo ao passar a vez)
+                self.alternar_turno(sala)
+                sala.versao += 1
+                vencedor = self.verificar_condicoes_vitoria(sala)
                 
                 if vencedor:
-                    self.finalizar_jogo(vencedor, "Vitória por eliminação")
+                    self.finalizar_jogo(sala, vencedor, sala.partida.motivo)
                 else:
-                    # Alterna turno e envia mensagem atualizada
-                    self.alternar_turno()
-                    self.verificar_movimentos_obrigatorios()
-                    # Envia mensagem com turno atualizado
-                    self.enviar_mensagem_turno_atualizado(resultado_movimento['movimento'])
+                    # Envia mensagem com turno atualizado e avisa o próximo jogador das capturas
+                    self.enviar_mensagem_turno_atualizado(sala, resultado_movimento['movimento'])
+                    self.verificar_movimentos_obrigatorios(sala)
             else:
                 mensagem_erro = ProtocoloDamas.criar_mensagem_movimento_invalido(
                     resultado_movimento['erro']
                 )
                 self.enviar_mensagem(cliente_socket, mensagem_erro)
     
-    def validar_movimento_completo(self, origem: Tuple[int, int], destino: Tuple[int, int], 
+    def validar_movimento_completo(self, sala: Sala, origem: Tuple[int, int], destino: Tuple[int, int], 
                                  cor_jogador: str) -> Dict:
         """Valida movimento usando lógica do jogo"""
-        if not self.jogo or not self.jogo.tabuleiro:
+        if not sala.partida or not sala.partida.tabuleiro:
             return {'valido': False, 'motivo': 'Estado de jogo inválido'}
         
         # Verifica limites do tabuleiro
@@ -306,7 +665,7 @@ class ServidorDamasAvancado:
         destino_x, destino_y = destino
         
         # Verifica se há peça na origem
-        quadrado_origem = self.jogo.tabuleiro.matriz[origem_y][origem_x]
+        quadrado_origem = sala.partida.tabuleiro.matriz[origem_y][origem_x]
         if not quadrado_origem.ocupante:
             return {'valido': False, 'motivo': 'Não há peça na posição de origem'}
         
@@ -315,7 +674,7 @@ class ServidorDamasAvancado:
             return {'valido': False, 'motivo': 'Peça não pertence ao jogador'}
         
         # Verifica se destino está vazio
-        quadrado_destino = self.jogo.tabuleiro.matriz[destino_y][destino_x]
+        quadrado_destino = sala.partida.tabuleiro.matriz[destino_y][destino_x]
         if quadrado_destino.ocupante:
             return {'valido': False, 'motivo': 'Posição de destino ocupada'}
         
@@ -340,7 +699,7 @@ class ServidorDamasAvancado:
         # Verifica se é movimento simples (1 casa) ou captura
         if diff_x == 1:
             # Movimento simples - verifica se não há capturas obrigatórias
-            if self.movimentos_obrigatorios:
+            if sala.movimentos_obrigatorios:
                 return {'valido': False, 'motivo': 'Há capturas obrigatórias disponíveis'}
             return {'valido': True, 'motivo': 'Movimento simples válido'}
         
@@ -349,7 +708,7 @@ class ServidorDamasAvancado:
             meio_x = origem_x + (destino_x - origem_x) // 2
             meio_y = origem_y + (destino_y - origem_y) // 2
             
-            quadrado_meio = self.jogo.tabuleiro.matriz[meio_y][meio_x]
+            quadrado_meio = sala.partida.tabuleiro.matriz[meio_y][meio_x]
             if not quadrado_meio.ocupante:
                 return {'valido': False, 'motivo': 'Não há peça para capturar'}
             
@@ -361,17 +720,73 @@ class ServidorDamasAvancado:
         else:
             return {'valido': False, 'motivo': 'Movimento muito longo'}
     
-    def executar_movimento_completo(self, origem: Tuple[int, int], destino: Tuple[int, int], 
+    def validar_sequencia_captura(self, sala: Sala, origem: Tuple[int, int], caminho: List[Tuple[int, int]],
+                                  cor_jogador: str) -> Dict:
+        """Valida uma cadeia completa de capturas contra as sequências geradas pelo motor"""
+        if not sala.partida or not sala.partida.tabuleiro:
+            return {'valido': False, 'motivo': 'Estado de jogo inválido'}
+        
+        if not self.coordenadas_validas(origem) or not all(self.coordenadas_validas(c) for c in caminho):
+            return {'valido': False, 'motivo': 'Coordenadas fora do tabuleiro'}
+        
+        origem_x, origem_y = origem
+        quadrado_origem = sala.partida.tabuleiro.matriz[origem_y][origem_x]
+        if not quadrado_origem.ocupante:
+            return {'valido': False, 'motivo': 'Não há peça na posição de origem'}
+        
+        if quadrado_origem.ocupante.cor != cor_jogador:
+            return {'valido': False, 'motivo': 'Peça não pertence ao jogador'}
+        
+        motor = TabuleiroBits.de_tabuleiro(sala.partida.tabuleiro)
+        caminho = tuple(caminho)
+        for sequencia in motor.sequencias_captura(cor_jogador, origem):
+            if sequencia.destinos == caminho:
+                return {'valido': True, 'motivo': 'Sequência de captura válida', 'sequencia': sequencia}
+        
+        return {'valido': False, 'motivo': 'Sequência de captura inválida ou incompleta'}
+    
+    def executar_sequencia_captura(self, sala: Sala, sequencia: SequenciaCaptura, jogador: Jogador) -> Dict:
+        """Aplica todos os saltos de uma sequência validada como um único movimento"""
+        try:
+            tabuleiro = sala.partida.tabuleiro
+            atual = sequencia.origem
+            for destino in sequencia.destinos:
+                tabuleiro.mover_peca(atual, destino)
+                atual = destino
+            
+            movimento = Movimento(
+                origem=sequencia.origem,
+                destino=sequencia.destinos[-1],
+                jogador_id=jogador.id,
+                cor_jogador=jogador.cor,
+                e_captura=True,
+                pecas_capturadas=list(sequencia.capturadas),
+                promoveu_dama=sequencia.promoveu_dama,
+                timestamp=time.time(),
+                caminho=list(sequencia.destinos)
+            )
+            
+            self.log_partidas.debug("Captura múltipla executada: %s de %s por %s (%d peça(s))",
+                                    jogador.nome, sequencia.origem, sequencia.destinos,
+                                    len(sequencia.capturadas))
+            
+            return {'sucesso': True, 'movimento': movimento}
+        
+        except Exception as e:
+            self.log_partidas.error("Erro ao executar sequência de captura: %s", e)
+            return {'sucesso': False, 'erro': 'Erro interno do servidor'}
+    
+    def executar_movimento_completo(self, sala: Sala, origem: Tuple[int, int], destino: Tuple[int, int], 
                                   jogador: Jogador, alternar_turno: bool = True) -> Dict:
         """Executa movimento e atualiza estado"""
         try:
             origem_x, origem_y = origem
             destino_x, destino_y = destino
             
-            # Move a peça
-            peca = self.jogo.tabuleiro.matriz[origem_y][origem_x].ocupante
-            self.jogo.tabuleiro.matriz[origem_y][origem_x].remover_peca()
-            self.jogo.tabuleiro.matriz[destino_y][destino_x].colocar_peca(peca)
+            # Move a peça pelo tabuleiro (remove capturada e coroa na última linha)
+            peca = sala.partida.tabuleiro.matriz[origem_y][origem_x].ocupante
+            era_dama = peca.e_dama
+            sala.partida.tabuleiro.mover_peca(origem, destino)
             
             # Cria objeto movimento
             movimento = Movimento(
@@ -388,143 +803,171 @@ class ServidorDamasAvancado:
                 movimento.e_captura = True
                 meio_x = origem_x + (destino_x - origem_x) // 2
                 meio_y = origem_y + (destino_y - origem_y) // 2
-                
-                # Remove peça capturada
-                self.jogo.tabuleiro.matriz[meio_y][meio_x].remover_peca()
                 movimento.pecas_capturadas = [(meio_x, meio_y)]
             
             # Verifica promoção a dama
-            if not peca.e_dama:
-                # VERDE se move para cima e vira dama no topo (x == 0)
-                # AMARELO se move para baixo e vira dama no fundo (x == TAMANHO_TABULEIRO - 1)
-                if (jogador.cor == VERDE and destino_y == 0) or \
-                   (jogador.cor == AMARELO and destino_y == TAMANHO_TABULEIRO - 1):
-                    peca.promover_dama()
-                    movimento.promoveu_dama = True
+            # VERDE vira dama no topo (y == 0), AMARELO no fundo (y == TAMANHO_TABULEIRO - 1)
+            if not era_dama and peca.e_dama:
+                movimento.promoveu_dama = True
             
-            self.logger.info(f"Movimento executado: {jogador.nome} de {origem} para {destino}")
+            self.log_partidas.debug("Movimento executado: %s de %s para %s", jogador.nome, origem, destino)
             
             return {'sucesso': True, 'movimento': movimento}
             
         except Exception as e:
-            self.logger.error(f"Erro ao executar movimento: {e}")
+            self.log_partidas.error("Erro ao executar movimento: %s", e)
             return {'sucesso': False, 'erro': 'Erro interno do servidor'}
     
-    def iniciar_novo_jogo(self):
+    def iniciar_novo_jogo(self, sala: Sala):
         """Inicia um novo jogo"""
-        self.estado_jogo = EstadoJogo.EM_ANDAMENTO
-        self.jogo = Jogo()
-        self.turno_atual = VERDE
-        self.movimentos_obrigatorios = []
+        sala.estado_jogo = EstadoJogo.EM_ANDAMENTO
+        sala.partida = Partida()
+        sala.indice_capturas = IndiceCapturas(sala.partida.tabuleiro, posicao_inicial=True)
+        sala.turno_atual = VERDE
+        sala.movimentos_obrigatorios = []
+        sala.reiniciar_versao()
+        
+        # Toda partida começa na mesma posição: a matriz é montada só na primeira
+        if self.estado_inicial is None:
+            self.estado_inicial = self.obter_estado_tabuleiro(sala)
+        sala.estado_tabuleiro = self.estado_inicial
         
         # Atualiza estado dos jogadores
-        for jogador in self.jogadores.values():
+        for jogador in sala.jogadores.values():
             jogador.estado = EstadoJogador.JOGANDO
         
         # Envia mensagem de início
-        estado_inicial = self.obter_estado_tabuleiro()
         mensagem_inicio = ProtocoloDamas.criar_mensagem_jogo_iniciado(
-            estado_inicial, self.turno_atual
+            self.estado_inicial, sala.turno_atual
         )
-        self.broadcast_mensagem(mensagem_inicio)
+        self.marcar_versao(sala, mensagem_inicio)
+        self.broadcast_mensagem(sala, mensagem_inicio, codificar=self.codificar_jogo_iniciado)
         
-        self.logger.info("🎯 Novo jogo iniciado")
+        self.log_partidas.info("🎯 Novo jogo iniciado na sala %d", sala.id)
     
-    def enviar_mensagem_turno_atualizado(self, movimento: Movimento):
-        """Envia mensagem de movimento com turno atualizado"""
-        estado_atual = self.obter_estado_tabuleiro()
-        mensagem_movimento = ProtocoloDamas.criar_mensagem_movimento_executado(
-            movimento, estado_atual, self.turno_atual
+    def enviar_mensagem_turno_atualizado(self, sala: Sala, movimento: Movimento):
+        """
+        Envia mensagem de movimento com turno atualizado
+        
+        Clientes com Capacidades.DELTA recebem só o lance, a versão e o hash;
+        o tabuleiro completo só é montado se algum jogador da sala não
+        anunciou a capacidade (jogadores e espectadores).
+        """
+        hash_tabuleiro = sala.partida.tabuleiro.hash_posicao
+        mensagem_delta = ProtocoloDamas.criar_mensagem_movimento_executado(
+            movimento, None, sala.turno_atual, sala.versao, hash_tabuleiro
         )
         
-        self.logger.info(f"📤 Enviando mensagem de movimento executado")
-        self.logger.info(f"   - Movimento: {movimento.origem} -> {movimento.destino}")
-        self.logger.info(f"   - Jogador que jogou: {movimento.cor_jogador}")
-        self.logger.info(f"   - Próximo turno: {self.turno_atual}")
-        self.logger.info(f"   - Número de jogadores conectados: {len(self.jogadores)}")
+        mensagem_completa = None
+        if (self.espectadores.precisa_completo(sala.id) or
+                any(Capacidades.DELTA not in jogador.capacidades for jogador in sala.jogadores.values())):
+            mensagem_completa = ProtocoloDamas.criar_mensagem_movimento_executado(
+                movimento, self.obter_estado_tabuleiro(sala), sala.turno_atual, sala.versao, hash_tabuleiro
+            )
+        
+        self.log_partidas.debug("📤 Enviando movimento executado na sala %d: %s -> %s por %s "
+                                "(%d jogadores conectados)", sala.id, movimento.origem, movimento.destino,
+                                movimento.cor_jogador, len(sala.jogadores))
         
-        self.broadcast_mensagem(mensagem_movimento)
+        if mensagem_completa is None:
+            self.broadcast_mensagem(sala, mensagem_delta)
+        else:
+            self.broadcast_mensagem(sala, mensagem_completa, mensagem_delta=mensagem_delta)
         
-        self.logger.info(f"✅ Turno atualizado enviado: agora é a vez de {self.turno_atual}")
+        self.log_partidas.debug("✅ Turno atualizado enviado: agora é a vez de %s", sala.turno_atual)
     
-    def alternar_turno(self):
+    def alternar_turno(self, sala: Sala):
         """Alterna o turno entre jogadores"""
-        turno_anterior = self.turno_atual
-        self.turno_atual = AMARELO if self.turno_atual == VERDE else VERDE
+        turno_anterior = sala.turno_atual
+        if sala.partida:
+            sala.partida.finalizar_turno()
+            sala.turno_atual = sala.partida.turno
+        else:
+            sala.turno_atual = AMARELO if sala.turno_atual == VERDE else VERDE
         
-        self.logger.info(f"🔄 Alternando turno: {turno_anterior} -> {self.turno_atual}")
+        self.log_partidas.debug("🔄 Alternando turno: %s -> %s", turno_anterior, sala.turno_atual)
         
         # Atualiza estado dos jogadores
-        for jogador in self.jogadores.values():
-            if jogador.cor == self.turno_atual:
+        for jogador in sala.jogadores.values():
+            if jogador.cor == sala.turno_atual:
                 jogador.estado = EstadoJogador.JOGANDO
-                self.logger.info(f"   - {jogador.nome} ({jogador.cor}) agora está JOGANDO")
+                self.log_partidas.debug("   - %s (%s) agora está JOGANDO", jogador.nome, jogador.cor)
             else:
                 jogador.estado = EstadoJogador.AGUARDANDO_TURNO
-                self.logger.info(f"   - {jogador.nome} ({jogador.cor}) está AGUARDANDO_TURNO")
+                self.log_partidas.debug("   - %s (%s) está AGUARDANDO_TURNO", jogador.nome, jogador.cor)
+    
+    def verificar_movimentos_obrigatorios(self, sala: Sala):
+        """Atualiza as capturas obrigatórias do jogador da vez e o avisa, se houver"""
+        sala.movimentos_obrigatorios = sala.indice_capturas.capturas(sala.turno_atual)
+        if not sala.movimentos_obrigatorios:
+            return
+        
+        mensagem = ProtocoloDamas.criar_mensagem_movimento_obrigatorio(sala.movimentos_obrigatorios)
+        mensagem['sala_id'] = sala.id
+        for cliente_socket, jogador in list(sala.jogadores.items()):
+            if jogador.cor == sala.turno_atual:
+                try:
+                    self.enviar_mensagem(cliente_socket, mensagem)
+                except Exception:
+                    self.encerrar_conexao(cliente_socket)
     
-    def verificar_movimentos_obrigatorios(self):
-        """Verifica se há capturas obrigatórias"""
-        # Implementação simplificada - pode ser expandida
-        self.movimentos_obrigatorios = []
-        # TODO: Implementar detecção de capturas obrigatórias
+    def casas_alteradas(self, movimento: Movimento) -> List[Tuple[int, int]]:
+        """Casas cujo conteúdo um lance executado mudou (origem, pousos e peças capturadas)"""
+        casas = [movimento.origem, movimento.destino]
+        casas.extend(movimento.caminho or [])
+        casas.extend(movimento.pecas_capturadas or [])
+        return casas
     
-    def verificar_condicoes_vitoria(self) -> Optional[str]:
-        """Verifica condições de vitória"""
-        if not self.jogo or not self.jogo.tabuleiro:
+    def verificar_condicoes_vitoria(self, sala: Sala) -> Optional[str]:
+        """Verifica condições de vitória (eliminação ou bloqueio do jogador da vez)"""
+        if not sala.partida:
             return None
         
-        pecas_verdes = 0
-        pecas_amarelas = 0
-        
-        # Conta peças restantes
-        for x in range(TAMANHO_TABULEIRO):
-            for y in range(TAMANHO_TABULEIRO):
-                quadrado = self.jogo.tabuleiro.matriz[y][x]
-                if quadrado.ocupante:
-                    if quadrado.ocupante.cor == VERDE:
-                        pecas_verdes += 1
-                    elif quadrado.ocupante.cor == AMARELO:
-                        pecas_amarelas += 1
-        
-        # Verifica vitória por eliminação
-        if pecas_verdes == 0:
-            return AMARELO
-        elif pecas_amarelas == 0:
-            return VERDE
-        
-        return None
+        return sala.partida.verificar_fim_jogo()
     
-    def finalizar_jogo(self, vencedor: str, motivo: str):
+    def finalizar_jogo(self, sala: Sala, vencedor: str, motivo: str):
         """Finaliza o jogo atual"""
-        self.estado_jogo = EstadoJogo.FINALIZADO
-        self.estatisticas['jogos_concluidos'] += 1
+        sala.estado_jogo = EstadoJogo.FINALIZADO
+        sala.invalidar_retratos()
+        with self.lock:
+            self.estatisticas['jogos_concluidos'] += 1
         
-        estado_final = self.obter_estado_tabuleiro()
+        estado_final = self.obter_estado_tabuleiro(sala)
         mensagem_fim = ProtocoloDamas.criar_mensagem_jogo_finalizado(
             vencedor, motivo, estado_final
         )
-        self.broadcast_mensagem(mensagem_fim)
+        self.broadcast_mensagem(sala, mensagem_fim)
         
-        self.logger.info(f"🏆 Jogo finalizado! Vencedor: {vencedor} ({motivo})")
+        self.log_partidas.info("🏆 Jogo finalizado na sala %d! Vencedor: %s (%s)", sala.id, vencedor, motivo)
         
-        # Reset para aguardar novo jogo
-        self.estado_jogo = EstadoJogo.AGUARDANDO_JOGADORES
-        self.jogo = None
+        # Sala é descartada, os espectadores liberados e os jogadores voltam para a fila de pareamento
+        sala.partida = None
+        self.espectadores.encerrar_sala(sala.id)
+        for cliente_socket, jogador in self.salas.encerrar(sala):
+            if cliente_socket in self.jogadores:
+                self.colocar_na_fila(cliente_socket, jogador)
     
-    def obter_estado_tabuleiro(self) -> EstadoTabuleiro:
-        """Obtém estado atual do tabuleiro"""
-        if not self.jogo or not self.jogo.tabuleiro:
+    def obter_estado_tabuleiro(self, sala: Sala) -> EstadoTabuleiro:
+        """
+        Obtém estado atual do tabuleiro (contagens mantidas pelo próprio Tabuleiro)
+        
+        A matriz é montada uma vez por versão e guardada na sala; o resultado
+        é compartilhado entre mensagens e não deve ser alterado.
+        """
+        if not sala.partida or not sala.partida.tabuleiro:
             return EstadoTabuleiro(matriz=[], pecas_verdes=0, pecas_amarelas=0, 
                                  damas_verdes=0, damas_amarelas=0)
         
-        matriz = []
-        pecas_verdes = pecas_amarelas = damas_verdes = damas_amarelas = 0
+        sala.conferir_versao_retratos()
+        if sala.estado_tabuleiro is not None:
+            return sala.estado_tabuleiro
         
+        tabuleiro = sala.partida.tabuleiro
+        matriz = []
         for x in range(TAMANHO_TABULEIRO):
             linha = []
             for y in range(TAMANHO_TABULEIRO):
-                quadrado = self.jogo.tabuleiro.matriz[y][x]
+                quadrado = tabuleiro.matriz[y][x]
                 
                 if quadrado.ocupante:
                     linha.append({
@@ -534,16 +977,6 @@ class ServidorDamasAvancado:
                             'e_dama': quadrado.ocupante.e_dama
                         }
                     })
-                    
-                    # Conta estatísticas
-                    if quadrado.ocupante.cor == VERDE:
-                        pecas_verdes += 1
-                        if quadrado.ocupante.e_dama:
-                            damas_verdes += 1
-                    else:
-                        pecas_amarelas += 1
-                        if quadrado.ocupante.e_dama:
-                            damas_amarelas += 1
                 else:
                     linha.append({
                         'cor_quadrado': quadrado.cor,
@@ -551,68 +984,245 @@ class ServidorDamasAvancado:
                     })
             matriz.append(linha)
         
-        return EstadoTabuleiro(
-            matriz=matriz,
-            pecas_verdes=pecas_verdes,
-            pecas_amarelas=pecas_amarelas,
-            damas_verdes=damas_verdes,
-            damas_amarelas=damas_amarelas
-        )
+        sala.estado_tabuleiro = EstadoTabuleiro(matriz=matriz, **tabuleiro.estatisticas())
+        return sala.estado_tabuleiro
     
     def coordenadas_validas(self, coord: Tuple[int, int]) -> bool:
         """Verifica se coordenadas são válidas"""
         x, y = coord
         return 0 <= x < TAMANHO_TABULEIRO and 0 <= y < TAMANHO_TABULEIRO
     
-    def processar_chat(self, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
-        """Processa mensagem de chat"""
+    def processar_chat(self, sala: Sala, cliente_socket: socket.socket, jogador: Jogador, mensagem: Dict):
+        """Processa mensagem de chat (entregue apenas aos jogadores da sala)"""
         texto = mensagem.get('texto', '').strip()
         if texto:
             mensagem_chat = ProtocoloDamas.criar_mensagem_chat(jogador, texto)
-            self.broadcast_mensagem(mensagem_chat, excluir_socket=cliente_socket)
+            with sala.lock:
+                self.broadcast_mensagem(sala, mensagem_chat, excluir_socket=cliente_socket)
+    
+    def enviar_estado_completo(self, sala: Sala, cliente_socket: socket.socket):
+        """Envia estado completo do jogo da sala (do cache enquanto a versão não muda)"""
+        with sala.lock:
+            self.enviar_dados(cliente_socket, self.retrato_serializado(sala, cliente_socket))
+    
+    def retrato_serializado(self, sala: Sala, cliente_socket) -> bytes:
+        """
+        ESTADO_JOGO da sala no codec do cliente (chamador segura o lock da sala)
+        
+        Serializado uma vez por versão e codec; pedidos repetidos, reconexões
+        e entradas de espectadores reaproveitam os mesmos bytes.
+        """
+        jogador = self.jogadores.get(cliente_socket)
+        binario = jogador is not None and Capacidades.BINARIO in jogador.capacidades
+        
+        sala.conferir_versao_retratos()
+        dados = sala.retratos.get(binario)
+        if dados is None:
+            dados = self.codificar(self.criar_mensagem_estado(sala), binario)
+            sala.retratos[binario] = dados
+            contador = 'retratos_montados'
+        else:
+            contador = 'retratos_reaproveitados'
+        
+        with self.lock:
+            self.estatisticas[contador] += 1
+        return dados
     
-    def enviar_estado_completo(self, cliente_socket: socket.socket):
-        """Envia estado completo do jogo"""
-        estado_tabuleiro = self.obter_estado_tabuleiro()
-        jogadores_lista = list(self.jogadores.values())
+    def criar_mensagem_estado(self, sala: Sala) -> Dict:
+        """ESTADO_JOGO da sala com versão e hash (chamador segura o lock da sala)"""
+        estado_tabuleiro = self.obter_estado_tabuleiro(sala)
+        jogadores_lista = list(sala.jogadores.values())
         
         mensagem_estado = ProtocoloDamas.criar_mensagem_estado_jogo(
-            self.estado_jogo, estado_tabuleiro, self.turno_atual, jogadores_lista
+            sala.estado_jogo, estado_tabuleiro, sala.turno_atual, jogadores_lista
         )
-        self.enviar_mensagem(cliente_socket, mensagem_estado)
+        mensagem_estado['sala_id'] = sala.id
+        self.marcar_versao(sala, mensagem_estado)
+        return mensagem_estado
+    
+    # === ESPECTADORES ===
+    
+    def processar_assistir_partida(self, cliente_socket, jogador: Jogador, sala_id: Optional[int]):
+        """Tira o cliente da fila e o inscreve como espectador da sala pedida (ou de qualquer partida)"""
+        if self.salas.sala_de(cliente_socket) is not None:
+            self.enviar_erro(cliente_socket, CodigosErro.SOMENTE_LEITURA,
+                           "Quem está jogando não pode assistir a outra partida")
+            return
+        
+        sala = self.salas.obter(sala_id) if sala_id is not None else self.salas.qualquer_em_andamento()
+        if sala is None or not self.adicionar_espectador(sala, cliente_socket, jogador):
+            self.enviar_erro(cliente_socket, CodigosErro.SALA_INEXISTENTE,
+                           "Nenhuma partida em andamento com esse identificador")
+    
+    def adicionar_espectador(self, sala: Sala, cliente_socket, jogador: Jogador) -> bool:
+        """
+        Inscreve o espectador; o retrato sai pela mesma fila ordenada dos eventos
+        
+        Returns:
+            False se a partida da sala já acabou
+        """
+        with sala.lock:
+            if sala.estado_jogo != EstadoJogo.EM_ANDAMENTO or self.salas.obter(sala.id) is not sala:
+                return False
+            
+            self.concluir_apresentacao(cliente_socket)
+            self.fila.sair(cliente_socket)
+            self.espectadores.entrar(sala.id, cliente_socket, jogador,
+                                     self.retrato_serializado(sala, cliente_socket))
+        
+        self.log_espectadores.info("👀 %s assistindo à sala %d", jogador.nome, sala.id)
+        return True
     
     def enviar_mensagem(self, cliente_socket: socket.socket, mensagem: Dict):
-        """Envia mensagem para cliente específico"""
+        """
+        Enfileira mensagem para cliente específico, no codec negociado por ele
+        
+        Não bloqueia: a escrita é feita pelo escritor da conexão. Se a fila de
+        saída estiver cheia, mensagens descartáveis são perdidas e as demais
+        derrubam a conexão (FilaSaidaCheia).
+        """
+        jogador = self.jogadores.get(cliente_socket)
+        binario = jogador is not None and Capacidades.BINARIO in jogador.capacidades
+        self.enviar_dados(cliente_socket, self.codificar(mensagem, binario),
+                          mensagem.get('tipo') in TIPOS_DESCARTAVEIS)
+        self.logger.debug("✅ Mensagem enviada com sucesso: %s", mensagem.get('tipo'))
+    
+    def codificar(self, mensagem: Dict, binario: bool) -> bytes:
+        """Serializa a mensagem em JSON por linha ou no codec binário"""
+        if binario:
+            return codec_binario.codificar(mensagem)
+        return (json.dumps(mensagem, ensure_ascii=False) + '\n').encode('utf-8')
+    
+    def codificar_jogo_iniciado(self, mensagem: Dict, binario: bool) -> bytes:
+        """
+        Serializa o JOGO_INICIADO da posição inicial reaproveitando o prefixo do processo
+        
+        De uma partida para outra a mensagem só muda no sala_id, último campo
+        nos dois codecs: o restante é serializado na primeira partida e o
+        sala_id é emendado no fim, com os mesmos bytes que codificar() daria.
+        """
+        sufixo = (SUFIXO_SALA_BINARIO if binario else SUFIXO_SALA_JSON) % mensagem['sala_id']
+        prefixo = self.prefixos_jogo_iniciado.get(binario)
+        if prefixo is None:
+            dados = self.codificar(mensagem, binario)
+            conteudo = dados[codec_binario.CABECALHO_QUADRO.size:] if binario else dados
+            if not conteudo.endswith(sufixo):
+                return dados  # Layout inesperado: serializa sem reaproveitar
+            prefixo = conteudo[:-len(sufixo)]
+            self.prefixos_jogo_iniciado[binario] = prefixo
+        
+        conteudo = prefixo + sufixo
+        if binario:
+            return codec_binario.CABECALHO_QUADRO.pack(codec_binario.MARCADOR_BINARIO, len(conteudo)) + conteudo
+        return conteudo
+    
+    def enviar_dados(self, cliente_socket: socket.socket, dados: bytes, descartavel: bool = False):
+        """Enfileira bytes já serializados na conexão do cliente"""
         try:
-            dados = json.dumps(mensagem, ensure_ascii=False) + '\n'
-            cliente_socket.send(dados.encode('utf-8'))
-            self.logger.debug(f"✅ Mensagem enviada com sucesso: {mensagem.get('tipo')}")
+            cliente_socket.enfileirar(dados, descartavel)
+        except FilaSaidaCheia:
+            with self.lock:
+                self.estatisticas['desconexoes_fila_cheia'] += 1
+            self.logger.warning("🐢 Cliente %s não acompanha as mensagens; conexão derrubada",
+                                cliente_socket.endereco)
+            raise
         except Exception as e:
-            self.logger.error(f"❌ Erro ao enviar mensagem: {e}")
+            self.logger.error("❌ Erro ao enviar mensagem: %s", e)
             raise
     
-    def broadcast_mensagem(self, mensagem: Dict, excluir_socket: socket.socket = None):
-        """Envia mensagem para todos os clientes"""
-        sockets_para_remover = []
+    def marcar_versao(self, sala: Sala, mensagem: Dict):
+        """Acrescenta versão e hash da posição, usados pelos clientes para validar deltas"""
+        if sala.partida:
+            mensagem['versao'] = sala.versao
+            mensagem['hash'] = formatar_hash(sala.partida.tabuleiro.hash_posicao)
+    
+    def broadcast_mensagem(self, sala: Sala, mensagem: Dict, excluir_socket: socket.socket = None,
+                           mensagem_delta: Optional[Dict] = None,
+                           codificar: Optional[Callable[[Dict, bool], bytes]] = None):
+        """
+        Envia mensagem para todos os clientes da sala
+        
+        Se mensagem_delta for informada, ela substitui a mensagem para os
+        jogadores que anunciaram Capacidades.DELTA. Cada variante é
+        serializada uma única vez por codec e os mesmos bytes (imutáveis)
+        são enfileirados para todos os destinatários e sinks; a mensagem
+        não deve ser alterada depois do broadcast. codificar substitui
+        self.codificar (mensagens com serialização pré-calculada).
+        """
+        codificar = codificar or self.codificar
+        mensagem['sala_id'] = sala.id
+        if mensagem_delta is not None:
+            mensagem_delta['sala_id'] = sala.id
+        descartavel = mensagem.get('tipo') in TIPOS_DESCARTAVEIS
+        
+        self.log_broadcast.debug("📡 Fazendo broadcast da mensagem tipo: %s (sala %d, %d jogadores conectados)",
+                                 mensagem.get('tipo'), sala.id, len(sala.jogadores))
         
-        self.logger.info(f"📡 Fazendo broadcast da mensagem tipo: {mensagem.get('tipo')}")
-        self.logger.info(f"   - Jogadores conectados: {len(self.jogadores)}")
+        # (usa_delta, binario) -> (bytes, segundos gastos serializando)
+        serializadas: Dict[Tuple[bool, bool], Tuple[bytes, float]] = {}
+        codificacoes = reaproveitadas = bytes_reaproveitados = 0
+        tempo_economizado = 0.0
         
-        for cliente_socket in list(self.jogadores.keys()):
+        def serializada(usa_delta: bool, binario: bool) -> bytes:
+            nonlocal codificacoes, reaproveitadas, bytes_reaproveitados, tempo_economizado
+            chave = (usa_delta, binario)
+            if chave in serializadas:
+                dados, duracao = serializadas[chave]
+                reaproveitadas += 1
+                bytes_reaproveitados += len(dados)
+                tempo_economizado += duracao
+                return dados
+            
+            inicio = time.perf_counter()
+            dados = codificar(mensagem_delta if usa_delta else mensagem, binario)
+            serializadas[chave] = (dados, time.perf_counter() - inicio)
+            codificacoes += 1
+            return dados
+        
+        for cliente_socket, jogador in list(sala.jogadores.items()):
             if cliente_socket != excluir_socket:
                 try:
-                    jogador = self.jogadores[cliente_socket]
-                    self.logger.info(f"   - Enviando para {jogador.nome} ({jogador.cor})")
-                    self.enviar_mensagem(cliente_socket, mensagem)
+                    self.log_broadcast.debug("   - Enviando para %s (%s)", jogador.nome, jogador.cor)
+                    usa_delta = mensagem_delta is not None and Capacidades.DELTA in jogador.capacidades
+                    binario = Capacidades.BINARIO in jogador.capacidades
+                    self.enviar_dados(cliente_socket, serializada(usa_delta, binario), descartavel)
                 except Exception as e:
-                    self.logger.error(f"   - Erro ao enviar para cliente: {e}")
-                    sockets_para_remover.append(cliente_socket)
+                    self.log_broadcast.error("   - Erro ao enviar para cliente: %s", e)
+                    # A leitura do cliente detecta o encerramento e faz a desconexão
+                    self.encerrar_conexao(cliente_socket)
+        
+        for sink in self.sinks_broadcast:
+            try:
+                sink(sala.id, serializada(False, False))
+            except Exception as e:
+                self.log_broadcast.error("Erro no sink de broadcast: %s", e)
         
-        # Remove sockets com falha
-        for socket_falho in sockets_para_remover:
-            if socket_falho in self.jogadores:
-                jogador = self.jogadores[socket_falho]
-                self.desconectar_jogador(socket_falho, jogador)
+        if mensagem.get('tipo') in TIPOS_ESPECTADOR:
+            self.espectadores.publicar(sala.id, mensagem, mensagem_delta,
+                                       {chave: dados for chave, (dados, _) in serializadas.items()}, descartavel)
+        
+        with self.lock:
+            self.estatisticas['broadcast_codificacoes'] += codificacoes
+            self.estatisticas['broadcast_reaproveitadas'] += reaproveitadas
+            self.estatisticas['broadcast_bytes_reaproveitados'] += bytes_reaproveitados
+            self.estatisticas['broadcast_tempo_economizado'] += tempo_economizado
+    
+    def adicionar_sink_broadcast(self, sink: Callable[[int, bytes], None]):
+        """
+        Registra um destino extra para todos os broadcasts
+        
+        O sink recebe (sala_id, linha JSON serializada) com os mesmos bytes
+        enviados aos jogadores em JSON; é chamado com o lock da sala em mãos
+        e não deve bloquear.
+        """
+        self.sinks_broadcast.append(sink)
+    
+    def encerrar_conexao(self, cliente_socket: socket.socket):
+        """Interrompe a conexão sem tomar locks (usado com o lock da sala em mãos)"""
+        try:
+            cliente_socket.shutdown(socket.SHUT_RDWR)
+        except:
+            pass
     
     def enviar_erro(self, cliente_socket: socket.socket, codigo: str, descricao: str):
         """Envia mensagem de erro para cliente"""
@@ -620,35 +1230,19 @@ class ServidorDamasAvancado:
         self.enviar_mensagem(cliente_socket, mensagem_erro)
     
     def desconectar_jogador(self, cliente_socket: socket.socket, jogador: Jogador):
-        """Remove jogador do servidor"""
+        """Remove jogador do servidor, da fila e da sua sala"""
         with self.lock:
-            if cliente_socket in self.jogadores:
-                del self.jogadores[cliente_socket]
-                
-                self.logger.info(f"❌ {jogador.nome} desconectado")
-                
-                # Notifica outros jogadores
-                if self.jogadores:
-                    mensagem_notif = ProtocoloDamas.criar_mensagem_notificacao(
-                        f"{jogador.nome} desconectou", "warning"
-                    )
-                    self.broadcast_mensagem(mensagem_notif)
-                
-                # Interrompe jogo se estava ativo
-                if self.estado_jogo == EstadoJogo.EM_ANDAMENTO:
-                    mensagem_interrupcao = {
-                        'tipo': TipoMensagem.JOGO_INTERROMPIDO.value,
-                        'motivo': 'Jogador desconectou',
-                        'mensagem': 'Jogo interrompido - jogador desconectou'
-                    }
-                    self.broadcast_mensagem(mensagem_interrupcao)
-                    self.estado_jogo = EstadoJogo.INTERROMPIDO
-                
-                # Reset se não há jogadores
-                if not self.jogadores:
-                    self.estado_jogo = EstadoJogo.AGUARDANDO_JOGADORES
-                    self.jogo = None
-                    self.proximo_id = 1
+            conectado = self.jogadores.pop(cliente_socket, None) is not None
+            self.apresentacoes_pendentes.pop(cliente_socket, None)
+        
+        if conectado:
+            self.logger.info("❌ %s desconectado", jogador.nome)
+            
+            self.fila.sair(cliente_socket)
+            self.espectadores.sair(cliente_socket)
+            sala = self.salas.sala_de(cliente_socket)
+            if sala is not None:
+                self.interromper_sala(sala, cliente_socket, jogador)
         
         try:
             cliente_socket.close()
@@ -660,39 +1254,101 @@ class ServidorDamasAvancado:
         self.logger.info("🛑 Parando servidor...")
         self.rodando = False
         
-        # Notifica clientes
-        if self.jogadores:
-            mensagem_encerramento = {
-                'tipo': TipoMensagem.SERVIDOR_ENCERRANDO.value,
-                'mensagem': 'Servidor encerrando'
-            }
-            self.broadcast_mensagem(mensagem_encerramento)
+        # Notifica clientes de todas as salas
+        mensagem_encerramento = {
+            'tipo': TipoMensagem.SERVIDOR_ENCERRANDO.value,
+            'mensagem': 'Servidor encerrando'
+        }
+        for cliente_socket in list(self.jogadores):
+            try:
+                self.enviar_mensagem(cliente_socket, mensagem_encerramento)
+            except Exception:
+                pass
         
         # Fecha conexões
         for cliente_socket, jogador in list(self.jogadores.items()):
             self.desconectar_jogador(cliente_socket, jogador)
+        self.espectadores.parar()
         
         if self.socket_servidor:
             self.socket_servidor.close()
+        if self.servidor_async:
+            self.servidor_async.close()
+            self.servidor_async = None
+        if self.tarefa_manutencao:
+            self.tarefa_manutencao.cancel()
+            self.tarefa_manutencao = None
         
+        estatisticas = self.obter_estatisticas()
         self.logger.info("✅ Servidor encerrado")
-        self.logger.info(f"📊 Estatísticas: {self.estatisticas['jogos_concluidos']} jogos, "
-                        f"{self.estatisticas['conexoes_totais']} conexões")
+        self.logger.info("📊 Estatísticas: %d jogos, %d conexões, %d pares formados "
+                         "(espera p50 %.1fs, p99 %.1fs)",
+                         estatisticas['jogos_concluidos'], estatisticas['conexoes_totais'],
+                         estatisticas['fila']['pares_formados'],
+                         estatisticas['fila']['espera']['p50'], estatisticas['fila']['espera']['p99'])
+        self.logger.info("📦 Broadcast: %d serializações, %d envios reaproveitados (%d bytes, %.1f ms economizados)",
+                         estatisticas['broadcast_codificacoes'], estatisticas['broadcast_reaproveitadas'],
+                         estatisticas['broadcast_bytes_reaproveitados'],
+                         estatisticas['broadcast_tempo_economizado'] * 1000)
+        self.logger.info("🗂️ Retratos do estado: %d montados, %d reaproveitados",
+                         estatisticas['retratos_montados'], estatisticas['retratos_reaproveitados'])
+        self.logger.info("👀 Espectadores: %d mensagens em %d envios (distribuição p50 %.1f ms, p99 %.1f ms)",
+                         estatisticas['espectadores']['mensagens_distribuidas'],
+                         estatisticas['espectadores']['envios'],
+                         estatisticas['espectadores']['latencia']['p50'] * 1000,
+                         estatisticas['espectadores']['latencia']['p99'] * 1000)
 
 
 def main():
     """Função principal do servidor"""
+    parser = argparse.ArgumentParser(description="Servidor Damas Online")
+    parser.add_argument('--host', help="Endereço de escuta (pergunta se omitido)")
+    parser.add_argument('--porta', type=int, help="Porta TCP (pergunta se omitida)")
+    parser.add_argument('--modo', choices=['threads', 'async'], default='threads',
+                        help="threads: uma thread por cliente; async: laço asyncio")
+    parser.add_argument('--max-salas', type=int, default=1000,
+                        help="Partidas simultâneas permitidas por processo (padrão: 1000)")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="Processos servidores na mesma porta via SO_REUSEPORT; "
+                             "o pareamento ocorre dentro de cada processo (padrão: 1)")
+    parser.add_argument('--log', action='append', default=[], metavar='SUBSISTEMA=NIVEL',
+                        help="Nível de log de um subsistema (%s), por exemplo partidas=DEBUG; "
+                             "pode ser repetido" % ', '.join(SUBSISTEMAS))
+    argumentos = parser.parse_args()
+    try:
+        niveis_log = interpretar_niveis(argumentos.log)
+    except ValueError as e:
+        parser.error(str(e))
+    
     print("🎮 Servidor Damas Online")
     print("=" * 30)
     
-    host = input("Host (Enter para 0.0.0.0 - aceita qualquer IP): ").strip() or '0.0.0.0'
-    porta_input = input("Porta (Enter para 12345): ").strip()
-    porta = int(porta_input) if porta_input else 12345
+    host = argumentos.host
+    if host is None:
+        host = input("Host (Enter para 0.0.0.0 - aceita qualquer IP): ").strip() or '0.0.0.0'
+    porta = argumentos.porta
+    if porta is None:
+        porta_input = input("Porta (Enter para 12345): ").strip()
+        porta = int(porta_input) if porta_input else 12345
     
-    servidor = ServidorDamasAvancado(host, porta)
+    if argumentos.processos > 1:
+        from supervisor import SupervisorServidor, reuseport_disponivel
+        
+        if reuseport_disponivel():
+            configurar_logging(niveis_log)
+            SupervisorServidor(host, porta, argumentos.processos,
+                               argumentos.modo, argumentos.max_salas, niveis_log).executar()
+            return
+        print("⚠️ SO_REUSEPORT indisponível nesta plataforma; usando um único processo")
+    
+    configurar_logging(niveis_log)
+    servidor = ServidorDamasAvancado(host, porta, argumentos.max_salas)
     
     try:
-        servidor.iniciar_servidor()
+        if argumentos.modo == 'async':
+            asyncio.run(servidor.iniciar_servidor_async())
+        else:
+            servidor.iniciar_servidor()
     except KeyboardInterrupt:
         print("\n🛑 Interrupção pelo usuário")
     except Exception as e:
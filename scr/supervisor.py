@@ -0,0 +1,256 @@
+"""
+Supervisor multiprocesso do servidor de damas
+
+Inicia N processos trabalhadores que escutam a mesma porta com SO_REUSEPORT
+(o kernel distribui as conexões aceitas entre eles). Cada trabalhador é um
+ServidorDamasAvancado completo, com salas e fila de pareamento próprias:
+jogadores só são pareados com outros do mesmo processo. O supervisor
+reinicia trabalhadores que morrem e agrega as estatísticas que eles
+publicam periodicamente.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+from registro import configurar_logging, encerrar_logging, obter_logger
+from servidor_avancado import ServidorDamasAvancado
+
+
+INTERVALO_PUBLICACAO = 5.0   # Segundos entre envios de estatísticas de cada trabalhador
+INTERVALO_RELATORIO = 30.0   # Segundos entre relatórios agregados do supervisor
+ESPERA_REINICIO = 1.0        # Vida mínima antes de reiniciar (evita laço de falhas)
+
+# Campos somados entre trabalhadores; os acumulados sobrevivem a reinícios
+CAMPOS_ACUMULADOS = ('conexoes_totais', 'jogos_concluidos', 'desconexoes_fila_cheia',
+                     'broadcast_codificacoes', 'broadcast_reaproveitadas',
+                     'broadcast_bytes_reaproveitados', 'broadcast_tempo_economizado',
+                     'retratos_montados', 'retratos_reaproveitados')
+CAMPOS_INSTANTANEOS = ('jogadores_conectados', 'salas_ativas', 'partidas_em_andamento',
+                       'espectadores_conectados')
+
+
+def reuseport_disponivel() -> bool:
+    """Verifica se a plataforma oferece SO_REUSEPORT"""
+    return hasattr(socket, 'SO_REUSEPORT')
+
+
+def _interromper(signum, frame):
+    """Converte SIGTERM em encerramento gracioso (supervisor e trabalhadores)"""
+    raise KeyboardInterrupt
+
+
+def _publicar_estatisticas(servidor, indice, fila_estatisticas):
+    """Thread do trabalhador que envia obter_estatisticas() ao supervisor"""
+    while servidor.rodando:
+        time.sleep(INTERVALO_PUBLICACAO)
+        try:
+            fila_estatisticas.put((indice, os.getpid(), servidor.obter_estatisticas()))
+        except Exception:
+            break
+
+
+def _executar_trabalhador(indice, host, porta, modo, max_salas, fila_estatisticas, niveis_log):
+    """Processo trabalhador: um servidor completo escutando a porta compartilhada"""
+    signal.signal(signal.SIGTERM, _interromper)
+    configurar_logging(niveis_log)  # Thread de escrita própria do processo
+    
+    servidor = ServidorDamasAvancado(host, porta, max_salas, reutilizar_porta=True)
+    threading.Thread(
+        target=_publicar_estatisticas,
+        args=(servidor, indice, fila_estatisticas),
+        daemon=True
+    ).start()
+    
+    # Os dois modos já chamam parar_servidor() ao sair
+    try:
+        if modo == 'async':
+            asyncio.run(servidor.iniciar_servidor_async())
+        else:
+            servidor.iniciar_servidor()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Processos do multiprocessing não rodam atexit: grava o que ficou na fila
+        encerrar_logging()
+
+
+class SupervisorServidor:
+    """Mantém N trabalhadores vivos na mesma porta e agrega suas estatísticas"""
+    
+    def __init__(self, host='0.0.0.0', porta=12345, processos=None, modo='threads', max_salas=1000,
+                 niveis_log: Optional[Dict[str, str]] = None):
+        """
+        Configura o supervisor
+        
+        Args:
+            host: Endereço de escuta compartilhado
+            porta: Porta TCP compartilhada (SO_REUSEPORT)
+            processos: Número de trabalhadores (padrão: número de CPUs)
+            modo: 'threads' ou 'async', repassado a cada trabalhador
+            max_salas: Limite de partidas por trabalhador
+            niveis_log: Nível de log por subsistema, repassado a cada trabalhador
+        """
+        self.host = host
+        self.porta = porta
+        self.processos = processos or os.cpu_count() or 1
+        self.modo = modo
+        self.max_salas = max_salas
+        self.niveis_log = niveis_log or {}
+        
+        self.trabalhadores: Dict[int, multiprocessing.Process] = {}
+        self.iniciado_em: Dict[int, float] = {}
+        self.fila_estatisticas = multiprocessing.Queue()
+        
+        # Últimas estatísticas por trabalhador e totais de trabalhadores que já morreram
+        self.estatisticas_trabalhadores: Dict[int, Dict] = {}
+        self.acumulado_encerrados = {campo: 0 for campo in CAMPOS_ACUMULADOS}
+        self.pares_encerrados = 0
+        self.reinicios = 0
+        
+        self.rodando = True
+        self.logger = obter_logger('supervisor')
+    
+    def iniciar_trabalhador(self, indice: int):
+        """Cria (ou recria) o processo trabalhador de um índice"""
+        processo = multiprocessing.Process(
+            target=_executar_trabalhador,
+            args=(indice, self.host, self.porta, self.modo, self.max_salas, self.fila_estatisticas,
+                  self.niveis_log),
+            name=f"Trabalhador-{indice}",
+            daemon=False
+        )
+        processo.start()
+        self.trabalhadores[indice] = processo
+        self.iniciado_em[indice] = time.time()
+        self.logger.info("🚀 Trabalhador %d iniciado (pid %d)", indice, processo.pid)
+    
+    def executar(self):
+        """Inicia os trabalhadores e supervisiona até Ctrl+C ou SIGTERM"""
+        # kill/docker stop/systemd: sem isto o supervisor morreria sem parar os trabalhadores
+        signal.signal(signal.SIGTERM, _interromper)
+        self.logger.info("🧭 Supervisor: %d trabalhadores em %s:%s (modo %s, SO_REUSEPORT)",
+                         self.processos, self.host, self.porta, self.modo)
+        for indice in range(1, self.processos + 1):
+            self.iniciar_trabalhador(indice)
+        
+        proximo_relatorio = time.time() + INTERVALO_RELATORIO
+        try:
+            while self.rodando:
+                self._coletar_estatisticas(timeout=1.0)
+                self._verificar_trabalhadores()
+                
+                if time.time() >= proximo_relatorio:
+                    self.registrar_relatorio()
+                    proximo_relatorio += INTERVALO_RELATORIO
+        except KeyboardInterrupt:
+            self.logger.info("🛑 Interrupção pelo usuário ou SIGTERM")
+        finally:
+            self.parar()
+    
+    def _coletar_estatisticas(self, timeout: float):
+        """Recebe as estatísticas publicadas pelos trabalhadores"""
+        try:
+            indice, pid, estatisticas = self.fila_estatisticas.get(timeout=timeout)
+        except queue.Empty:
+            return
+        
+        while True:
+            processo = self.trabalhadores.get(indice)
+            # Ignora publicações atrasadas de um processo já substituído
+            if processo is not None and processo.pid == pid:
+                self.estatisticas_trabalhadores[indice] = estatisticas
+            try:
+                indice, pid, estatisticas = self.fila_estatisticas.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _verificar_trabalhadores(self):
+        """Reinicia trabalhadores que terminaram"""
+        for indice, processo in list(self.trabalhadores.items()):
+            if processo.is_alive():
+                continue
+            if time.time() - self.iniciado_em[indice] < ESPERA_REINICIO:
+                continue
+            
+            self.logger.warning("⚠️ Trabalhador %d (pid %d) terminou com código %s; reiniciando",
+                                indice, processo.pid, processo.exitcode)
+            
+            self._arquivar_trabalhador(indice)
+            self.reinicios += 1
+            self.iniciar_trabalhador(indice)
+    
+    def _arquivar_trabalhador(self, indice: int):
+        """Preserva os contadores acumulados de um processo que terminou"""
+        ultimas = self.estatisticas_trabalhadores.pop(indice, None)
+        if ultimas:
+            for campo in CAMPOS_ACUMULADOS:
+                self.acumulado_encerrados[campo] += ultimas.get(campo, 0)
+            self.pares_encerrados += ultimas.get('fila', {}).get('pares_formados', 0)
+    
+    def agregar_estatisticas(self) -> Dict:
+        """
+        Soma as estatísticas dos trabalhadores
+        
+        Percentis de espera não podem ser combinados exatamente; o agregado
+        usa o maior valor entre os trabalhadores (limite superior).
+        """
+        agregado = dict(self.acumulado_encerrados)
+        agregado.update({campo: 0 for campo in CAMPOS_INSTANTANEOS})
+        fila = {
+            'profundidade': 0,
+            'pares_formados': self.pares_encerrados,
+            'espera_atual_maxima': 0.0,
+            'espera': {'p50': 0.0, 'p90': 0.0, 'p99': 0.0},
+        }
+        
+        for estatisticas in self.estatisticas_trabalhadores.values():
+            for campo in CAMPOS_ACUMULADOS + CAMPOS_INSTANTANEOS:
+                agregado[campo] += estatisticas.get(campo, 0)
+            
+            fila_trabalhador = estatisticas.get('fila', {})
+            fila['profundidade'] += fila_trabalhador.get('profundidade', 0)
+            fila['pares_formados'] += fila_trabalhador.get('pares_formados', 0)
+            fila['espera_atual_maxima'] = max(fila['espera_atual_maxima'],
+                                              fila_trabalhador.get('espera_atual_maxima', 0.0))
+            for percentil, valor in fila_trabalhador.get('espera', {}).items():
+                fila['espera'][percentil] = max(fila['espera'].get(percentil, 0.0), valor)
+        
+        agregado['fila'] = fila
+        agregado['trabalhadores_ativos'] = sum(1 for p in self.trabalhadores.values() if p.is_alive())
+        agregado['reinicios'] = self.reinicios
+        return agregado
+    
+    def registrar_relatorio(self):
+        """Registra no log o resumo agregado de todos os trabalhadores"""
+        total = self.agregar_estatisticas()
+        self.logger.info("📊 %d/%d trabalhadores, %d jogadores, %d partidas, %d espectadores, "
+                         "%d na fila, %d jogos concluídos, %d reinícios",
+                         total['trabalhadores_ativos'], self.processos, total['jogadores_conectados'],
+                         total['partidas_em_andamento'], total['espectadores_conectados'],
+                         total['fila']['profundidade'], total['jogos_concluidos'], total['reinicios'])
+    
+    def parar(self):
+        """Encerra os trabalhadores graciosamente (SIGTERM) e aguarda"""
+        self.rodando = False
+        for processo in self.trabalhadores.values():
+            if processo.is_alive():
+                processo.terminate()
+        
+        for processo in self.trabalhadores.values():
+            processo.join(timeout=5)
+            if processo.is_alive():
+                processo.kill()
+                processo.join()
+        
+        self._coletar_estatisticas(timeout=0.1)
+        for indice in list(self.estatisticas_trabalhadores):
+            self._arquivar_trabalhador(indice)
+        self.registrar_relatorio()
+        self.logger.info("✅ Supervisor encerrado")
@@ -0,0 +1,104 @@
+"""
+Tabelas de movimento pré-calculadas para o tabuleiro de damas
+
+Construídas uma única vez na importação: para cada casa jogável guardam os
+vizinhos diagonais, os pares (casa pulada, destino) de cada tipo de peça e
+as casas afetadas por mudanças em cada casa, evitando recalcular direções
+a cada consulta de movimento.
+"""
+
+from constantes import *
+
+
+# Tipo de peça usado como chave das tabelas (cores para peças comuns)
+REI = "rei"
+
+# Deslocamento (dx, dy) de cada direção diagonal
+DELTAS = {
+    NOROESTE: (-1, -1),  # Para cima e esquerda
+    NORDESTE: (1, -1),   # Para cima e direita
+    SUDOESTE: (-1, 1),   # Para baixo e esquerda
+    SUDESTE: (1, 1),     # Para baixo e direita
+}
+
+# Direções permitidas por tipo de peça
+DIRECOES_POR_TIPO = {
+    VERDE: (NOROESTE, NORDESTE),    # Verdes avançam para cima (Y diminui)
+    AMARELO: (SUDOESTE, SUDESTE),   # Amarelas avançam para baixo (Y aumenta)
+    REI: (NOROESTE, NORDESTE, SUDOESTE, SUDESTE),
+}
+
+
+def _no_tabuleiro(x, y):
+    """Verifica se as coordenadas estão dentro do tabuleiro"""
+    return 0 <= x < TAMANHO_TABULEIRO and 0 <= y < TAMANHO_TABULEIRO
+
+
+def _construir_tabelas():
+    """Gera as tabelas de casas jogáveis, vizinhança e pulos"""
+    casas = tuple(
+        (x, y)
+        for y in range(TAMANHO_TABULEIRO)
+        for x in range(TAMANHO_TABULEIRO)
+        if (x + y) % 2 == 0
+    )
+    
+    vizinhanca = {tipo: {} for tipo in DIRECOES_POR_TIPO}
+    pulos = {tipo: {} for tipo in DIRECOES_POR_TIPO}
+    
+    for x, y in casas:
+        for tipo, direcoes in DIRECOES_POR_TIPO.items():
+            vizinhos_casa = []
+            pulos_casa = []
+            for direcao in direcoes:
+                dx, dy = DELTAS[direcao]
+                if not _no_tabuleiro(x + dx, y + dy):
+                    continue
+                
+                vizinho = (x + dx, y + dy)
+                destino = (x + 2 * dx, y + 2 * dy)
+                if _no_tabuleiro(*destino):
+                    pulos_casa.append((vizinho, destino))
+                else:
+                    destino = None
+                vizinhos_casa.append((vizinho, destino))
+            
+            vizinhanca[tipo][(x, y)] = tuple(vizinhos_casa)
+            pulos[tipo][(x, y)] = tuple(pulos_casa)
+    
+    return casas, vizinhanca, pulos
+
+
+# Casas escuras (as únicas ocupadas por peças), em ordem de leitura
+# VIZINHANCA[tipo][casa] -> ((vizinho, destino_do_pulo ou None), ...)
+# PULOS[tipo][casa] -> ((casa_pulada, destino), ...) apenas dentro do tabuleiro
+CASAS_JOGAVEIS, VIZINHANCA, PULOS = _construir_tabelas()
+
+# PASSOS[tipo][casa] -> vizinhos diagonais válidos para o tipo de peça
+PASSOS = {
+    tipo: {casa: tuple(vizinho for vizinho, _ in vizinhos) for casa, vizinhos in tabela.items()}
+    for tipo, tabela in VIZINHANCA.items()
+}
+
+
+def _construir_raio_captura():
+    """Para cada casa, as casas jogáveis a até duas diagonais de distância (incluindo ela)"""
+    raio = {}
+    for x, y in CASAS_JOGAVEIS:
+        casas = [(x, y)]
+        for dx, dy in DELTAS.values():
+            for distancia in (1, 2):
+                if _no_tabuleiro(x + distancia * dx, y + distancia * dy):
+                    casas.append((x + distancia * dx, y + distancia * dy))
+        raio[(x, y)] = tuple(casas)
+    return raio
+
+
+# RAIO_CAPTURA[casa] -> casas cujas capturas podem mudar quando o conteúdo da casa muda
+# (um salto depende da casa da peça, da casa pulada e do destino)
+RAIO_CAPTURA = _construir_raio_captura()
+
+
+def tipo_peca(peca):
+    """Retorna a chave das tabelas correspondente à peça"""
+    return REI if peca.rei else peca.cor
@@ -2,49 +2,134 @@
 Classe Tabuleiro - Representa o tabuleiro do jogo de damas
 """
 
+from typing import NamedTuple, Optional, Tuple
+
 from constantes import *
 from peca import Peca
 from quadrado import Quadrado
+from tabelas_movimento import CASAS_JOGAVEIS, DELTAS, PASSOS, PULOS, VIZINHANCA, REI, tipo_peca
+from zobrist import CHAVE_VEZ_AMARELO, calcular_hash, chave_peca
+
+
+class RegistroMovimento(NamedTuple):
+    """Registro compacto para desfazer um movimento feito com fazer_movimento"""
+    origem: Tuple[int, int]
+    destino: Tuple[int, int]
+    capturada_em: Optional[Tuple[int, int]]  # Posição da peça capturada (ou None)
+    capturada: Optional[Peca]                # Peça removida na captura (ou None)
+    promoveu: bool                           # Se o movimento coroou a peça
+
+
+def _construir_modelo_inicial():
+    """Cor de cada quadrado e cor da peça inicial (ou None), linha a linha"""
+    modelo = []
+    for y in range(TAMANHO_TABULEIRO):
+        linha = []
+        for x in range(TAMANHO_TABULEIRO):
+            if (x + y) % 2 != 0:
+                linha.append((BRANCO, None))
+            elif y < 3:
+                linha.append((PRETO, AMARELO))  # AMARELAS nas 3 primeiras linhas (topo - Y=0,1,2)
+            elif y >= TAMANHO_TABULEIRO - 3:
+                linha.append((PRETO, VERDE))    # VERDES nas 3 últimas linhas (fundo - Y=5,6,7)
+            else:
+                linha.append((PRETO, None))
+        modelo.append(tuple(linha))
+    return tuple(modelo)
+
+
+# Posição inicial montada uma vez na importação; cada Tabuleiro novo só a copia
+MODELO_INICIAL = _construir_modelo_inicial()
+OCUPADAS_INICIAIS = {
+    cor: frozenset((x, y) for y, linha in enumerate(MODELO_INICIAL)
+                   for x, (_, cor_peca) in enumerate(linha) if cor_peca == cor)
+    for cor in (VERDE, AMARELO)
+}
+HASH_INICIAL = calcular_hash(
+    [(casa, cor, False) for cor, casas in OCUPADAS_INICIAIS.items() for casa in casas], VERDE
+)
 
 
 class Tabuleiro:
     """Gerencia o tabuleiro de damas e suas operações"""
     
-    def __init__(self):
-        """Inicializa o tabuleiro com a configuração inicial"""
-        self.matriz = self._criar_tabuleiro()
-    
-    def _criar_tabuleiro(self):
-        """Cria um novo tabuleiro com as peças na posição inicial"""
-        matriz = [[None] * TAMANHO_TABULEIRO for _ in range(TAMANHO_TABULEIRO)]
+    def __init__(self, matriz=None):
+        """
+        Inicializa o tabuleiro
         
-        for x in range(TAMANHO_TABULEIRO):
-            for y in range(TAMANHO_TABULEIRO):
-                if (x % 2 != 0) and (y % 2 == 0):
-                    matriz[y][x] = Quadrado(BRANCO)
-                elif (x % 2 != 0) and (y % 2 != 0):
-                    matriz[y][x] = Quadrado(PRETO)
-                elif (x % 2 == 0) and (y % 2 != 0):
-                    matriz[y][x] = Quadrado(BRANCO)
-                elif (x % 2 == 0) and (y % 2 == 0):
-                    matriz[y][x] = Quadrado(PRETO)
-        
-        self._colocar_pecas_iniciais(matriz)
-        return matriz
+        Args:
+            matriz: Matriz [y][x] de Quadrado já montada (adotada sem cópia); sem ela,
+                a configuração inicial (cópia de MODELO_INICIAL)
+        """
+        self.pilha_desfazer = []  # Registros de fazer_movimento, do mais antigo ao mais recente
+        
+        # Hash de Zobrist mantido incrementalmente (peças + vez de jogar)
+        self.vez = VERDE
+        
+        # Casas ocupadas e damas por cor, mantidas a cada colocação, remoção e coroação
+        self.damas = {VERDE: 0, AMARELO: 0}
+        
+        if matriz is None:
+            self.matriz = self._criar_tabuleiro()
+            self._hash = HASH_INICIAL
+            self.ocupadas = {cor: set(casas) for cor, casas in OCUPADAS_INICIAIS.items()}
+        else:
+            self.matriz = matriz
+            self.ocupadas = {VERDE: set(), AMARELO: set()}
+            self.recalcular_contagens()
+            self.recalcular_hash()
+    
+    @property
+    def hash_posicao(self):
+        """Hash de 64 bits que identifica a posição e a vez de jogar"""
+        return self._hash
     
-    def _colocar_pecas_iniciais(self, matriz):
-        """Coloca as peças na posição inicial do jogo"""
-        # AMARELAS nas 3 primeiras linhas (topo - Y=0,1,2)
-        for y in range(3):
-            for x in range(TAMANHO_TABULEIRO):
-                if matriz[y][x].cor == PRETO:
-                    matriz[y][x].colocar_peca(Peca(AMARELO))
-        
-        # VERDES nas 3 últimas linhas (fundo - Y=5,6,7)
-        for y in range(5, TAMANHO_TABULEIRO):
-            for x in range(TAMANHO_TABULEIRO):
-                if matriz[y][x].cor == PRETO:
-                    matriz[y][x].colocar_peca(Peca(VERDE))
+    def recalcular_hash(self):
+        """Recalcula o hash varrendo o tabuleiro (após alterar a matriz diretamente)"""
+        pecas = []
+        for coordenadas in CASAS_JOGAVEIS:
+            peca = self.localizacao(coordenadas).ocupante
+            if peca is not None:
+                pecas.append((coordenadas, peca.cor, peca.rei))
+        self._hash = calcular_hash(pecas, self.vez)
+        return self._hash
+    
+    def recalcular_contagens(self):
+        """Recalcula casas ocupadas e damas varrendo o tabuleiro (após alterar a matriz diretamente)"""
+        for cor in (VERDE, AMARELO):
+            self.ocupadas[cor].clear()
+            self.damas[cor] = 0
+        for coordenadas in CASAS_JOGAVEIS:
+            peca = self.localizacao(coordenadas).ocupante
+            if peca is not None:
+                self.ocupadas[peca.cor].add(coordenadas)
+                if peca.rei:
+                    self.damas[peca.cor] += 1
+    
+    def contar_pecas(self, cor):
+        """Número de peças (comuns e damas) da cor"""
+        return len(self.ocupadas[cor])
+    
+    def estatisticas(self):
+        """Peças e damas de cada cor, no formato do bloco 'estatisticas' do protocolo"""
+        return {
+            'pecas_verdes': len(self.ocupadas[VERDE]),
+            'pecas_amarelas': len(self.ocupadas[AMARELO]),
+            'damas_verdes': self.damas[VERDE],
+            'damas_amarelas': self.damas[AMARELO],
+        }
+    
+    def trocar_vez(self):
+        """Passa a vez para a outra cor (atualiza o hash)"""
+        self.vez = AMARELO if self.vez == VERDE else VERDE
+        self._hash ^= CHAVE_VEZ_AMARELO
+    
+    def _criar_tabuleiro(self):
+        """Cria um novo tabuleiro com as peças na posição inicial, copiando MODELO_INICIAL"""
+        return [
+            [Quadrado(cor, Peca(cor_peca) if cor_peca is not None else None) for cor, cor_peca in linha]
+            for linha in MODELO_INICIAL
+        ]
     
     def localizacao(self, coordenadas):
         """Retorna o quadrado na posição especificada"""
@@ -61,16 +146,10 @@ class Tabuleiro:
         x, y = coordenadas
         
         # Mapear constantes de direção para mudanças de coordenadas
-        if direcao == NOROESTE:
-            return (x - 1, y - 1)  # Para cima e esquerda
-        elif direcao == NORDESTE:
-            return (x + 1, y - 1)  # Para cima e direita
-        elif direcao == SUDOESTE:
-            return (x - 1, y + 1)  # Para baixo e esquerda
-        elif direcao == SUDESTE:
-            return (x + 1, y + 1)  # Para baixo e direita
-        else:
+        if direcao not in DELTAS:
             return (0, 0)  # Direção inválida - retorna origem
+        dx, dy = DELTAS[direcao]
+        return (x + dx, y + dy)
     
     def adjacentes(self, coordenadas):
         """Retorna todas as posições diagonalmente adjacentes"""
@@ -81,26 +160,14 @@ class Tabuleiro:
     
     def _movimentos_rei(self, coordenadas):
         """Retorna movimentos possíveis para um rei (apenas uma casa por vez)"""
-        movimentos = []
-        direcoes = [NOROESTE, NORDESTE, SUDOESTE, SUDESTE]
-        
         # Implementação de movimento restrito para reis:
         # Movem-se apenas uma casa por vez (não múltiplas casas)
         # mas podem se mover em todas as 4 direções diagonais
-        for direcao in direcoes:
-            proxima_posicao = self.obter_direcao(direcao, coordenadas)
-            
-            # Validar se a posição está dentro dos limites do tabuleiro
-            if not self.no_tabuleiro(proxima_posicao):
-                continue
-                
-            quadrado_proximo = self.localizacao(proxima_posicao)
-            
-            # Movimento válido apenas para casas vazias
-            if quadrado_proximo.esta_vazio():
-                movimentos.append(proxima_posicao)
-        
-        return movimentos
+        return [
+            proxima_posicao
+            for proxima_posicao in PASSOS[REI][coordenadas]
+            if self.localizacao(proxima_posicao).esta_vazio()
+        ]
     
     def movimentos_possiveis(self, coordenadas):
         """Calcula movimentos básicos sem validar capturas obrigatórias"""
@@ -114,19 +181,9 @@ class Tabuleiro:
         if peca.rei:
             # Reis: movimento em todas as direções diagonais (uma casa)
             return self._movimentos_rei(coordenadas)
-        elif peca.cor == VERDE:
-            # Peças verdes: apenas para frente (direção negativa Y)
-            return [
-                self.obter_direcao(NOROESTE, coordenadas),
-                self.obter_direcao(NORDESTE, coordenadas)
-            ]
-        else:  # peca.cor == AMARELO
-            # Peças amarelas: apenas para frente (direção positiva Y)
-            # Peças amarelas movem para baixo (direção positiva Y)
-            return [
-                self.obter_direcao(SUDOESTE, coordenadas),
-                self.obter_direcao(SUDESTE, coordenadas)
-            ]
+        
+        # Peças comuns: apenas para frente (verdes sobem, amarelas descem)
+        return list(PASSOS[peca.cor][coordenadas])
     
     def movimentos_legais(self, coordenadas, apenas_pulos=False):
         """Retorna lista de movimentos legais para uma peça"""
@@ -151,21 +208,17 @@ class Tabuleiro:
             movimentos.extend(self._encontrar_pulos_rei(coordenadas))
         else:
             # Para peças normais, verificar movimentos adjacentes
-            for movimento in movimentos_possiveis:
-                if not self.no_tabuleiro(movimento):
-                    continue
-                
-                quadrado_destino = self.localizacao(movimento)
+            for vizinho, pulo_destino in VIZINHANCA[peca_atual.cor][coordenadas]:
+                quadrado_destino = self.localizacao(vizinho)
                 
                 if quadrado_destino.esta_vazio():
                     # Movimento normal
-                    movimentos.append(movimento)
-                elif quadrado_destino.ocupante.cor != peca_atual.cor:
-                    # Possível pulo
-                    pulo_destino = self._calcular_destino_pulo(coordenadas, movimento)
-                    if (self.no_tabuleiro(pulo_destino) and 
-                        self.localizacao(pulo_destino).esta_vazio()):
-                        movimentos.append(pulo_destino)
+                    movimentos.append(vizinho)
+                elif (pulo_destino is not None and
+                      quadrado_destino.ocupante.cor != peca_atual.cor and
+                      self.localizacao(pulo_destino).esta_vazio()):
+                    # Pulo sobre peça adversária
+                    movimentos.append(pulo_destino)
         
         return movimentos
     
@@ -174,49 +227,24 @@ class Tabuleiro:
         if peca_atual.rei:
             return self._encontrar_pulos_rei(coordenadas)
         
-        pulos = []
-        
-        for movimento in movimentos_possiveis:
-            if not self.no_tabuleiro(movimento):
-                continue
-            
-            quadrado_destino = self.localizacao(movimento)
-            if (quadrado_destino.esta_ocupado() and 
-                quadrado_destino.ocupante.cor != peca_atual.cor):
-                
-                pulo_destino = self._calcular_destino_pulo(coordenadas, movimento)
-                if (self.no_tabuleiro(pulo_destino) and 
-                    self.localizacao(pulo_destino).esta_vazio()):
-                    pulos.append(pulo_destino)
-        
-        return pulos
+        return self._pulos_tabelados(coordenadas, peca_atual)
     
     def _encontrar_pulos_rei(self, coordenadas):
         """Encontra pulos para reis (damas) - capturas apenas adjacentes em todas as 4 diagonais"""
+        return self._pulos_tabelados(coordenadas, self.localizacao(coordenadas).ocupante)
+    
+    def _pulos_tabelados(self, coordenadas, peca_atual):
+        """Percorre os pares (casa pulada, destino) pré-calculados para a peça"""
         pulos = []
-        direcoes = [NOROESTE, NORDESTE, SUDOESTE, SUDESTE]
         
-        for direcao in direcoes:
-            # Posição da peça adjacente (uma casa na diagonal)
-            posicao_adjacente = self.obter_direcao(direcao, coordenadas)
-            
-            # Verificar se está dentro do tabuleiro
-            if not self.no_tabuleiro(posicao_adjacente):
-                continue
-            
+        for posicao_adjacente, posicao_destino in PULOS[tipo_peca(peca_atual)][coordenadas]:
             quadrado_adjacente = self.localizacao(posicao_adjacente)
             
-            # Se há uma peça inimiga adjacente
+            # Peça inimiga adjacente com casa livre logo após
             if (quadrado_adjacente.esta_ocupado() and 
-                quadrado_adjacente.ocupante.cor != self.localizacao(coordenadas).ocupante.cor):
-                
-                # Posição de destino após o pulo (uma casa após a peça inimiga)
-                posicao_destino = self.obter_direcao(direcao, posicao_adjacente)
-                
-                # Verificar se o destino está livre e dentro do tabuleiro
-                if (self.no_tabuleiro(posicao_destino) and 
-                    self.localizacao(posicao_destino).esta_vazio()):
-                    pulos.append(posicao_destino)
+                quadrado_adjacente.ocupante.cor != peca_atual.cor and
+                self.localizacao(posicao_destino).esta_vazio()):
+                pulos.append(posicao_destino)
         
         return pulos
     
@@ -243,14 +271,23 @@ class Tabuleiro:
     
     def mover_peca(self, origem, destino):
         """Move uma peça de origem para destino"""
-        peca = self.localizacao(origem).remover_peca()
+        peca = self.remover_peca(origem)
         
         # Verificar se é um pulo e remover peças capturadas
         self._processar_capturas(origem, destino, peca)
         
-        self.localizacao(destino).colocar_peca(peca)
+        self._colocar_peca(destino, peca)
         self._verificar_coroacao(destino)
     
+    def _colocar_peca(self, coordenadas, peca):
+        """Posiciona peça atualizando o hash da posição"""
+        self.localizacao(coordenadas).colocar_peca(peca)
+        if peca is not None:
+            self._hash ^= chave_peca(peca, coordenadas)
+            self.ocupadas[peca.cor].add(coordenadas)
+            if peca.rei:
+                self.damas[peca.cor] += 1
+    
     def _processar_capturas(self, origem, destino, peca):
         """Processa capturas durante um movimento"""
         x_origem, y_origem = origem
@@ -267,13 +304,59 @@ class Tabuleiro:
             y_capturada = y_origem + (dy // 2)
             
             # Remover a peça capturada
-            quadrado_capturado = self.localizacao((x_capturada, y_capturada))
-            if quadrado_capturado.esta_ocupado():
-                quadrado_capturado.remover_peca()
+            self.remover_peca((x_capturada, y_capturada))
+    
+    def fazer_movimento(self, origem, destino):
+        """
+        Executa um movimento que pode ser desfeito depois
+        
+        Returns:
+            RegistroMovimento empilhado em pilha_desfazer
+        """
+        peca = self.localizacao(origem).ocupante
+        era_rei = peca.rei
+        
+        # Guardar a peça capturada antes que mover_peca a remova
+        capturada_em = None
+        capturada = None
+        dx = destino[0] - origem[0]
+        dy = destino[1] - origem[1]
+        if abs(dx) == 2 and abs(dy) == 2:
+            posicao_meio = (origem[0] + dx // 2, origem[1] + dy // 2)
+            capturada = self.localizacao(posicao_meio).ocupante
+            if capturada is not None:
+                capturada_em = posicao_meio
+        
+        self.mover_peca(origem, destino)
+        
+        registro = RegistroMovimento(origem, destino, capturada_em, capturada,
+                                     not era_rei and peca.rei)
+        self.pilha_desfazer.append(registro)
+        return registro
+    
+    def desfazer_movimento(self):
+        """Desfaz o último movimento feito com fazer_movimento e retorna seu registro"""
+        registro = self.pilha_desfazer.pop()
+        
+        peca = self.remover_peca(registro.destino)
+        if registro.promoveu:
+            peca.rebaixar()
+        self._colocar_peca(registro.origem, peca)
+        
+        if registro.capturada is not None:
+            self._colocar_peca(registro.capturada_em, registro.capturada)
+        
+        return registro
     
     def remover_peca(self, coordenadas):
         """Remove uma peça do tabuleiro"""
-        return self.localizacao(coordenadas).remover_peca()
+        peca = self.localizacao(coordenadas).remover_peca()
+        if peca is not None:
+            self._hash ^= chave_peca(peca, coordenadas)
+            self.ocupadas[peca.cor].discard(coordenadas)
+            if peca.rei:
+                self.damas[peca.cor] -= 1
+        return peca
     
     def _verificar_coroacao(self, coordenadas):
         """Verifica se uma peça deve ser coroada"""
@@ -288,17 +371,21 @@ class Tabuleiro:
         # Peças verdes chegam ao topo (y = 0)
         # Peças amarelas chegam à base (y = 7)
         if (peca.cor == VERDE and y == 0) or (peca.cor == AMARELO and y == TAMANHO_TABULEIRO - 1):
+            self._hash ^= chave_peca(peca, coordenadas)
             peca.tornar_rei()
+            self._hash ^= chave_peca(peca, coordenadas)
+            self.damas[peca.cor] += 1
+    
+    def tem_capturas(self, cor):
+        """Verifica se alguma peça da cor pode capturar (captura é obrigatória)"""
+        for coordenadas in self.ocupadas[cor]:
+            if self._pulos_tabelados(coordenadas, self.localizacao(coordenadas).ocupante):
+                return True
+        return False
     
     def tem_movimentos_legais(self, cor):
-        """Verifica se uma cor tem movimentos legais disponíveis"""
-        for x in range(TAMANHO_TABULEIRO):
-            for y in range(TAMANHO_TABULEIRO):
-                quadrado = self.localizacao((x, y))
-                if (quadrado.cor == PRETO and 
-                    quadrado.esta_ocupado() and 
-                    quadrado.ocupante.cor == cor):
-                    
-                    if self.movimentos_legais((x, y)):
-                        return True
+        """Verifica se uma cor tem movimentos legais disponíveis (só nas casas ocupadas pela cor)"""
+        for coordenadas in self.ocupadas[cor]:
+            if self.movimentos_legais(coordenadas):
+                return True
         return False
@@ -0,0 +1,475 @@
+"""
+Classe TabuleiroBits - Motor de regras do jogo de damas baseado em bitboards
+
+As 32 casas jogáveis (casas PRETAS) são numeradas de 0 a 31, linha a linha,
+de cima para baixo: indice = y * 4 + x // 2. Cada cor guarda dois inteiros,
+um para peças comuns e outro para reis (damas), com um bit por casa.
+"""
+
+from typing import NamedTuple, Tuple
+
+from constantes import *
+from peca import Peca
+from quadrado import Quadrado
+from tabuleiro import Tabuleiro
+
+
+# === MÁSCARAS DO TABULEIRO DE 32 CASAS ===
+CASAS_JOGAVEIS = 32
+MASCARA_TOTAL = (1 << CASAS_JOGAVEIS) - 1
+
+LINHAS_PARES = 0
+LINHAS_IMPARES = 0
+COLUNA_ESQUERDA = 0   # Primeira casa jogável de cada linha
+COLUNA_DIREITA = 0    # Última casa jogável de cada linha
+for _linha in range(TAMANHO_TABULEIRO):
+    _bits_linha = 0b1111 << (_linha * 4)
+    if _linha % 2 == 0:
+        LINHAS_PARES |= _bits_linha
+    else:
+        LINHAS_IMPARES |= _bits_linha
+    COLUNA_ESQUERDA |= 1 << (_linha * 4)
+    COLUNA_DIREITA |= 1 << (_linha * 4 + 3)
+del _linha, _bits_linha
+
+LINHA_COROACAO_VERDE = 0b1111                            # y = 0
+LINHA_COROACAO_AMARELA = 0b1111 << (CASAS_JOGAVEIS - 4)  # y = 7
+
+POSICAO_INICIAL_AMARELAS = (1 << 12) - 1                       # y = 0, 1, 2
+POSICAO_INICIAL_VERDES = MASCARA_TOTAL & ~((1 << 20) - 1)      # y = 5, 6, 7
+
+
+def _deslocar_noroeste(bits):
+    """Desloca todas as peças uma casa para cima e esquerda"""
+    return (((bits & LINHAS_PARES & ~COLUNA_ESQUERDA) >> 5) |
+            ((bits & LINHAS_IMPARES) >> 4))
+
+
+def _deslocar_nordeste(bits):
+    """Desloca todas as peças uma casa para cima e direita"""
+    return (((bits & LINHAS_PARES) >> 4) |
+            ((bits & LINHAS_IMPARES & ~COLUNA_DIREITA) >> 3))
+
+
+def _deslocar_sudoeste(bits):
+    """Desloca todas as peças uma casa para baixo e esquerda"""
+    return ((((bits & LINHAS_PARES & ~COLUNA_ESQUERDA) << 3) |
+             ((bits & LINHAS_IMPARES) << 4)) & MASCARA_TOTAL)
+
+
+def _deslocar_sudeste(bits):
+    """Desloca todas as peças uma casa para baixo e direita"""
+    return ((((bits & LINHAS_PARES) << 4) |
+             ((bits & LINHAS_IMPARES & ~COLUNA_DIREITA) << 5)) & MASCARA_TOTAL)
+
+
+DESLOCAMENTOS = {
+    NOROESTE: _deslocar_noroeste,
+    NORDESTE: _deslocar_nordeste,
+    SUDOESTE: _deslocar_sudoeste,
+    SUDESTE: _deslocar_sudeste,
+}
+
+# Direções permitidas para peças comuns (reis usam as quatro)
+DIRECOES_HOMENS = {
+    VERDE: (_deslocar_noroeste, _deslocar_nordeste),
+    AMARELO: (_deslocar_sudoeste, _deslocar_sudeste),
+}
+DIRECOES_REIS = (_deslocar_noroeste, _deslocar_nordeste, _deslocar_sudoeste, _deslocar_sudeste)
+
+# Deslocamento oposto, usado para achar as origens a partir dos destinos
+INVERSAS = {
+    _deslocar_noroeste: _deslocar_sudeste,
+    _deslocar_nordeste: _deslocar_sudoeste,
+    _deslocar_sudoeste: _deslocar_nordeste,
+    _deslocar_sudeste: _deslocar_noroeste,
+}
+
+
+def coordenadas_para_indice(coordenadas):
+    """Converte (x, y) de uma casa jogável para o índice 0..31"""
+    x, y = coordenadas
+    return y * 4 + x // 2
+
+
+def indice_para_coordenadas(indice):
+    """Converte índice 0..31 para coordenadas (x, y)"""
+    y = indice // 4
+    return (2 * (indice % 4) + (y % 2), y)
+
+
+def casa_jogavel(coordenadas):
+    """Verifica se a coordenada é uma casa escura dentro do tabuleiro"""
+    x, y = coordenadas
+    return (0 <= x < TAMANHO_TABULEIRO and 0 <= y < TAMANHO_TABULEIRO and
+            (x + y) % 2 == 0)
+
+
+def bits_para_coordenadas(bits):
+    """Lista as coordenadas de todos os bits ligados"""
+    coordenadas = []
+    while bits:
+        menor_bit = bits & -bits
+        coordenadas.append(indice_para_coordenadas(menor_bit.bit_length() - 1))
+        bits ^= menor_bit
+    return coordenadas
+
+
+class SequenciaCaptura(NamedTuple):
+    """Cadeia completa de capturas feita por uma única peça"""
+    origem: Tuple[int, int]
+    destinos: Tuple[Tuple[int, int], ...]     # Cada casa onde a peça pousa
+    capturadas: Tuple[Tuple[int, int], ...]   # Cada peça removida, na ordem
+    promoveu_dama: bool = False
+
+
+class TabuleiroBits:
+    """Tabuleiro de damas compacto: quatro inteiros de 32 bits"""
+    
+    def __init__(self, homens_verdes=POSICAO_INICIAL_VERDES, reis_verdes=0,
+                 homens_amarelos=POSICAO_INICIAL_AMARELAS, reis_amarelos=0):
+        """
+        Cria um tabuleiro a partir das máscaras de cada tipo de peça
+        
+        Args:
+            homens_verdes: Peças comuns verdes (um bit por casa jogável)
+            reis_verdes: Damas verdes
+            homens_amarelos: Peças comuns amarelas
+            reis_amarelos: Damas amarelas
+        """
+        self.homens_verdes = homens_verdes
+        self.reis_verdes = reis_verdes
+        self.homens_amarelos = homens_amarelos
+        self.reis_amarelos = reis_amarelos
+    
+    # === CONSULTAS DE OCUPAÇÃO ===
+    
+    def pecas_da_cor(self, cor):
+        """Retorna todas as peças (comuns e reis) de uma cor"""
+        if cor == VERDE:
+            return self.homens_verdes | self.reis_verdes
+        return self.homens_amarelos | self.reis_amarelos
+    
+    def ocupadas(self):
+        """Retorna máscara com todas as casas ocupadas"""
+        return (self.homens_verdes | self.reis_verdes |
+                self.homens_amarelos | self.reis_amarelos)
+    
+    def vazias(self):
+        """Retorna máscara com todas as casas jogáveis livres"""
+        return ~self.ocupadas() & MASCARA_TOTAL
+    
+    def peca_em(self, coordenadas):
+        """Retorna (cor, rei) da peça na posição ou None se vazia"""
+        if not casa_jogavel(coordenadas):
+            return None
+        
+        bit = 1 << coordenadas_para_indice(coordenadas)
+        if self.homens_verdes & bit:
+            return (VERDE, False)
+        if self.reis_verdes & bit:
+            return (VERDE, True)
+        if self.homens_amarelos & bit:
+            return (AMARELO, False)
+        if self.reis_amarelos & bit:
+            return (AMARELO, True)
+        return None
+    
+    # === GERAÇÃO DE MOVIMENTOS ===
+    
+    def _alvos(self, bit, cor, rei, apenas_pulos=False):
+        """Calcula máscara de destinos (passos e pulos) para uma única peça"""
+        inimigas = self.pecas_da_cor(AMARELO if cor == VERDE else VERDE)
+        vazias = self.vazias()
+        direcoes = DIRECOES_REIS if rei else DIRECOES_HOMENS[cor]
+        
+        alvos = 0
+        for deslocar in direcoes:
+            vizinho = deslocar(bit)
+            if not apenas_pulos:
+                alvos |= vizinho & vazias
+            alvos |= deslocar(vizinho & inimigas) & vazias
+        return alvos
+    
+    def movimentos_legais(self, coordenadas, apenas_pulos=False):
+        """Retorna lista de movimentos legais para uma peça"""
+        peca = self.peca_em(coordenadas)
+        if peca is None:
+            return []
+        
+        cor, rei = peca
+        bit = 1 << coordenadas_para_indice(coordenadas)
+        return bits_para_coordenadas(self._alvos(bit, cor, rei, apenas_pulos))
+    
+    def pode_capturar_novamente(self, coordenadas):
+        """Verifica se uma peça pode fazer capturas adicionais da posição atual"""
+        peca = self.peca_em(coordenadas)
+        if peca is None:
+            return False
+        
+        cor, rei = peca
+        bit = 1 << coordenadas_para_indice(coordenadas)
+        return self._alvos(bit, cor, rei, apenas_pulos=True) != 0
+    
+    def pecas_com_movimento(self, cor, apenas_pulos=False):
+        """Retorna máscara das peças de uma cor que possuem algum movimento"""
+        if cor == VERDE:
+            homens, reis, inimigas = self.homens_verdes, self.reis_verdes, \
+                self.homens_amarelos | self.reis_amarelos
+        else:
+            homens, reis, inimigas = self.homens_amarelos, self.reis_amarelos, \
+                self.homens_verdes | self.reis_verdes
+        vazias = self.vazias()
+        
+        # Caminho inverso: a partir das casas livres, quais peças chegam nelas
+        com_movimento = 0
+        for deslocar in DIRECOES_REIS:
+            voltar = INVERSAS[deslocar]
+            origens = reis | (homens if deslocar in DIRECOES_HOMENS[cor] else 0)
+            if not origens:
+                continue
+            
+            if not apenas_pulos:
+                com_movimento |= voltar(vazias) & origens
+            com_movimento |= voltar(voltar(vazias) & inimigas) & origens
+        return com_movimento
+    
+    def filhos_simples(self, cor):
+        """
+        Gera as posições resultantes de cada movimento sem captura
+        
+        Trabalha só com deslocamentos de bits, sem converter coordenadas:
+        é o caminho rápido usado por perft e pela busca.
+        """
+        vazias = self.vazias()
+        verde = cor == VERDE
+        homens = self.homens_verdes if verde else self.homens_amarelos
+        reis = self.reis_verdes if verde else self.reis_amarelos
+        coroacao = LINHA_COROACAO_VERDE if verde else LINHA_COROACAO_AMARELA
+        
+        filhos = []
+        for deslocar in DIRECOES_REIS:
+            voltar = INVERSAS[deslocar]
+            avanca_homens = deslocar in DIRECOES_HOMENS[cor]
+            origens = reis | (homens if avanca_homens else 0)
+            destinos = deslocar(origens) & vazias
+            
+            while destinos:
+                destino = destinos & -destinos
+                destinos ^= destino
+                origem = voltar(destino)
+                
+                if reis & origem:
+                    novos_homens, novos_reis = homens, reis ^ origem ^ destino
+                elif destino & coroacao:
+                    novos_homens, novos_reis = homens ^ origem, reis | destino
+                else:
+                    novos_homens, novos_reis = homens ^ origem ^ destino, reis
+                
+                if verde:
+                    filhos.append(TabuleiroBits(novos_homens, novos_reis,
+                                                self.homens_amarelos, self.reis_amarelos))
+                else:
+                    filhos.append(TabuleiroBits(self.homens_verdes, self.reis_verdes,
+                                                novos_homens, novos_reis))
+        return filhos
+    
+    def tem_movimentos_legais(self, cor):
+        """Verifica se uma cor tem movimentos legais disponíveis"""
+        return self.pecas_com_movimento(cor) != 0
+    
+    # === SEQUÊNCIAS DE CAPTURA ===
+    
+    def sequencias_captura(self, cor, origem=None):
+        """
+        Gera todas as cadeias completas de captura de uma cor
+        
+        Percorre as capturas em profundidade alterando o próprio tabuleiro
+        (fazer/desfazer) em vez de copiá-lo a cada salto. Enquanto o gerador
+        está suspenso o tabuleiro fica em estado intermediário: para copiar
+        ou alterar o tabuleiro, materialize antes com list().
+        
+        Args:
+            cor: Cor que está capturando
+            origem: Restringe a busca à peça nessa coordenada (opcional)
+        
+        Yields:
+            SequenciaCaptura para cada cadeia que não pode ser estendida
+        """
+        if origem is not None:
+            peca = self.peca_em(origem)
+            if peca is None or peca[0] != cor:
+                return
+            candidatas = 1 << coordenadas_para_indice(origem)
+        else:
+            candidatas = self.pecas_com_movimento(cor, apenas_pulos=True)
+        
+        while candidatas:
+            bit = candidatas & -candidatas
+            candidatas ^= bit
+            rei = bool(bit & (self.reis_verdes if cor == VERDE else self.reis_amarelos))
+            origem_peca = indice_para_coordenadas(bit.bit_length() - 1)
+            
+            # Retira a peça da origem durante a busca para liberar a casa
+            posicao_salva = self.codificar()
+            self._remover_bit(bit)
+            try:
+                yield from self._estender_captura(bit, cor, rei, origem_peca, [], [], False)
+            finally:
+                (self.homens_verdes, self.reis_verdes,
+                 self.homens_amarelos, self.reis_amarelos) = posicao_salva
+    
+    def _estender_captura(self, bit, cor, rei, origem, destinos, capturadas, promoveu):
+        """Passo recursivo da busca de capturas a partir da casa indicada por bit"""
+        inimigas = self.pecas_da_cor(AMARELO if cor == VERDE else VERDE)
+        vazias = self.vazias() & ~bit
+        direcoes = DIRECOES_REIS if rei else DIRECOES_HOMENS[cor]
+        
+        estendeu = False
+        for deslocar in direcoes:
+            pulada = deslocar(bit) & inimigas
+            if not pulada:
+                continue
+            destino = deslocar(pulada) & vazias
+            if not destino:
+                continue
+            
+            estendeu = True
+            coroa = not rei and bool(
+                destino & (LINHA_COROACAO_VERDE if cor == VERDE else LINHA_COROACAO_AMARELA)
+            )
+            
+            # Fazer: remove a peça capturada
+            posicao_salva = self.codificar()
+            self._remover_bit(pulada)
+            destinos.append(indice_para_coordenadas(destino.bit_length() - 1))
+            capturadas.append(indice_para_coordenadas(pulada.bit_length() - 1))
+            
+            yield from self._estender_captura(destino, cor, rei or coroa, origem,
+                                              destinos, capturadas, promoveu or coroa)
+            
+            # Desfazer
+            destinos.pop()
+            capturadas.pop()
+            (self.homens_verdes, self.reis_verdes,
+             self.homens_amarelos, self.reis_amarelos) = posicao_salva
+        
+        if not estendeu and destinos:
+            yield SequenciaCaptura(origem, tuple(destinos), tuple(capturadas), promoveu)
+    
+    def aplicar_sequencia(self, sequencia):
+        """Executa no tabuleiro todos os saltos de uma sequência de captura"""
+        atual = sequencia.origem
+        for destino in sequencia.destinos:
+            self.mover_peca(atual, destino)
+            atual = destino
+    
+    # === EXECUÇÃO DE MOVIMENTOS ===
+    
+    def _remover_bit(self, bit):
+        """Remove qualquer peça presente na casa indicada pelo bit"""
+        self.homens_verdes &= ~bit
+        self.reis_verdes &= ~bit
+        self.homens_amarelos &= ~bit
+        self.reis_amarelos &= ~bit
+    
+    def remover_peca(self, coordenadas):
+        """Remove uma peça do tabuleiro e retorna (cor, rei) ou None"""
+        peca = self.peca_em(coordenadas)
+        if peca is not None:
+            self._remover_bit(1 << coordenadas_para_indice(coordenadas))
+        return peca
+    
+    def colocar_peca(self, coordenadas, cor, rei=False):
+        """Posiciona uma peça em uma casa jogável"""
+        bit = 1 << coordenadas_para_indice(coordenadas)
+        self._remover_bit(bit)
+        if cor == VERDE:
+            if rei:
+                self.reis_verdes |= bit
+            else:
+                self.homens_verdes |= bit
+        else:
+            if rei:
+                self.reis_amarelos |= bit
+            else:
+                self.homens_amarelos |= bit
+    
+    def mover_peca(self, origem, destino):
+        """Move uma peça de origem para destino, com captura e coroação"""
+        peca = self.remover_peca(origem)
+        if peca is None:
+            return
+        cor, rei = peca
+        
+        # Pulo de exatamente 2 casas remove a peça do meio
+        dx = destino[0] - origem[0]
+        dy = destino[1] - origem[1]
+        if abs(dx) == 2 and abs(dy) == 2:
+            self.remover_peca((origem[0] + dx // 2, origem[1] + dy // 2))
+        
+        # Coroação ao alcançar a última linha
+        bit_destino = 1 << coordenadas_para_indice(destino)
+        if cor == VERDE and bit_destino & LINHA_COROACAO_VERDE:
+            rei = True
+        elif cor == AMARELO and bit_destino & LINHA_COROACAO_AMARELA:
+            rei = True
+        
+        self.colocar_peca(destino, cor, rei)
+    
+    def copiar(self):
+        """Retorna cópia independente do tabuleiro"""
+        return TabuleiroBits(self.homens_verdes, self.reis_verdes,
+                             self.homens_amarelos, self.reis_amarelos)
+    
+    def codificar(self):
+        """Retorna a posição como tupla de quatro inteiros"""
+        return (self.homens_verdes, self.reis_verdes,
+                self.homens_amarelos, self.reis_amarelos)
+    
+    def __eq__(self, outro):
+        return isinstance(outro, TabuleiroBits) and self.codificar() == outro.codificar()
+    
+    def __hash__(self):
+        return hash(self.codificar())
+    
+    def __repr__(self):
+        return "TabuleiroBits(0x%08x, 0x%08x, 0x%08x, 0x%08x)" % self.codificar()
+    
+    # === ADAPTADORES PARA A MATRIZ DE OBJETOS ===
+    
+    @classmethod
+    def de_matriz(cls, matriz):
+        """Cria tabuleiro de bits a partir de uma matriz [y][x] de Quadrado"""
+        tabuleiro = cls(0, 0, 0, 0)
+        for indice in range(CASAS_JOGAVEIS):
+            x, y = indice_para_coordenadas(indice)
+            peca = matriz[y][x].ocupante
+            if peca is not None:
+                tabuleiro.colocar_peca((x, y), peca.cor, peca.rei)
+        return tabuleiro
+    
+    @classmethod
+    def de_tabuleiro(cls, tabuleiro):
+        """Cria tabuleiro de bits a partir de um Tabuleiro de objetos"""
+        return cls.de_matriz(tabuleiro.matriz)
+    
+    def para_matriz(self):
+        """Gera matriz [y][x] de Quadrado/Peca equivalente a esta posição"""
+        matriz = [
+            [Quadrado(PRETO if (x + y) % 2 == 0 else BRANCO)
+             for x in range(TAMANHO_TABULEIRO)]
+            for y in range(TAMANHO_TABULEIRO)
+        ]
+        
+        for indice in range(CASAS_JOGAVEIS):
+            x, y = indice_para_coordenadas(indice)
+            peca = self.peca_em((x, y))
+            if peca is not None:
+                cor, rei = peca
+                matriz[y][x].colocar_peca(Peca(cor, rei))
+        return matriz
+    
+    def para_tabuleiro(self):
+        """Gera um Tabuleiro de objetos (usado por Graficos e pelo servidor)"""
+        return Tabuleiro(self.para_matriz())
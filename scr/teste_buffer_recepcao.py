@@ -0,0 +1,187 @@
+"""
+Teste do buffer de recepção com pontos de corte arbitrários
+
+Mistura linhas JSON e quadros binários em um único fluxo, entrega esse
+fluxo ao BufferRecepcao cortado em pedaços de tamanho aleatório (por
+acrescentar e por receber com recv_into) e confere que as mensagens saem
+inteiras e na ordem, inclusive caracteres UTF-8 divididos entre dois
+pedaços e mensagens maiores que a capacidade inicial. Também confere que
+quadros e linhas acima do limite são rejeitados com ErroCodec.
+
+Uso:
+    python teste_buffer_recepcao.py [semente]
+"""
+
+import json
+import random
+import sys
+
+from buffer_recepcao import CAPACIDADE_MAXIMA, BufferRecepcao
+from codec_binario import CABECALHO_QUADRO, MARCADOR_BINARIO, TAMANHO_MAXIMO_QUADRO, ErroCodec, codificar, decodificar
+from protocolo import TipoMensagem
+
+
+RODADAS = 200
+
+
+class OrigemFatiada:
+    """Imita um socket cujo recv_into devolve o fluxo em pedaços aleatórios"""
+    
+    def __init__(self, dados: bytes, gerador: random.Random):
+        self.dados = dados
+        self.posicao = 0
+        self.gerador = gerador
+    
+    def recv_into(self, destino) -> int:
+        """Copia até um pedaço aleatório para o destino (0 no fim do fluxo)"""
+        tamanho = min(len(destino), self.gerador.randint(1, 300), len(self.dados) - self.posicao)
+        destino[:tamanho] = self.dados[self.posicao:self.posicao + tamanho]
+        self.posicao += tamanho
+        return tamanho
+
+
+def mensagens_aleatorias(gerador: random.Random):
+    """Mensagens variadas, algumas com acentos e uma ou outra maior que a capacidade inicial"""
+    mensagens = []
+    for i in range(gerador.randint(1, 40)):
+        sorteio = gerador.random()
+        if sorteio < 0.3:
+            mensagem = {'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
+                        'origem': [gerador.randrange(8), gerador.randrange(8)],
+                        'destino': [gerador.randrange(8), gerador.randrange(8)]}
+        elif sorteio < 0.6:
+            mensagem = {'tipo': TipoMensagem.CHAT.value, 'texto': "ação ♟ " * gerador.randint(0, 60),
+                        'timestamp': gerador.random()}
+        elif sorteio < 0.95:
+            mensagem = {'tipo': TipoMensagem.PING.value if i % 2 else TipoMensagem.PONG.value}
+        else:
+            # Maior que CAPACIDADE_INICIAL: obriga o buffer a crescer
+            mensagem = {'tipo': TipoMensagem.NOTIFICACAO.value, 'texto': "é" * gerador.randint(9000, 25000)}
+        mensagens.append((gerador.random() < 0.5, mensagem))
+    return mensagens
+
+
+def serializar(binario: bool, mensagem) -> bytes:
+    """Mesmo formato do servidor: quadro binário ou JSON terminado em quebra de linha"""
+    if binario:
+        return codificar(mensagem)
+    return (json.dumps(mensagem, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def decodificar_recebida(binario: bool, conteudo) -> dict:
+    """Decodifica na hora (a memoryview só vale até o próximo recebimento)"""
+    if binario:
+        return decodificar(conteudo)
+    return json.loads(bytes(conteudo).decode('utf-8'))
+
+
+def conferir_fluxo(gerador: random.Random, usar_recv_into: bool) -> bool:
+    """Fluxo misto cortado ao acaso; True se tudo chegou inteiro e em ordem"""
+    enviadas = mensagens_aleatorias(gerador)
+    fluxo = b''.join(serializar(binario, mensagem) for binario, mensagem in enviadas)
+    esperadas = [(binario, json.loads(json.dumps(mensagem))) for binario, mensagem in enviadas]
+    
+    buffer = BufferRecepcao()
+    recebidas = []
+    if usar_recv_into:
+        origem = OrigemFatiada(fluxo, gerador)
+        while buffer.receber(origem):
+            recebidas.extend((b, decodificar_recebida(b, c)) for b, c in buffer.mensagens())
+    else:
+        posicao = 0
+        while posicao < len(fluxo):
+            proxima = min(len(fluxo), posicao + gerador.randint(1, 300))
+            buffer.acrescentar(fluxo[posicao:proxima])
+            posicao = proxima
+            recebidas.extend((b, decodificar_recebida(b, c)) for b, c in buffer.mensagens())
+    
+    return recebidas == esperadas and len(buffer) == 0
+
+
+def conferir_cortes() -> bool:
+    """Todos os pontos de corte de um fluxo curto (dois pedaços cada)"""
+    fluxo = (serializar(False, {'tipo': 'chat', 'texto': 'pé'}) +
+             serializar(True, {'tipo': 'movimento_solicitado', 'origem': [1, 2], 'destino': [2, 3]}) +
+             serializar(False, {'tipo': 'ping'}))
+    for corte in range(len(fluxo) + 1):
+        buffer = BufferRecepcao()
+        recebidas = []
+        for pedaco in (fluxo[:corte], fluxo[corte:]):
+            buffer.acrescentar(pedaco)
+            recebidas.extend(decodificar_recebida(b, c)['tipo'] for b, c in buffer.mensagens())
+        if recebidas != ['chat', 'movimento_solicitado', 'ping']:
+            print(f"   ❌ Corte na posição {corte}: {recebidas}")
+            return False
+    return True
+
+
+def rejeita(descricao: str, acao) -> bool:
+    """Confere que a ação levanta ErroCodec"""
+    try:
+        acao()
+    except ErroCodec as e:
+        print(f"   ✅ {descricao}: ErroCodec ({e})")
+        return True
+    print(f"   ❌ {descricao}: aceito sem erro")
+    return False
+
+
+def conferir_limites() -> bool:
+    """Quadros e linhas acima do limite são rejeitados; o maior quadro válido passa"""
+    tudo_certo = True
+    
+    def quadro_grande_demais():
+        buffer = BufferRecepcao()
+        buffer.acrescentar(CABECALHO_QUADRO.pack(MARCADOR_BINARIO, TAMANHO_MAXIMO_QUADRO + 1))
+        list(buffer.mensagens())
+    tudo_certo = rejeita("Quadro acima de TAMANHO_MAXIMO_QUADRO", quadro_grande_demais) and tudo_certo
+    
+    def linha_longa_acrescentar():
+        buffer = BufferRecepcao()
+        for _ in range(CAPACIDADE_MAXIMA // 1024 + 1):
+            buffer.acrescentar(b'x' * 1024)
+            list(buffer.mensagens())
+    tudo_certo = rejeita("Linha sem quebra acima do limite (acrescentar)", linha_longa_acrescentar) and tudo_certo
+    
+    def linha_longa_receber():
+        buffer = BufferRecepcao()
+        origem = OrigemFatiada(b'x' * (CAPACIDADE_MAXIMA + 1), random.Random(0))
+        while buffer.receber(origem):
+            list(buffer.mensagens())
+    tudo_certo = rejeita("Linha sem quebra acima do limite (receber)", linha_longa_receber) and tudo_certo
+    
+    # O maior quadro permitido, precedido de uma mensagem incompleta, ainda cabe
+    conteudo = bytes((0,)) + b'{}'.ljust(TAMANHO_MAXIMO_QUADRO - 1)
+    buffer = BufferRecepcao()
+    buffer.acrescentar(b'{"tipo": "pi')
+    buffer.acrescentar(b'ng"}\n' + CABECALHO_QUADRO.pack(MARCADOR_BINARIO, len(conteudo)) + conteudo)
+    tamanhos = [len(c) for _, c in buffer.mensagens()]
+    confere = tamanhos == [len(b'{"tipo": "ping"}'), TAMANHO_MAXIMO_QUADRO]
+    print(f"   {'✅' if confere else '❌'} Quadro de TAMANHO_MAXIMO_QUADRO aceito: {tamanhos}")
+    return confere and tudo_certo
+
+
+def main():
+    """Função principal do teste"""
+    semente = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    gerador = random.Random(semente)
+    print(f"🧪 Buffer de recepção (semente {semente})")
+    
+    tudo_certo = conferir_cortes()
+    print(f"   {'✅' if tudo_certo else '❌'} Todos os pontos de corte de um fluxo curto")
+    
+    for usar_recv_into, nome in ((False, "acrescentar"), (True, "recv_into")):
+        falhas = sum(not conferir_fluxo(gerador, usar_recv_into) for _ in range(RODADAS))
+        print(f"   {'✅' if not falhas else '❌'} {RODADAS} fluxos mistos cortados ao acaso ({nome}): "
+              f"{falhas} divergentes")
+        tudo_certo = tudo_certo and not falhas
+    
+    print("\n🧪 Limites de tamanho")
+    tudo_certo = conferir_limites() and tudo_certo
+    
+    print("\n✅ Todas as mensagens conferem" if tudo_certo else "\n❌ Há mensagens divergentes")
+    return 0 if tudo_certo else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Teste de ida e volta do codec binário
+
+Para uma mensagem de exemplo de cada TipoMensagem (montada com os mesmos
+construtores usados pelo servidor), confere que decodificar(codificar(m))
+devolve exatamente o que json.loads(json.dumps(m)) devolveria, tanto nos
+layouts especializados quanto no formato genérico. Também confere o
+cabeçalho do quadro e a rejeição de conteúdo malformado.
+
+Uso:
+    python teste_codec.py
+"""
+
+import json
+import sys
+
+from codec_binario import (CABECALHO_QUADRO, CODIGO_GENERICO, MARCADOR_BINARIO, MARCADOR_GENERICO,
+                           ErroCodec, codificar, decodificar)
+from constantes import *
+from protocolo import (EstadoJogador, EstadoJogo, EstadoTabuleiro, Jogador, Movimento,
+                       ProtocoloDamas, TipoMensagem)
+from peca import Peca
+from tabuleiro import Tabuleiro
+
+
+SALA_ID = 7
+
+
+def estado_tabuleiro(tabuleiro: Tabuleiro) -> EstadoTabuleiro:
+    """Matriz [x][y] no mesmo formato de ServidorDamasAvancado.obter_estado_tabuleiro"""
+    matriz = []
+    for x in range(TAMANHO_TABULEIRO):
+        linha = []
+        for y in range(TAMANHO_TABULEIRO):
+            quadrado = tabuleiro.matriz[y][x]
+            peca = None
+            if quadrado.ocupante:
+                peca = {'cor': quadrado.ocupante.cor, 'e_dama': quadrado.ocupante.e_dama}
+            linha.append({'cor_quadrado': quadrado.cor, 'peca': peca})
+        matriz.append(linha)
+    return EstadoTabuleiro(matriz=matriz, **tabuleiro.estatisticas())
+
+
+def tabuleiro_com_dama() -> Tabuleiro:
+    """Posição inicial com uma peça verde promovida (cobre o bit de dama)"""
+    tabuleiro = Tabuleiro()
+    for x in range(TAMANHO_TABULEIRO):
+        quadrado = tabuleiro.matriz[TAMANHO_TABULEIRO - 1][x]
+        if quadrado.ocupante:
+            quadrado.ocupante = Peca(quadrado.ocupante.cor, rei=True)
+            break
+    tabuleiro.recalcular_contagens()
+    return tabuleiro
+
+
+def exemplos():
+    """(descrição, mensagem) cobrindo todos os tipos e as variantes de cada layout"""
+    verde = Jogador(1, "Ana", VERDE, None, None, EstadoJogador.JOGANDO, 1700000000.25, SALA_ID, 1500)
+    amarelo = Jogador(2, "Bruno", AMARELO, None, None, EstadoJogador.JOGANDO, 1700000001.5, SALA_ID)
+    inicial = estado_tabuleiro(Tabuleiro())
+    com_dama = estado_tabuleiro(tabuleiro_com_dama())
+    
+    simples = Movimento((1, 2), (2, 3), 1, VERDE, timestamp=1700000002.125)
+    captura = Movimento((2, 5), (6, 1), 2, AMARELO, e_captura=True, pecas_capturadas=[(3, 4), (5, 2)],
+                        promoveu_dama=True, timestamp=1700000003.0, caminho=[(4, 3), (6, 1)])
+    
+    def na_sala(mensagem):
+        # O servidor acrescenta sala_id a tudo o que é difundido na sala
+        mensagem['sala_id'] = SALA_ID
+        return mensagem
+    
+    def executado(movimento, estado, versao=None):
+        return na_sala(ProtocoloDamas.criar_mensagem_movimento_executado(
+            movimento, estado, AMARELO if movimento.cor_jogador == VERDE else VERDE,
+            versao, 0x0123456789abcdef if versao is not None else None))
+    
+    return [
+        ("conexão solicitada", {'tipo': TipoMensagem.CONEXAO_SOLICITADA.value, 'nome': "Ana",
+                                'rating': 1500, 'capacidades': ['delta', 'binario']}),
+        ("conexão aceita", ProtocoloDamas.criar_mensagem_conexao_aceita(verde)),
+        ("conexão rejeitada", ProtocoloDamas.criar_mensagem_conexao_rejeitada("Servidor lotado")),
+        ("jogo iniciado", na_sala(ProtocoloDamas.criar_mensagem_jogo_iniciado(inicial, VERDE))),
+        ("jogo finalizado", na_sala(ProtocoloDamas.criar_mensagem_jogo_finalizado("Verde", "Sem peças", com_dama))),
+        ("jogo interrompido", na_sala({'tipo': TipoMensagem.JOGO_INTERROMPIDO.value, 'motivo': 'Jogador desconectou',
+                                       'mensagem': 'Jogo interrompido - jogador desconectou'})),
+        ("movimento solicitado", {'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
+                                  'origem': (1, 2), 'destino': (2, 3)}),
+        ("movimento solicitado com caminho", {'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
+                                              'origem': [2, 5], 'destino': [6, 1], 'caminho': [[4, 3], [6, 1]]}),
+        ("movimento solicitado com campo extra (genérico)", {'tipo': TipoMensagem.MOVIMENTO_SOLICITADO.value,
+                                                            'origem': [1, 2], 'destino': [2, 3], 'extra': 1}),
+        ("movimento executado com tabuleiro", executado(simples, inicial)),
+        ("movimento executado com tabuleiro e versão", executado(captura, com_dama, versao=12)),
+        ("movimento executado delta", executado(simples, None, versao=3)),
+        ("movimento executado delta com captura e caminho", executado(captura, None, versao=4)),
+        ("movimento executado sem sala (genérico)", ProtocoloDamas.criar_mensagem_movimento_executado(
+            simples, None, AMARELO, 5, 42)),
+        ("movimento inválido", ProtocoloDamas.criar_mensagem_movimento_invalido("Casa ocupada")),
+        ("movimento obrigatório", ProtocoloDamas.criar_mensagem_movimento_obrigatorio([((2, 5), (4, 3))])),
+        ("solicitar estado", {'tipo': TipoMensagem.SOLICITAR_ESTADO.value}),
+        ("estado do jogo", na_sala(ProtocoloDamas.criar_mensagem_estado_jogo(
+            EstadoJogo.EM_ANDAMENTO, com_dama, AMARELO, [verde, amarelo]))),
+        ("turno alterado", na_sala({'tipo': TipoMensagem.TURNO_ALTERADO.value, 'turno': AMARELO})),
+        ("chat", na_sala(ProtocoloDamas.criar_mensagem_chat(verde, "Boa partida! ♟ ção"))),
+        ("notificação", ProtocoloDamas.criar_mensagem_notificacao("Aguardando adversário", "warning")),
+        ("ping", {'tipo': TipoMensagem.PING.value}),
+        ("ping com campo extra (genérico)", {'tipo': TipoMensagem.PING.value, 'enviado_em': 1.5}),
+        ("pong", {'tipo': TipoMensagem.PONG.value}),
+        ("erro", ProtocoloDamas.criar_mensagem_erro("E101", "Movimento inválido")),
+        ("jogador desconectado", na_sala({'tipo': TipoMensagem.JOGADOR_DESCONECTADO.value,
+                                          'jogador_id': 2, 'nome': "Bruno"})),
+        ("servidor encerrando", {'tipo': TipoMensagem.SERVIDOR_ENCERRANDO.value, 'mensagem': 'Servidor encerrando'}),
+        ("assistir partida", ProtocoloDamas.criar_mensagem_assistir_partida()),
+        ("assistir partida em sala", ProtocoloDamas.criar_mensagem_assistir_partida(SALA_ID)),
+        ("tipo desconhecido (código genérico)", {'tipo': 'tipo_futuro', 'valor': [1, 2, 3]}),
+    ]
+
+
+def conferir_ida_e_volta(descricao, mensagem) -> bool:
+    """Codifica o quadro, confere o cabeçalho e compara a decodificação com o JSON"""
+    esperado = json.loads(json.dumps(mensagem))
+    
+    quadro = codificar(mensagem)
+    marcador, tamanho = CABECALHO_QUADRO.unpack_from(quadro)
+    if marcador != MARCADOR_BINARIO or tamanho != len(quadro) - CABECALHO_QUADRO.size:
+        print(f"   ❌ {descricao}: cabeçalho inválido ({marcador}, {tamanho})")
+        return False
+    
+    conteudo = memoryview(quadro)[CABECALHO_QUADRO.size:]
+    obtido = decodificar(conteudo)
+    if obtido != esperado:
+        print(f"   ❌ {descricao}: decodificação difere do JSON")
+        print(f"      esperado: {esperado}")
+        print(f"      obtido:   {obtido}")
+        return False
+    
+    generico = conteudo[0] == CODIGO_GENERICO or conteudo[1:2] == bytes((MARCADOR_GENERICO,))
+    formato = "genérico" if generico else "próprio"
+    print(f"   ✅ {descricao:50s} {len(quadro):5d} bytes ({formato})")
+    return True
+
+
+def conferir_rejeicoes() -> bool:
+    """Conteúdo truncado ou com código desconhecido deve gerar ErroCodec"""
+    executado = dict(exemplos())["movimento executado com tabuleiro"]
+    conteudo = codificar(executado)[CABECALHO_QUADRO.size:]
+    invalidos = {
+        "vazio": b'',
+        "código inexistente": bytes((200,)),
+        "movimento executado truncado": conteudo[:10],
+        "tabuleiro truncado": conteudo[:40],
+    }
+    
+    tudo_certo = True
+    for descricao, dados in invalidos.items():
+        try:
+            decodificar(dados)
+        except ErroCodec:
+            print(f"   ✅ {descricao}: ErroCodec")
+        else:
+            print(f"   ❌ {descricao}: aceito sem erro")
+            tudo_certo = False
+    return tudo_certo
+
+
+def main():
+    """Função principal do teste"""
+    print("🧪 Codec binário - ida e volta")
+    casos = exemplos()
+    
+    tudo_certo = True
+    faltando = {tipo.value for tipo in TipoMensagem} - {mensagem['tipo'] for _, mensagem in casos}
+    if faltando:
+        print(f"   ❌ Tipos sem exemplo: {sorted(faltando)}")
+        tudo_certo = False
+    
+    for descricao, mensagem in casos:
+        tudo_certo = conferir_ida_e_volta(descricao, mensagem) and tudo_certo
+    
+    print("\n🧪 Codec binário - conteúdo malformado")
+    tudo_certo = conferir_rejeicoes() and tudo_certo
+    
+    print("\n✅ Todas as mensagens conferem" if tudo_certo else "\n❌ Há mensagens divergentes")
+    return 0 if tudo_certo else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Teste da política de transbordo da fila de saída
+
+Confere em uma FilaSaida pequena que, ao encher: mensagens descartáveis
+novas são descartadas; as descartáveis já enfileiradas saem para abrir
+espaço a uma mensagem de jogo; e colocar retorna False (a conexão deve ser
+derrubada) quando nem assim a mensagem de jogo cabe ou a fila está
+fechada. Confere também a ordem de saída, descartadas e bytes_pendentes.
+
+Uso:
+    python teste_fila_saida.py
+"""
+
+import sys
+import threading
+
+from conexoes import FilaSaida
+
+
+LIMITE = 100
+
+
+class Verificacao:
+    """Acumula o resultado das conferências e imprime cada uma"""
+    
+    def __init__(self):
+        self.tudo_certo = True
+    
+    def conferir(self, descricao: str, obtido, esperado):
+        """Compara e imprime ✅/❌"""
+        if obtido == esperado:
+            print(f"   ✅ {descricao}")
+        else:
+            print(f"   ❌ {descricao}: esperado {esperado!r}, obtido {obtido!r}")
+            self.tudo_certo = False
+
+
+def conferir_transbordo(v: Verificacao):
+    """Descartáveis novas, depois descartáveis pendentes, depois False"""
+    fila = FilaSaida(limite_bytes=LIMITE)
+    avisos = []
+    fila.ao_colocar = lambda: avisos.append(1)
+    
+    v.conferir("Mensagem de jogo cabe", fila.colocar(b'J' * 40), True)
+    v.conferir("Descartável cabe", fila.colocar(b'd' * 40, descartavel=True), True)
+    v.conferir("bytes_pendentes soma os dois", fila.bytes_pendentes, 80)
+    
+    v.conferir("Descartável nova que não cabe é aceita pela política", fila.colocar(b'e' * 40, descartavel=True), True)
+    v.conferir("... mas descartada", (fila.descartadas, fila.bytes_pendentes), (1, 80))
+    
+    v.conferir("Mensagem de jogo que só cabe sem as descartáveis", fila.colocar(b'K' * 30), True)
+    v.conferir("... tira a descartável pendente", (fila.descartadas, fila.bytes_pendentes), (2, 70))
+    
+    v.conferir("Mensagem de jogo que não cabe nem assim", fila.colocar(b'L' * 31), False)
+    v.conferir("... não altera a fila", (fila.descartadas, fila.bytes_pendentes), (2, 70))
+    
+    v.conferir("Mensagem de jogo que cabe exatamente no limite", fila.colocar(b'M' * 30), True)
+    v.conferir("Envios na ordem, sem os descartados", fila.retirar(esperar=False),
+               [b'J' * 40, b'K' * 30, b'M' * 30])
+    v.conferir("retirar zera bytes_pendentes", fila.bytes_pendentes, 0)
+    v.conferir("ao_colocar chamado a cada enfileiramento", len(avisos), 4)
+
+
+def conferir_maior_que_limite(v: Verificacao):
+    """Uma mensagem maior que o limite nunca cabe, mesmo com a fila vazia"""
+    fila = FilaSaida(limite_bytes=LIMITE)
+    v.conferir("Descartável maior que o limite é descartada", fila.colocar(b'd' * (LIMITE + 1), True), True)
+    v.conferir("Mensagem de jogo maior que o limite é recusada", fila.colocar(b'J' * (LIMITE + 1)), False)
+    v.conferir("Fila continua vazia", (fila.retirar(esperar=False), fila.descartadas), ([], 1))
+
+
+def conferir_fechamento(v: Verificacao):
+    """Fechada, a fila recusa tudo; descartar=True abandona os pendentes"""
+    fila = FilaSaida(limite_bytes=LIMITE)
+    fila.colocar(b'J' * 10)
+    fila.fechar()
+    v.conferir("Fila fechada recusa mensagem de jogo", fila.colocar(b'K' * 10), False)
+    v.conferir("Fila fechada recusa descartável", fila.colocar(b'd' * 10, descartavel=True), False)
+    v.conferir("Pendentes continuam disponíveis após fechar", fila.retirar(), [b'J' * 10])
+    v.conferir("Fila fechada e vazia não bloqueia", fila.retirar(), [])
+    
+    fila = FilaSaida(limite_bytes=LIMITE)
+    fila.colocar(b'J' * 10)
+    fila.fechar(descartar=True)
+    v.conferir("fechar(descartar=True) abandona os pendentes", (fila.retirar(), fila.bytes_pendentes), ([], 0))
+    
+    # O escritor bloqueado em retirar() acorda quando a fila é fechada
+    fila = FilaSaida(limite_bytes=LIMITE)
+    lotes = []
+    escritor = threading.Thread(target=lambda: lotes.append(fila.retirar()), daemon=True)
+    escritor.start()
+    fila.fechar()
+    escritor.join(timeout=2.0)
+    v.conferir("Escritor bloqueado acorda ao fechar", (escritor.is_alive(), lotes), (False, [[]]))
+
+
+def main():
+    """Função principal do teste"""
+    v = Verificacao()
+    
+    print("🧪 Fila de saída - transbordo")
+    conferir_transbordo(v)
+    conferir_maior_que_limite(v)
+    
+    print("\n🧪 Fila de saída - fechamento")
+    conferir_fechamento(v)
+    
+    print("\n✅ Toda a política confere" if v.tudo_certo else "\n❌ Há comportamentos divergentes")
+    return 0 if v.tudo_certo else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Chaves de Zobrist para identificar posições do tabuleiro
+
+Cada combinação (cor, rei, casa) recebe um inteiro aleatório de 64 bits;
+o hash de uma posição é o XOR das chaves das peças presentes, mais a chave
+de vez quando é o turno das amarelas. A semente é fixa para que servidor e
+clientes calculem o mesmo valor para a mesma posição.
+"""
+
+import random
+
+from constantes import *
+
+
+SEMENTE_ZOBRIST = 20240611
+
+
+def _gerar_chaves():
+    """Gera as tabelas de chaves de forma determinística"""
+    gerador = random.Random(SEMENTE_ZOBRIST)
+    chaves = {}
+    for cor in (VERDE, AMARELO):
+        for rei in (False, True):
+            chaves[(cor, rei)] = {
+                (x, y): gerador.getrandbits(64)
+                for y in range(TAMANHO_TABULEIRO)
+                for x in range(TAMANHO_TABULEIRO)
+            }
+    return chaves, gerador.getrandbits(64)
+
+
+# CHAVES_PECAS[(cor, rei)][(x, y)] -> chave da peça naquela casa
+CHAVES_PECAS, CHAVE_VEZ_AMARELO = _gerar_chaves()
+
+
+def chave_peca(peca, coordenadas):
+    """Retorna a chave de uma peça em uma casa"""
+    return CHAVES_PECAS[(peca.cor, peca.rei)][coordenadas]
+
+
+def calcular_hash(pecas, vez=VERDE):
+    """
+    Calcula o hash completo de uma posição
+    
+    Args:
+        pecas: Iterável de (coordenadas, cor, rei)
+        vez: Cor que joga a seguir
+    """
+    valor = CHAVE_VEZ_AMARELO if vez == AMARELO else 0
+    for coordenadas, cor, rei in pecas:
+        valor ^= CHAVES_PECAS[(tuple(cor), bool(rei))][tuple(coordenadas)]
+    return valor